@@ -0,0 +1,61 @@
+"""
+Breakdowns - Performance by weekday, hour, session, killzone and macro window
+
+Each breakdown is one GROUP BY over the labeled trades (served entirely from
+the covering entry_ts index) and is cached until the trades table changes.
+"""
+
+from typing import Dict, List
+
+from analysis.concept_stats import derive
+from analysis.labeling import MACRO_WINDOW_NAMES
+from analysis.result_cache import ResultCache
+from analysis.session_calendar import SESSION_NAMES, KILLZONE_NAMES
+from database.db_manager import DatabaseManager
+
+DIMENSIONS = ('killzone', 'session', 'macro_window', 'weekday', 'hour')
+DIMENSION_TITLES = {
+    'killzone': "Killzone",
+    'session': "Session",
+    'macro_window': "Macro Window",
+    'weekday': "Weekday",
+    'hour': "Entry Hour (ET)"
+}
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def bucket_name(dimension: str, bucket: int) -> str:
+    """Display name of one breakdown bucket"""
+    if dimension == 'hour':
+        return f"{bucket:02d}:00"
+    names = {
+        'weekday': WEEKDAY_NAMES,
+        'session': SESSION_NAMES,
+        'killzone': KILLZONE_NAMES,
+        'macro_window': MACRO_WINDOW_NAMES
+    }[dimension]
+    return names[bucket] if 0 <= bucket < len(names) else str(bucket)
+
+
+class BreakdownEngine:
+    """Time breakdowns of the journal, recomputed only after a trade write"""
+    
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+        self.cache = ResultCache(db)
+    
+    def get(self, dimension: str) -> List[Dict]:
+        """Rows of one breakdown in bucket order, with names and win rates"""
+        return self.cache.get(dimension, ('trades',), lambda db: self.compute(dimension))
+    
+    def get_all(self) -> Dict[str, List[Dict]]:
+        """Every breakdown; read-only, trades are labeled when they are written"""
+        return {dimension: self.get(dimension) for dimension in DIMENSIONS}
+    
+    def compute(self, dimension: str) -> List[Dict]:
+        rows = []
+        for row in self.db.get_time_breakdown(dimension):
+            row = derive(row)
+            row['name'] = bucket_name(dimension, row['bucket'])
+            rows.append(row)
+        return rows
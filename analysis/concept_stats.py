@@ -0,0 +1,36 @@
+"""
+Concept Statistics - Win rate, expectancy and P&L per ICT concept and concept pair
+"""
+
+from typing import Dict, List
+
+from database.db_manager import DatabaseManager
+
+# Every table get_concept_performance() reads
+SOURCE_TABLES = ('trades', 'trade_concepts')
+
+
+def derive(row: Dict) -> Dict:
+    """Add win rate (over decided trades) to a grouped performance row"""
+    decided = row['wins'] + row['losses']
+    row['win_rate'] = row['wins'] / decided * 100 if decided else None
+    return row
+
+
+def concept_performance(db: DatabaseManager) -> Dict[str, List[Dict]]:
+    """{'concepts': [...], 'pairs': [...]} sorted by trade count
+    
+    Callers that refresh repeatedly go through
+    ResultCache.get('concepts', SOURCE_TABLES, concept_performance).
+    """
+    concepts, pairs = [], []
+    for row in db.get_concept_performance():
+        row = derive(row)
+        if row['partner'] is None:
+            concepts.append(row)
+        else:
+            row['concept'] = f"{row['concept']} + {row['partner']}"
+            pairs.append(row)
+    concepts.sort(key=lambda row: -row['trades'])
+    pairs.sort(key=lambda row: -row['trades'])
+    return {'concepts': concepts, 'pairs': pairs}
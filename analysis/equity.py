@@ -0,0 +1,153 @@
+"""
+Equity Curve - Cumulative P&L, drawdown and rolling edge over closed trades
+
+Closed trades are ordered by (date_closed, id). The engine keeps the arrays
+it has built and, when trades close, only computes the new tail from the
+carried state (last equity, peak and the cumulative sums the rolling windows
+difference against). Triggers log the (date_closed, id) positions every trade
+write touched, from any process; when the earliest new one falls inside the
+loaded curve, the curve is cut back to just before it and rebuilt from there;
+if the log was trimmed past the last edit the engine saw, it rebuilds in
+full. While the trades table's data version is unchanged no query runs at
+all.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Dict
+
+import numpy as np
+
+from database.db_manager import DatabaseManager
+
+ROLLING_WINDOW = 20
+SERIES = ('pnl', 'equity', 'peak', 'drawdown', 'duration', 'cum_wins',
+          'rolling_win_rate', 'rolling_expectancy')
+
+
+def extend_curve(curve: Dict[str, np.ndarray], pnl: np.ndarray,
+                 window: int = ROLLING_WINDOW) -> Dict[str, np.ndarray]:
+    """Return curve with new closed-trade P&L appended; only the tail is computed"""
+    n_old = len(curve['pnl'])
+    pnl = np.asarray(pnl, dtype=float)
+    index = np.arange(n_old, n_old + len(pnl))
+    
+    last_equity = curve['equity'][-1] if n_old else 0.0
+    last_peak = curve['peak'][-1] if n_old else 0.0
+    last_wins = curve['cum_wins'][-1] if n_old else 0
+    # Index of the most recent equity high (-1 is the zero starting balance)
+    last_high = n_old - 1 - curve['duration'][-1] if n_old else -1
+    
+    equity = last_equity + np.cumsum(pnl)
+    peak = np.maximum.accumulate(np.maximum(equity, last_peak))
+    drawdown = equity - peak
+    at_high = np.where(equity >= peak, index, -1)
+    high_index = np.maximum.accumulate(np.maximum(at_high, last_high))
+    duration = index - high_index
+    cum_wins = last_wins + np.cumsum(pnl > 0)
+    
+    # Rolling stats difference the cumulative sums against `window` trades back
+    all_equity = np.concatenate([curve['equity'], equity])
+    all_wins = np.concatenate([curve['cum_wins'], cum_wins])
+    back = index - window
+    has_back = back >= 0
+    safe_back = np.where(has_back, back, 0)
+    count = np.minimum(index + 1, window)
+    window_pnl = equity - np.where(has_back, all_equity[safe_back], 0.0)
+    window_wins = cum_wins - np.where(has_back, all_wins[safe_back], 0)
+    
+    tail = {
+        'pnl': pnl,
+        'equity': equity,
+        'peak': peak,
+        'drawdown': drawdown,
+        'duration': duration,
+        'cum_wins': cum_wins,
+        'rolling_win_rate': window_wins / count * 100,
+        'rolling_expectancy': window_pnl / count
+    }
+    return {name: np.concatenate([curve[name], tail[name]]) for name in SERIES}
+
+
+def empty_curve() -> Dict[str, np.ndarray]:
+    return {name: np.empty(0, dtype=np.int64 if name in ('duration', 'cum_wins') else float)
+            for name in SERIES}
+
+
+def summarize(curve: Dict[str, np.ndarray]) -> Dict:
+    """Headline numbers for the analytics cards"""
+    if len(curve['pnl']) == 0:
+        return {'trades': 0, 'equity': 0.0, 'max_drawdown': 0.0, 'max_drawdown_trades': 0,
+                'current_drawdown': 0.0, 'rolling_win_rate': 0.0, 'rolling_expectancy': 0.0}
+    return {
+        'trades': len(curve['pnl']),
+        'equity': float(curve['equity'][-1]),
+        'max_drawdown': float(curve['drawdown'].min()),
+        'max_drawdown_trades': int(curve['duration'].max()),
+        'current_drawdown': float(curve['drawdown'][-1]),
+        'rolling_win_rate': float(curve['rolling_win_rate'][-1]),
+        'rolling_expectancy': float(curve['rolling_expectancy'][-1])
+    }
+
+
+class EquityEngine:
+    """Equity curve over closed trades, extended as new trades close"""
+    
+    def __init__(self, db: DatabaseManager, window: int = ROLLING_WINDOW):
+        self.db = db
+        self.window = window
+        self.lock = threading.Lock()
+        self.curve = empty_curve()
+        # (date_closed, id) of every point on the curve
+        self.keys = []
+        self.edit_position = 0
+        self.version = None
+    
+    def update(self) -> Dict:
+        """Bring the curve up to date; returns a snapshot safe to hand to the GUI"""
+        with self.lock:
+            version = self.db.get_versions(('trades',))
+            if version == self.version:
+                return {'curve': self.curve, 'summary': summarize(self.curve)}
+            
+            # Edits trimmed from the log before this engine saw them could be anywhere
+            oldest = self.db.get_oldest_closed_edit()
+            if self.keys and oldest is not None and self.edit_position + 1 < oldest:
+                self.curve = empty_curve()
+                self.keys = []
+            
+            earliest, self.edit_position = self.db.get_closed_edits(self.edit_position)
+            if earliest is not None and self.keys and earliest <= self.keys[-1]:
+                keep = bisect_left(self.keys, earliest)
+                self.curve = {name: values[:keep] for name, values in self.curve.items()}
+                del self.keys[keep:]
+            
+            rows = self.db.get_closed_trade_pnl(self.keys[-1] if self.keys else None)
+            if rows:
+                pnl = np.array([row[2] for row in rows], dtype=float)
+                self.curve = extend_curve(self.curve, pnl, self.window)
+                self.keys.extend((row[0], row[1]) for row in rows)
+            self.version = version
+            
+            return {'curve': self.curve, 'summary': summarize(self.curve)}
+
+
+def downsample_minmax(values: np.ndarray, buckets: int):
+    """Reduce a series to a min and max per bucket for plotting
+    
+    Returns (x, y) with at most 2 * buckets points; every spike survives,
+    which plain striding would drop.
+    """
+    n = len(values)
+    if n <= 2 * buckets:
+        return np.arange(n, dtype=float), np.asarray(values, dtype=float)
+    
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    starts = edges[:-1]
+    mins = np.minimum.reduceat(values, starts)
+    maxs = np.maximum.reduceat(values, starts)
+    centers = (edges[:-1] + edges[1:] - 1) / 2.0
+    
+    x = np.repeat(centers, 2)
+    y = np.column_stack([mins, maxs]).ravel()
+    return x, y
@@ -0,0 +1,77 @@
+"""
+Labeling - Tag bars and trades with session, killzone and macro-window ids
+
+Labels are computed with array arithmetic on New York minute-of-day and stored
+as small integer columns, so analytics can GROUP BY killzone or macro window
+directly in SQL without any Python loops.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+from analysis.macro_schedule import get_schedule
+from analysis.session_calendar import get_calendar, SESSION_CLOSED
+from database.db_manager import DatabaseManager
+
+BAR_BATCH_SIZE = 100_000
+
+
+def _build_macro_window_table(windows):
+    """Macro window id for every minute of the day
+
+    Ids follow the schedule's hourly macro windows in time order, starting
+    at 1 (0 = outside any macro), so 08:50-09:10 is id 9 and 23:50-00:10,
+    which wraps past midnight, is id 24.
+    """
+    table = np.zeros(1440, dtype=np.int8)
+    for window_id, window in enumerate(windows, start=1):
+        table[np.arange(window['start'], window['end']) % 1440] = window_id
+    return table
+
+
+MACRO_WINDOW_BY_MINUTE = _build_macro_window_table(get_schedule().macro_windows)
+MACRO_WINDOW_NAMES = ['None'] + [window['name'] for window in get_schedule().macro_windows]
+
+
+def label_timestamps(utc_seconds) -> Dict[str, np.ndarray]:
+    """Calendar labels plus macro window id for an array of UTC epoch seconds
+
+    Like killzones, macro windows are cleared while the market is closed
+    (weekends, holidays and after early closes).
+    """
+    labels = get_calendar().label(utc_seconds)
+    labels['macro_window'] = np.where(labels['session'] == SESSION_CLOSED, 0,
+                                      MACRO_WINDOW_BY_MINUTE[labels['local_minute']]).astype(np.int8)
+    return labels
+
+
+def _label_rows(ids, timestamps, columns=DatabaseManager.LABEL_COLUMNS):
+    """Build update rows of the label columns followed by the id"""
+    labels = label_timestamps(timestamps)
+    labels['entry_minute'] = labels['local_minute']
+    return list(zip(*(labels[column].tolist() for column in columns), ids.tolist()))
+
+
+def label_bars(db: DatabaseManager, batch_size: int = BAR_BATCH_SIZE) -> int:
+    """Label every unlabeled bar in batches; returns the number labeled"""
+    labeled = 0
+    while True:
+        rows = db.get_unlabeled_bars(batch_size)
+        if not rows:
+            return labeled
+        
+        data = np.array(rows, dtype=np.int64)
+        db.save_labels('bars', _label_rows(data[:, 0], data[:, 1]))
+        labeled += len(rows)
+
+
+def label_trades(db: DatabaseManager) -> int:
+    """Label every timed trade that has no labels yet; returns the number labeled"""
+    rows = db.get_unlabeled_trades()
+    if not rows:
+        return 0
+    
+    data = np.array(rows, dtype=np.int64)
+    db.save_labels('trades', _label_rows(data[:, 0], data[:, 1], DatabaseManager.TRADE_LABEL_COLUMNS))
+    return len(rows)
@@ -0,0 +1,60 @@
+"""
+Price Levels - Vectorized circuit breaker and next day projection math
+"""
+
+import numpy as np
+
+# Circuit breaker thresholds (CB1, CB2, CB3) as fractions of the reference price
+CB_PERCENTS = np.array([0.07, 0.13, 0.20])
+
+# Range extension used when no CME settlement is available
+FIB_EXTENSION = 0.618
+
+
+def parse_prices(texts):
+    """Convert input strings to a float array (empty -> NaN) plus a validity mask
+
+    Invalid (non-numeric) entries are NaN and flagged False in the mask, so
+    callers can tell "left blank" apart from "typed garbage".
+    """
+    values = np.full(len(texts), np.nan)
+    valid = np.ones(len(texts), dtype=bool)
+    
+    for i, text in enumerate(texts):
+        text = text.strip()
+        if not text:
+            continue
+        try:
+            values[i] = float(text)
+        except ValueError:
+            valid[i] = False
+    
+    return values, valid
+
+
+def circuit_breaker_levels(reference):
+    """Return (up, down) arrays of shape (n, 3) for CB1-CB3 around each reference price"""
+    reference = np.asarray(reference, dtype=float)[:, np.newaxis]
+    return reference * (1 + CB_PERCENTS), reference * (1 - CB_PERCENTS)
+
+
+def next_day_projection(high, low, settlement=None, extension=FIB_EXTENSION):
+    """Project next day high/low for every row at once
+
+    Rows with a settlement use the CME method (settlement +/- range); the rest
+    extend the prior range by ``extension`` beyond the high and low.
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    range_val = high - low
+    
+    proj_high = high + range_val * extension
+    proj_low = low - range_val * extension
+    
+    if settlement is not None:
+        settlement = np.asarray(settlement, dtype=float)
+        has_settlement = ~np.isnan(settlement)
+        proj_high = np.where(has_settlement, settlement + range_val, proj_high)
+        proj_low = np.where(has_settlement, settlement - range_val, proj_low)
+    
+    return proj_high, proj_low
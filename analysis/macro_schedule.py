@@ -0,0 +1,184 @@
+"""
+Macro Schedule - Single source of truth for ICT macro times, sessions and killzones
+
+The weekly schedule is compiled once into a sorted list of offsets (seconds
+since Sunday 00:00), so "what are the next N macros?" is a bisect instead of
+rebuilding and sorting every macro on each tick.
+"""
+
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+DAY_SECONDS = 24 * 3600
+WEEK_SECONDS = 7 * DAY_SECONDS
+
+# Sunday-first, matching the timeline and weekly calendar columns
+DAY_NAMES = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+TRADING_DAYS = (1, 2, 3, 4, 5)
+
+# The :50 to :10 macro that runs every hour
+HOURLY_MACRO = {
+    'minute': 50,
+    'duration': 20,
+    'name': '20min Macro',
+    'type': '20min Macro',
+    'color': '#fbbf24',
+    'label': '🟡',
+    'desc': '20min Macro'
+}
+
+# Specific daily macro events shown in the countdown, in addition to every :50
+SPECIAL_MACROS = [
+    {'hour': 2, 'minute': 0, 'name': 'London Open', 'type': 'killzone', 'color': '#dc2626'},
+    {'hour': 2, 'minute': 33, 'name': 'London 2:33', 'type': 'specific', 'color': '#dc2626'},
+    {'hour': 3, 'minute': 0, 'name': 'London Hour 2', 'type': 'killzone', 'color': '#dc2626'},
+    {'hour': 8, 'minute': 30, 'name': 'NY Data', 'type': 'news', 'color': '#ef4444'},
+    {'hour': 8, 'minute': 50, 'name': 'NY Open Macro', 'type': 'killzone', 'color': '#dc2626'},
+    {'hour': 9, 'minute': 30, 'name': 'NYSE Open', 'type': 'open', 'color': '#dc2626'},
+    {'hour': 10, 'minute': 0, 'name': 'Silver Bullet Start', 'type': 'setup', 'color': '#10b981'},
+    {'hour': 14, 'minute': 0, 'name': 'PM Power Hour', 'type': 'killzone', 'color': '#dc2626'},
+    {'hour': 16, 'minute': 0, 'name': '4H Close', 'type': 'close', 'color': '#3b82f6'},
+]
+
+# Session and killzone windows in minutes from midnight (EST), highest priority
+# first: when windows overlap an hour, the first match is what gets displayed
+SESSION_WINDOWS = [
+    {'key': 'london', 'name': 'London Killzone', 'type': 'Major Killzone',
+     'start': 2 * 60, 'end': 5 * 60, 'color': '#dc2626', 'label': '🔴 London',
+     'desc': 'London Open Killzone'},
+    {'key': 'ny_am', 'name': 'NY AM Killzone', 'type': 'Major Killzone',
+     'start': 8 * 60 + 30, 'end': 11 * 60, 'color': '#dc2626', 'label': '🔴 NY AM',
+     'desc': 'New York AM Killzone'},
+    {'key': 'ny_pm', 'name': 'NY PM Killzone', 'type': 'Major Killzone',
+     'start': 13 * 60, 'end': 16 * 60, 'color': '#dc2626', 'label': '🔴 NY PM',
+     'desc': 'New York PM Killzone'},
+    {'key': 'ny_lunch', 'name': 'Lunch Macro', 'type': 'Consolidation Period',
+     'start': 11 * 60, 'end': 14 * 60, 'color': '#3b82f6', 'label': '🔵 Lunch',
+     'desc': 'NY Lunch Macro'},
+    {'key': 'eod', 'name': 'End of Day Macro', 'type': 'Settlement Period',
+     'start': 15 * 60, 'end': 17 * 60, 'color': '#3b82f6', 'label': '🔵 EOD',
+     'desc': 'End of Day Macro'},
+    {'key': 'asian', 'name': 'Asian Session', 'type': 'Range Formation',
+     'start': 0, 'end': 5 * 60, 'color': '#8b5cf6', 'label': '🟣 Asian',
+     'desc': 'Asian Range Formation'},
+]
+
+# Weekly open/close markers, keyed by (day index, hour)
+WEEKLY_MARKERS = {
+    (0, 18): {'name': 'Market Open', 'type': 'Weekly Open', 'color': '#10b981',
+              'label': '📈 Open', 'desc': 'Market Week Opens'},
+    (5, 17): {'name': 'Market Close', 'type': 'Weekly Close', 'color': '#6b7280',
+              'label': '📉 Close', 'desc': 'Market Week Closes'},
+}
+
+
+def week_offset(moment: datetime) -> int:
+    """Seconds elapsed since the most recent Sunday 00:00 for a datetime"""
+    day = (moment.weekday() + 1) % 7
+    return day * DAY_SECONDS + moment.hour * 3600 + moment.minute * 60 + moment.second
+
+
+class MacroSchedule:
+    """Weekly macro schedule compiled into a sorted offset index"""
+    
+    def __init__(self, days=range(7)):
+        self.days = tuple(days)
+        self.daily_macros = self._build_daily_macros()
+        
+        entries = sorted(
+            (day * DAY_SECONDS + macro['hour'] * 3600 + macro['minute'] * 60, i)
+            for day in self.days
+            for i, macro in enumerate(self.daily_macros)
+        )
+        self.offsets = [offset for offset, _ in entries]
+        self.events = [self.daily_macros[i] for _, i in entries]
+        
+        self.hour_windows = self._build_hour_windows()
+        self.macro_windows = self._build_macro_windows()
+    
+    def _build_daily_macros(self) -> List[Dict]:
+        """Every :50 hourly macro plus the specific named macros"""
+        minute = HOURLY_MACRO['minute']
+        hourly = [
+            {'hour': hour, 'minute': minute, 'name': f'{hour:02d}:{minute:02d} Macro',
+             'type': 'hourly', 'color': HOURLY_MACRO['color']}
+            for hour in range(24)
+        ]
+        return hourly + SPECIAL_MACROS
+    
+    def _build_macro_windows(self) -> List[Dict]:
+        """Minute span of every hourly macro, in time order (ends may pass midnight)"""
+        windows = []
+        for macro in self.daily_macros:
+            if macro['type'] != 'hourly':
+                continue
+            start = macro['hour'] * 60 + macro['minute']
+            end = start + HOURLY_MACRO['duration']
+            windows.append({
+                'start': start,
+                'end': end,
+                'name': f"{start // 60:02d}:{start % 60:02d}-{end // 60 % 24:02d}:{end % 60:02d}"
+            })
+        return sorted(windows, key=lambda window: window['start'])
+    
+    def _build_hour_windows(self) -> Dict[Tuple[int, int], Dict]:
+        """Resolve the highest priority session window for every (day, hour)"""
+        windows = {}
+        for day in TRADING_DAYS:
+            for hour in range(24):
+                for window in SESSION_WINDOWS:
+                    if window['start'] < (hour + 1) * 60 and window['end'] > hour * 60:
+                        windows[(day, hour)] = window
+                        break
+        return windows
+    
+    def next_macros(self, now: datetime, count: int) -> List[Dict]:
+        """Get the next N macros strictly after ``now`` with their datetimes"""
+        if not self.offsets:
+            return []
+        
+        now = now.replace(microsecond=0)
+        current = week_offset(now)
+        week_start = now - timedelta(seconds=current)
+        start = bisect_right(self.offsets, current)
+        
+        macros = []
+        for n in range(count):
+            index = start + n
+            wraps, index = divmod(index, len(self.offsets))
+            offset = self.offsets[index] + wraps * WEEK_SECONDS
+            event = self.events[index]
+            time = week_start + timedelta(seconds=offset)
+            seconds_until = offset - current
+            if now.tzinfo is not None:
+                # Wall-clock offsets are off by an hour across a DST change
+                seconds_until = int((time.astimezone(timezone.utc) -
+                                     now.astimezone(timezone.utc)).total_seconds())
+            macros.append({
+                'name': event['name'],
+                'type': event['type'],
+                'color': event['color'],
+                'time': time,
+                'seconds_until': seconds_until
+            })
+        return macros
+    
+    def window_for_hour(self, day: int, hour: int) -> Optional[Dict]:
+        """Session/killzone window covering an hour on a trading day, if any"""
+        return self.hour_windows.get((day, hour))
+    
+    def marker_for_hour(self, day: int, hour: int) -> Optional[Dict]:
+        """Weekly open/close marker for an hour, if any"""
+        return WEEKLY_MARKERS.get((day, hour))
+
+
+_default_schedule = None
+
+
+def get_schedule() -> MacroSchedule:
+    """Shared schedule instance, compiled on first use"""
+    global _default_schedule
+    if _default_schedule is None:
+        _default_schedule = MacroSchedule()
+    return _default_schedule
@@ -0,0 +1,181 @@
+"""
+Macro Statistics - Range, displacement and daily high/low share per time window
+
+For every :50-:10 macro window and killzone, each trading day's occurrence is
+reduced to its range, open-to-close displacement and whether the day's high or
+low was set inside it. Occurrences are persisted per series and recomputed
+from the earliest trading day that gained bars since the last pass (so
+backfilled history is picked up too); the per-window, per-weekday
+distributions are grouped reductions over those rows.
+"""
+
+import threading
+from typing import Dict, Tuple
+
+import numpy as np
+
+from analysis.labeling import label_bars
+from database.db_manager import DatabaseManager
+
+KIND_COLUMNS = {'killzone': 1, 'macro': 2}
+ALL_WEEKDAYS = -1
+
+
+def compute_occurrences(bars: np.ndarray, window_column: int) -> np.ndarray:
+    """Reduce time-ordered bars to one row per (trading day, window) occurrence
+
+    ``bars`` columns are (trading_day, killzone, macro_window, open, high, low,
+    close). Returns columns (trading_day, window_id, range_size, displacement,
+    sets_high, sets_low).
+    """
+    if len(bars) == 0:
+        return np.empty((0, 6))
+    
+    trading_day = bars[:, 0].astype(np.int64)
+    window = bars[:, window_column].astype(np.int64)
+    open_, high, low, close = bars[:, 3], bars[:, 4], bars[:, 5], bars[:, 6]
+    
+    # Daily extremes: trading days are contiguous because bars are time ordered
+    day_starts = np.flatnonzero(np.r_[True, trading_day[1:] != trading_day[:-1]])
+    day_high = np.maximum.reduceat(high, day_starts)
+    day_low = np.minimum.reduceat(low, day_starts)
+    day_index = np.cumsum(np.r_[False, trading_day[1:] != trading_day[:-1]])
+    
+    # Group bars by (day, window) key; a stable sort keeps each group in time
+    # order, and also merges the repeated hour when DST falls back
+    inside = np.flatnonzero(window > 0)
+    if len(inside) == 0:
+        return np.empty((0, 6))
+    key = trading_day[inside] * 64 + window[inside]
+    order = np.argsort(key, kind='stable')
+    inside = inside[order]
+    key = key[order]
+    run_starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    run_ends = np.r_[run_starts[1:], len(inside)] - 1
+    
+    run_high = np.maximum.reduceat(high[inside], run_starts)
+    run_low = np.minimum.reduceat(low[inside], run_starts)
+    first = inside[run_starts]
+    last = inside[run_ends]
+    run_day = day_index[first]
+    
+    return np.column_stack([
+        trading_day[first],
+        window[first],
+        run_high - run_low,
+        close[last] - open_[first],
+        run_high >= day_high[run_day],
+        run_low <= day_low[run_day]
+    ]).astype(float)
+
+
+def aggregate(occurrences: np.ndarray) -> Dict[Tuple[int, int], Dict]:
+    """Per (window_id, weekday) statistics, plus weekday ALL_WEEKDAYS for all days"""
+    if len(occurrences) == 0:
+        return {}
+    
+    weekday = (occurrences[:, 0].astype(np.int64) + 3) % 7
+    window = occurrences[:, 1].astype(np.int64)
+    
+    stats = {}
+    for group_weekday in (weekday, np.full_like(weekday, ALL_WEEKDAYS)):
+        group = window * 8 + (group_weekday + 1)
+        # Sorting by (group, range) lets percentiles be read off by position
+        order = np.lexsort((occurrences[:, 2], group))
+        sorted_group = group[order]
+        ranges = occurrences[order, 2]
+        displacement = occurrences[order, 3]
+        starts = np.flatnonzero(np.r_[True, sorted_group[1:] != sorted_group[:-1]])
+        counts = np.diff(np.r_[starts, len(order)])
+        
+        def group_mean(values):
+            return np.add.reduceat(values, starts) / counts
+        
+        def percentile(p):
+            return ranges[starts + ((counts - 1) * p).astype(np.int64)]
+        
+        mean_range = group_mean(ranges)
+        mean_abs_disp = group_mean(np.abs(displacement))
+        up_share = group_mean((displacement > 0).astype(float))
+        high_share = group_mean(occurrences[order, 4])
+        low_share = group_mean(occurrences[order, 5])
+        median_range = percentile(0.5)
+        p90_range = percentile(0.9)
+        
+        for i, start in enumerate(starts):
+            stats[(int(window[order[start]]), int(group_weekday[order[start]]))] = {
+                'count': int(counts[i]),
+                'mean_range': float(mean_range[i]),
+                'median_range': float(median_range[i]),
+                'p90_range': float(p90_range[i]),
+                'mean_abs_displacement': float(mean_abs_disp[i]),
+                'up_share': float(up_share[i]),
+                'high_share': float(high_share[i]),
+                'low_share': float(low_share[i])
+            }
+    
+    return stats
+
+
+def lookup_window(stats: Dict[Tuple[int, int], Dict], window_id: int, weekday: int):
+    """Stats for a window on a weekday, falling back to all weekdays"""
+    return stats.get((window_id, weekday)) or stats.get((window_id, ALL_WEEKDAYS))
+
+
+class MacroStatsEngine:
+    """Incrementally maintained macro/killzone statistics for bar series
+    
+    Safe to call from query worker threads; one update runs at a time so two
+    workers never label or rewrite the same days concurrently.
+    """
+    
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+        self.cache = {}
+        self.lock = threading.Lock()
+    
+    def update(self, symbol: str, timeframe: str) -> int:
+        """Recompute occurrences for trading days that gained bars; returns distinct bars read"""
+        with self.lock:
+            label_bars(self.db)
+            
+            bars_read = 0
+            for kind, column in KIND_COLUMNS.items():
+                # Bars are found by id rather than by day, so history imported
+                # before the stored days is recomputed as well
+                mark = self.db.get_occurrence_mark(symbol, timeframe, kind)
+                first_new_day, last_id = self.db.get_new_labeled_bar_range(symbol, timeframe, mark)
+                if first_new_day is None:
+                    continue
+                
+                # The last stored day may have been partial, so it is recomputed
+                last_day = self.db.get_last_occurrence_day(symbol, timeframe, kind)
+                from_day = first_new_day if last_day is None else min(first_new_day, last_day)
+                rows = self.db.get_labeled_bars(symbol, timeframe, from_day)
+                
+                occurrences = compute_occurrences(np.array(rows, dtype=float), column)
+                self.db.replace_window_occurrences(
+                    symbol, timeframe, kind, from_day,
+                    [(int(r[0]), int(r[1]), r[2], r[3], int(r[4]), int(r[5])) for r in occurrences],
+                    last_id
+                )
+                self.cache.pop((symbol, timeframe, kind), None)
+                # Each kind reads every bar from its own first day on, so the
+                # widest read holds all the others
+                bars_read = max(bars_read, len(rows))
+            
+            return bars_read
+    
+    def stats(self, symbol: str, timeframe: str, kind: str) -> Dict[Tuple[int, int], Dict]:
+        """Aggregated statistics keyed by (window_id, weekday)"""
+        key = (symbol, timeframe, kind)
+        with self.lock:
+            if key not in self.cache:
+                rows = self.db.get_window_occurrences(symbol, timeframe, kind)
+                occurrences = np.array(rows, dtype=float) if rows else np.empty((0, 6))
+                self.cache[key] = aggregate(occurrences)
+            return self.cache[key]
+    
+    def lookup(self, symbol: str, timeframe: str, kind: str, window_id: int, weekday: int):
+        """Stats for a window on a weekday, falling back to all weekdays"""
+        return lookup_window(self.stats(symbol, timeframe, kind), window_id, weekday)
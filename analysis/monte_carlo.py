@@ -0,0 +1,153 @@
+"""
+Monte Carlo - Drawdown, ruin and streak risk from resampled journal outcomes
+
+Each path replays the journal by drawing closed-trade P&L (or realized
+R-multiples) with replacement,
+either one trade at a time (bootstrap) or in runs of consecutive trades
+(block bootstrap, which keeps streaks and volatility clusters intact).
+Paths are built in vectorized batches; batch i always draws from the i-th
+child of one SeedSequence, so a seed gives the same numbers whether the
+batches run in-process or spread over any number of worker processes.
+"""
+
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, Optional
+
+import numpy as np
+
+from database.db_manager import DatabaseManager
+
+METHODS = ('bootstrap', 'block')
+DEFAULT_PATHS = 100_000
+DEFAULT_BLOCK = 5
+DEFAULT_SEED = 42
+# Paths per batch are capped so one batch's (paths x trades) arrays stay small
+BATCH_PATHS = 10_000
+BATCH_CELLS = 2_000_000
+DRAWDOWN_PERCENTILES = (50, 75, 90, 95, 99)
+FINAL_PERCENTILES = (5, 50, 95)
+
+
+def resample(sample: np.ndarray, n_paths: int, length: int,
+             rng: np.random.Generator, block: Optional[int] = None) -> np.ndarray:
+    """(n_paths, length) outcomes drawn from sample, singly or in circular blocks"""
+    n = len(sample)
+    if not block or block <= 1:
+        return sample[rng.integers(0, n, size=(n_paths, length))]
+    
+    blocks = math.ceil(length / block)
+    starts = rng.integers(0, n, size=(n_paths, blocks, 1))
+    index = (starts + np.arange(block)) % n
+    return sample[index.reshape(n_paths, blocks * block)[:, :length]]
+
+
+def longest_runs(mask: np.ndarray) -> np.ndarray:
+    """Length of the longest run of True in each row"""
+    index = np.arange(mask.shape[1])
+    # Position of the most recent False at or before each column
+    last_break = np.maximum.accumulate(np.where(mask, -1, index), axis=1)
+    return (index - last_break).max(axis=1)
+
+
+def simulate_batch(sample: np.ndarray, n_paths: int, length: int, seed,
+                   block: Optional[int], ruin_loss: float) -> Dict[str, np.ndarray]:
+    """Per-path max drawdown, final P&L, ruin flag and longest streaks for one batch"""
+    rng = np.random.default_rng(seed)
+    pnl = resample(sample, n_paths, length, rng, block)
+    
+    equity = np.cumsum(pnl, axis=1)
+    # Peak starts at the zero starting balance
+    peak = np.maximum.accumulate(np.maximum(equity, 0.0), axis=1)
+    
+    return {
+        'max_drawdown': (peak - equity).max(axis=1),
+        'final': equity[:, -1],
+        'ruined': equity.min(axis=1) <= -ruin_loss,
+        'losing_streak': longest_runs(pnl < 0),
+        'winning_streak': longest_runs(pnl > 0)
+    }
+
+
+def batch_sizes(paths: int, length: int):
+    per_batch = max(1, min(BATCH_PATHS, BATCH_CELLS // max(length, 1)))
+    full, rest = divmod(paths, per_batch)
+    return [per_batch] * full + ([rest] if rest else [])
+
+
+def default_workers() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def streak_summary(streaks: np.ndarray) -> Dict:
+    return {
+        'median': float(np.median(streaks)),
+        'p95': float(np.percentile(streaks, 95)),
+        'max': int(streaks.max()),
+        # distribution[k] = share of paths whose longest streak is k trades
+        'distribution': (np.bincount(streaks) / len(streaks)).tolist()
+    }
+
+
+def run_simulation(sample, paths: int = DEFAULT_PATHS, method: str = 'bootstrap',
+                   block: int = DEFAULT_BLOCK, ruin_loss: float = 1000.0,
+                   seed: int = DEFAULT_SEED, length: Optional[int] = None,
+                   workers: Optional[int] = None, unit: str = 'pnl') -> Optional[Dict]:
+    """Simulate paths of `length` trades (default: as many as the sample)
+    
+    Returns None when there is nothing to resample. ruin_loss is the loss
+    from the starting balance, in the sample's units, that counts as ruin.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown resampling method {method}")
+    sample = np.asarray(sample, dtype=float)
+    if len(sample) == 0 or paths <= 0:
+        return None
+    
+    length = length or len(sample)
+    block = block if method == 'block' else None
+    sizes = batch_sizes(paths, length)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = min(workers or default_workers(), len(sizes))
+    
+    args = (repeat(sample), sizes, repeat(length), seeds, repeat(block), repeat(ruin_loss))
+    if workers == 1:
+        batches = list(map(simulate_batch, *args))
+    else:
+        # Spawn rather than fork: forking a process with Qt and worker threads is unsafe
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            batches = list(pool.map(simulate_batch, *args))
+    
+    results = {name: np.concatenate([batch[name] for batch in batches]) for name in batches[0]}
+    drawdowns = results['max_drawdown']
+    return {
+        'paths': paths,
+        'trades': length,
+        'method': method,
+        'unit': unit,
+        'seed': seed,
+        'ruin_loss': ruin_loss,
+        'drawdown_percentiles': {p: float(v) for p, v in
+                                 zip(DRAWDOWN_PERCENTILES, np.percentile(drawdowns, DRAWDOWN_PERCENTILES))},
+        'final_percentiles': {p: float(v) for p, v in
+                              zip(FINAL_PERCENTILES, np.percentile(results['final'], FINAL_PERCENTILES))},
+        'risk_of_ruin': float(results['ruined'].mean() * 100),
+        'losing_streaks': streak_summary(results['losing_streak']),
+        'winning_streaks': streak_summary(results['winning_streak'])
+    }
+
+
+def simulate_journal(db: DatabaseManager, paths: int = DEFAULT_PATHS, method: str = 'bootstrap',
+                     block: int = DEFAULT_BLOCK, ruin_loss: float = 1000.0,
+                     seed: int = DEFAULT_SEED, unit: str = 'pnl',
+                     workers: Optional[int] = None) -> Optional[Dict]:
+    """Query-runner entry point: simulate over closed trades' P&L ('pnl') or R ('r')"""
+    if unit == 'r':
+        sample = db.get_closed_trade_r()
+    else:
+        sample = [row[2] for row in db.get_closed_trade_pnl()]
+    return run_simulation(sample, paths, method, block, ruin_loss, seed, workers=workers, unit=unit)
@@ -0,0 +1,33 @@
+"""
+Result Cache - Analytics results reused until the tables they read are written
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable
+
+from database.db_manager import DatabaseManager
+
+
+class ResultCache:
+    """Named results keyed by DatabaseManager.get_versions() of their tables
+    
+    The version is read before computing, so a write that lands while a
+    result is being built leaves it stale and the next get() recomputes.
+    """
+    
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+        self.lock = threading.Lock()
+        self.entries: Dict[str, tuple] = {}
+    
+    def get(self, name: str, tables: Iterable[str], compute: Callable[[DatabaseManager], Any]):
+        """Cached compute(db), recomputed only after one of tables changed"""
+        tables = tuple(tables)
+        with self.lock:
+            version = self.db.get_versions(tables)
+            entry = self.entries.get(name)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+            result = compute(self.db)
+            self.entries[name] = (version, result)
+            return result
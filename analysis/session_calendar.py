@@ -0,0 +1,285 @@
+"""
+Session Calendar - America/New_York trading calendar with DST and exchange holidays
+
+Every time-based feature (sessions, killzones, macro windows) works in New
+York wall-clock time. This module owns that conversion so DST shifts and
+holiday/early-close days are handled in one place, and can label whole
+arrays of UTC timestamps at once. Killzone windows come from
+macro_schedule.SESSION_WINDOWS, so there is one definition of each.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from analysis.macro_schedule import SESSION_WINDOWS
+
+NY_TZ = ZoneInfo("America/New_York")
+
+# The futures trading day starts at 18:00 ET on the previous calendar day
+TRADING_DAY_START = 18 * 60
+DAILY_CLOSE = 17 * 60
+EARLY_CLOSE = 13 * 60
+
+# Session ids stored in compact integer columns
+SESSION_CLOSED = 0
+SESSION_ASIAN = 1
+SESSION_LONDON = 2
+SESSION_NEW_YORK = 3
+SESSION_NAMES = ['Closed', 'Asian', 'London', 'New York']
+
+# Killzone ids: 0 = none, then SESSION_WINDOWS order
+KILLZONE_KEYS = [None] + [window['key'] for window in SESSION_WINDOWS]
+KILLZONE_NAMES = ['None'] + [window['name'] for window in SESSION_WINDOWS]
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _build_session_table():
+    """Session id for every minute of the day"""
+    table = np.full(1440, SESSION_NEW_YORK, dtype=np.int8)
+    table[:2 * 60] = SESSION_ASIAN
+    table[2 * 60:8 * 60] = SESSION_LONDON
+    table[TRADING_DAY_START:] = SESSION_ASIAN
+    table[DAILY_CLOSE:TRADING_DAY_START] = SESSION_CLOSED
+    return table
+
+
+def _build_killzone_table():
+    """Killzone id for every minute of the day, resolved by window priority"""
+    table = np.zeros(1440, dtype=np.int8)
+    # Paint lowest priority first so higher priority windows win overlaps
+    for index in range(len(SESSION_WINDOWS) - 1, -1, -1):
+        window = SESSION_WINDOWS[index]
+        table[window['start']:window['end']] = index + 1
+    return table
+
+
+SESSION_BY_MINUTE = _build_session_table()
+KILLZONE_BY_MINUTE = _build_killzone_table()
+
+
+def day_number(d: date) -> int:
+    """Days since 1970-01-01 for a date"""
+    return d.toordinal() - _EPOCH_ORDINAL
+
+
+def day_from_number(n: int) -> date:
+    """Inverse of day_number"""
+    return date.fromordinal(int(n) + _EPOCH_ORDINAL)
+
+
+def _nth_weekday(year, month, weekday, n):
+    """n-th given weekday (Mon=0) of a month; n=-1 for the last one"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year, month + 1, 1) - timedelta(days=1) if month < 12 else date(year, 12, 31)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year):
+    """Gregorian Easter Sunday (anonymous algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(d):
+    """Weekend holidays move to Friday (Saturday) or Monday (Sunday)"""
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    return d
+
+
+@lru_cache(maxsize=None)
+def exchange_holidays(year: int) -> Dict[date, str]:
+    """US exchange full-closure holidays for a year"""
+    holidays = {
+        _nth_weekday(year, 1, 0, 3): "Martin Luther King Jr. Day",
+        _nth_weekday(year, 2, 0, 3): "Presidents' Day",
+        _easter(year) - timedelta(days=2): "Good Friday",
+        _nth_weekday(year, 5, 0, -1): "Memorial Day",
+        _observed(date(year, 7, 4)): "Independence Day",
+        _nth_weekday(year, 9, 0, 1): "Labor Day",
+        _nth_weekday(year, 11, 3, 4): "Thanksgiving Day",
+        _observed(date(year, 12, 25)): "Christmas Day",
+    }
+    
+    # New Year's Day falling on a Saturday is not observed on the prior Friday
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays[_observed(new_year)] = "New Year's Day"
+    
+    if year >= 2022:
+        holidays[_observed(date(year, 6, 19))] = "Juneteenth"
+    
+    return holidays
+
+
+@lru_cache(maxsize=None)
+def early_closes(year: int) -> Dict[date, int]:
+    """Early-close days for a year, mapped to the close minute (ET)"""
+    holidays = exchange_holidays(year)
+    candidates = [
+        date(year, 7, 3),
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),
+        date(year, 12, 24),
+    ]
+    return {
+        d: EARLY_CLOSE for d in candidates
+        if d.weekday() < 5 and d not in holidays
+    }
+
+
+@lru_cache(maxsize=None)
+def _dst_transitions(year: int) -> Tuple[Tuple[int, int], ...]:
+    """(utc_seconds, new_offset_seconds) for every offset change during a year"""
+    def offset_at(moment):
+        return int(moment.astimezone(NY_TZ).utcoffset().total_seconds())
+    
+    transitions = []
+    start = datetime(year, 1, 1, 12, tzinfo=timezone.utc)
+    previous = offset_at(start)
+    for day in range(1, 367):
+        moment = start + timedelta(days=day)
+        current = offset_at(moment)
+        if current != previous:
+            # Narrow the change down to the hour within the last day
+            hour = moment - timedelta(days=1)
+            while offset_at(hour) == previous:
+                hour += timedelta(hours=1)
+            transitions.append((int(hour.timestamp()), current))
+            previous = current
+        if moment.year > year:
+            break
+    return tuple(transitions)
+
+
+class SessionCalendar:
+    """New York session calendar: timezone, DST, holidays and vectorized labeling"""
+    
+    def __init__(self, tz: ZoneInfo = NY_TZ):
+        self.tz = tz
+    
+    def now(self) -> datetime:
+        """Current time in New York"""
+        return datetime.now(self.tz)
+    
+    def to_local(self, moment: datetime) -> datetime:
+        """Convert an aware datetime to New York time"""
+        return moment.astimezone(self.tz)
+    
+    def holiday_name(self, d: date) -> str:
+        """Holiday name for a date, or empty string"""
+        return exchange_holidays(d.year).get(d, "")
+    
+    def early_close_minute(self, d: date):
+        """Early close minute (ET) for a date, or None for a normal day"""
+        return early_closes(d.year).get(d)
+    
+    def is_trading_day(self, d: date) -> bool:
+        """Weekday that is not an exchange holiday"""
+        return d.weekday() < 5 and d not in exchange_holidays(d.year)
+    
+    def trading_day_of(self, moment: datetime) -> date:
+        """Trading day a moment belongs to (sessions roll over at 18:00 ET)"""
+        local = self.to_local(moment)
+        if local.hour * 60 + local.minute >= TRADING_DAY_START:
+            return local.date() + timedelta(days=1)
+        return local.date()
+    
+    def utc_offsets(self, utc_seconds) -> np.ndarray:
+        """New York UTC offset (seconds) for an array of UTC epoch seconds"""
+        utc_seconds = np.asarray(utc_seconds, dtype=np.int64)
+        if utc_seconds.size == 0:
+            return np.zeros(0, dtype=np.int64)
+        
+        first_year = datetime.fromtimestamp(int(utc_seconds.min()), timezone.utc).year - 1
+        last_year = datetime.fromtimestamp(int(utc_seconds.max()), timezone.utc).year
+        
+        start = datetime(first_year, 1, 1, 12, tzinfo=timezone.utc)
+        times = [int(start.timestamp())]
+        offsets = [int(start.astimezone(self.tz).utcoffset().total_seconds())]
+        for year in range(first_year, last_year + 1):
+            for when, offset in _dst_transitions(year):
+                times.append(when)
+                offsets.append(offset)
+        
+        index = np.searchsorted(np.array(times, dtype=np.int64), utc_seconds, side='right') - 1
+        return np.array(offsets, dtype=np.int64)[index]
+    
+    def label(self, utc_seconds) -> Dict[str, np.ndarray]:
+        """Label UTC epoch seconds with trading day, session and killzone
+
+        Returns arrays of equal length:
+          local_minute - minute of day in New York time
+          weekday      - Mon=0 ... Sun=6 (local calendar date)
+          trading_day  - days since 1970-01-01 of the trading day
+          session      - SESSION_* id (closed on weekends, holidays, early closes)
+          killzone     - index into KILLZONE_KEYS (0 = none or market closed)
+        """
+        utc_seconds = np.asarray(utc_seconds, dtype=np.int64)
+        local = utc_seconds + self.utc_offsets(utc_seconds)
+        
+        local_day = local // 86400
+        local_minute = (local % 86400) // 60
+        weekday = (local_day + 3) % 7
+        trading_day = local_day + (local_minute >= TRADING_DAY_START)
+        trading_weekday = (trading_day + 3) % 7
+        
+        session = SESSION_BY_MINUTE[local_minute]
+        killzone = KILLZONE_BY_MINUTE[local_minute]
+        
+        closed = trading_weekday >= 5
+        if utc_seconds.size:
+            holiday_days, early_days = self._closure_days(int(local_day.min()), int(local_day.max()) + 1)
+            closed |= np.isin(trading_day, holiday_days)
+            closed |= (np.isin(local_day, early_days) &
+                       (local_minute >= EARLY_CLOSE) & (local_minute < TRADING_DAY_START))
+        
+        session = np.where(closed, SESSION_CLOSED, session).astype(np.int8)
+        killzone = np.where(closed, 0, killzone).astype(np.int8)
+        
+        return {
+            'local_minute': local_minute.astype(np.int16),
+            'weekday': weekday.astype(np.int8),
+            'trading_day': trading_day.astype(np.int32),
+            'session': session,
+            'killzone': killzone
+        }
+    
+    def _closure_days(self, first_day: int, last_day: int):
+        """Holiday and early-close day numbers covering a day-number range"""
+        first_year = day_from_number(first_day).year
+        last_year = day_from_number(last_day).year
+        holidays = []
+        early = []
+        for year in range(first_year, last_year + 1):
+            holidays.extend(day_number(d) for d in exchange_holidays(year))
+            early.extend(day_number(d) for d in early_closes(year))
+        return np.array(holidays, dtype=np.int64), np.array(early, dtype=np.int64)
+
+
+_default_calendar = None
+
+
+def get_calendar() -> SessionCalendar:
+    """Shared calendar instance"""
+    global _default_calendar
+    if _default_calendar is None:
+        _default_calendar = SessionCalendar()
+    return _default_calendar
@@ -0,0 +1,419 @@
+"""
+ICT Trading Platform - Command Line Interface
+
+Batch jobs without a display: imports only the database layer and the
+analysis engines, never PyQt6, so it is cheap to run from cron.
+
+    python cli.py import trades trades.csv
+    python cli.py import bars es_1m.csv --symbol ES --timeframe 1m
+    python cli.py export trades trades.csv
+    python cli.py stats --json
+    python cli.py concepts --pairs
+    python cli.py breakdown killzone weekday
+    python cli.py scan ES 1m --kind macro
+    python cli.py simulate --paths 50000 --unit r
+    python cli.py db optimize
+"""
+
+import argparse
+import csv
+import json
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from typing import Dict, List
+
+from analysis.breakdowns import BreakdownEngine, DIMENSIONS, DIMENSION_TITLES
+from analysis.concept_stats import concept_performance
+from analysis.equity import EquityEngine
+from analysis.labeling import label_bars, label_trades, MACRO_WINDOW_NAMES
+from analysis.macro_stats import MacroStatsEngine, ALL_WEEKDAYS
+from analysis.monte_carlo import simulate_journal, METHODS, DEFAULT_PATHS, DEFAULT_BLOCK, DEFAULT_SEED
+from analysis.session_calendar import KILLZONE_NAMES, NY_TZ
+from database.attachment_store import collect_attachment_garbage, migrate_screenshots
+from database.db_manager import DatabaseManager
+
+# Columns read back by `import trades`; `export trades` writes these and more
+TRADE_FIELDS = ('date', 'pair', 'timeframe', 'direction', 'entry_price', 'stop_loss',
+                'take_profit', 'exit_price', 'quantity', 'outcome', 'setup_type', 'notes',
+                'screenshot_path', 'concepts_used', 'entry_ts', 'exit_ts', 'date_closed')
+TRADE_FLOATS = ('entry_price', 'stop_loss', 'take_profit', 'exit_price', 'quantity')
+TRADE_INTS = ('entry_ts', 'exit_ts')
+TRADE_REQUIRED = ('date', 'pair')
+BAR_TIME_COLUMNS = ('ts', 'timestamp', 'time', 'datetime', 'date')
+BAR_BATCH_SIZE = 50_000
+CONCEPT_SEPARATOR = ';'
+
+
+# ==================== HELPERS ====================
+
+@contextmanager
+def open_output(path: str):
+    """A CSV/text target; '-' writes to stdout"""
+    if path == '-':
+        yield sys.stdout
+    else:
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            yield f
+
+
+def number(text, cast=float):
+    text = (text or '').strip()
+    return cast(float(text)) if text else None
+
+
+def parse_timestamp(text: str) -> int:
+    """UTC epoch seconds from epoch seconds/milliseconds or an ISO date-time (naive = UTC)"""
+    text = text.strip()
+    try:
+        value = float(text)
+    except ValueError:
+        moment = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return int(moment.timestamp())
+    # Anything past the year 5000 in seconds is really milliseconds
+    return int(value / 1000) if value > 1e11 else int(value)
+
+
+def print_table(rows: List[Dict], columns: List[tuple]):
+    """Plain-text table of (key, header, format) columns"""
+    if not rows:
+        print("(no rows)")
+        return
+    cells = [[fmt.format(row[key]) if row[key] is not None else '-' for key, _, fmt in columns]
+             for row in rows]
+    widths = [max(len(header), *(len(line[i]) for line in cells))
+              for i, (_, header, _) in enumerate(columns)]
+    print("  ".join(header.rjust(width) if i else header.ljust(width)
+                    for i, ((_, header, _), width) in enumerate(zip(columns, widths))))
+    print("  ".join('-' * width for width in widths))
+    for line in cells:
+        print("  ".join(cell.rjust(width) if i else cell.ljust(width)
+                        for i, (cell, width) in enumerate(zip(line, widths))))
+
+
+def emit(args, result, show):
+    """Print result as JSON with --json, otherwise with show(result)"""
+    if args.json:
+        json.dump(result, sys.stdout, indent=2, default=str)
+        print()
+    else:
+        show(result)
+
+
+PERFORMANCE_COLUMNS = [
+    ('trades', "Trades", "{}"),
+    ('wins', "Wins", "{}"),
+    ('losses', "Losses", "{}"),
+    ('win_rate', "Win %", "{:.1f}"),
+    ('total_pnl', "Total P&L", "{:,.2f}"),
+]
+
+
+# ==================== IMPORT / EXPORT ====================
+
+def import_trades(db: DatabaseManager, path: str) -> int:
+    trades = []
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            trade = {field: row[field] for field in TRADE_FIELDS if row.get(field) not in (None, '')}
+            missing = [field for field in TRADE_REQUIRED if field not in trade]
+            if missing:
+                raise ValueError(f"{path}:{reader.line_num}: missing {', '.join(missing)}")
+            # Dates are compared as strings (journal paging, calendar ranges),
+            # so only ISO dates sort correctly
+            try:
+                trade['date'] = date.fromisoformat(trade['date'].strip()).isoformat()
+            except ValueError:
+                raise ValueError(f"{path}:{reader.line_num}: date {trade['date']!r} is not YYYY-MM-DD") from None
+            for field in TRADE_FLOATS:
+                if field in trade:
+                    trade[field] = number(trade[field])
+            for field in TRADE_INTS:
+                if field in trade:
+                    trade[field] = parse_timestamp(trade[field])
+            if 'concepts_used' in trade:
+                trade['concepts_used'] = trade['concepts_used'].split(CONCEPT_SEPARATOR)
+            trade.setdefault('timeframe', '')
+            trade.setdefault('direction', 'long')
+            # add_trades stamps closed trades with today's date, which would order
+            # a historical import by when it was imported
+            if trade.get('outcome', 'pending') != 'pending' and 'date_closed' not in trade:
+                trade['date_closed'] = (datetime.fromtimestamp(trade['exit_ts'], NY_TZ).strftime("%Y-%m-%d")
+                                        if 'exit_ts' in trade else trade['date'])
+            trades.append(trade)
+    count = db.add_trades(trades)
+    label_trades(db)
+    return count
+
+
+def import_bars(db: DatabaseManager, path: str, symbol: str, timeframe: str) -> int:
+    imported = 0
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        fields = {name.lower(): name for name in reader.fieldnames or ()}
+        time_column = next((fields[name] for name in BAR_TIME_COLUMNS if name in fields), None)
+        if time_column is None:
+            raise ValueError(f"No time column; expected one of {', '.join(BAR_TIME_COLUMNS)}")
+        
+        batch = []
+        for row in reader:
+            batch.append((parse_timestamp(row[time_column]),
+                          *(number(row[fields[name]]) for name in ('open', 'high', 'low', 'close')),
+                          number(row.get(fields.get('volume', ''))) or 0))
+            if len(batch) >= BAR_BATCH_SIZE:
+                db.save_bars(symbol, timeframe, batch)
+                imported += len(batch)
+                batch = []
+        db.save_bars(symbol, timeframe, batch)
+        imported += len(batch)
+    
+    label_bars(db)
+    return imported
+
+
+def import_market_data(db: DatabaseManager, path: str) -> int:
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = [{'date': row['date'], 'symbol': row['symbol'],
+                 **{field: number(row.get(field)) for field in DatabaseManager.MARKET_DATA_FIELDS}}
+                for row in csv.DictReader(f)]
+    db.save_market_data_batch(rows)
+    return len(rows)
+
+
+def export_trades(db: DatabaseManager, path: str) -> int:
+    trades = db.get_all_trades()
+    columns = list(trades[0]) if trades else list(TRADE_FIELDS)
+    with open_output(path) as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for trade in trades:
+            trade['concepts_used'] = CONCEPT_SEPARATOR.join(trade['concepts_used'])
+            writer.writerow(trade)
+    return len(trades)
+
+
+def export_daily(db: DatabaseManager, path: str) -> int:
+    days = db.get_daily_summary()
+    with open_output(path) as f:
+        writer = csv.writer(f)
+        if days:
+            writer.writerow(days[0].keys())
+            writer.writerows(day.values() for day in days)
+    return len(days)
+
+
+def cmd_import(db: DatabaseManager, args):
+    if args.kind == 'bars':
+        if not args.symbol or not args.timeframe:
+            raise ValueError("import bars needs --symbol and --timeframe")
+        count = import_bars(db, args.file, args.symbol, args.timeframe)
+    elif args.kind == 'market':
+        count = import_market_data(db, args.file)
+    else:
+        count = import_trades(db, args.file)
+    print(f"Imported {count} {args.kind} rows from {args.file}", file=sys.stderr)
+
+
+def cmd_export(db: DatabaseManager, args):
+    count = (export_daily if args.kind == 'daily' else export_trades)(db, args.file)
+    print(f"Exported {count} {args.kind} rows to {args.file}", file=sys.stderr)
+
+
+# ==================== REPORTS ====================
+
+def cmd_stats(db: DatabaseManager, args):
+    result = {
+        'trades': db.get_trade_statistics(),
+        'r': db.get_r_statistics(),
+        'equity': EquityEngine(db).update()['summary']
+    }
+    
+    def show(result):
+        trades, r, equity = result['trades'], result['r'], result['equity']
+        print(f"Trades:        {trades['total_trades']} ({trades['wins']} W / {trades['losses']} L / "
+              f"{trades['pending']} pending)")
+        print(f"Win rate:      {trades['win_rate']:.1f}%")
+        print(f"Total P&L:     ${trades['total_pnl']:,.2f}   avg ${trades['avg_pnl']:,.2f}")
+        print(f"Best / worst:  ${trades['best_trade']:,.2f} / ${trades['worst_trade']:,.2f}")
+        print(f"Max drawdown:  ${equity['max_drawdown']:,.2f} over {equity['max_drawdown_trades']} trades")
+        if r['trades']:
+            print(f"R-multiples:   {r['trades']} trades, avg {r['avg_r']:+.2f}R, "
+                  f"total {r['total_r']:+.2f}R, expectancy {r['expectancy_r']:+.2f}R")
+    
+    emit(args, result, show)
+
+
+def cmd_concepts(db: DatabaseManager, args):
+    result = concept_performance(db)
+    rows = [row for row in result['pairs' if args.pairs else 'concepts'] if row['trades'] >= args.min_trades]
+    emit(args, rows, lambda rows: print_table(rows, [('concept', "Concept", "{}")] + PERFORMANCE_COLUMNS
+                                                    + [('expectancy', "Expectancy", "{:,.2f}")]))
+
+
+def cmd_breakdown(db: DatabaseManager, args):
+    unknown = set(args.dimensions) - set(DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Unknown dimension {', '.join(sorted(unknown))}; choose from {', '.join(DIMENSIONS)}")
+    
+    # Trades from before labeling existed may still be unlabeled
+    label_trades(db)
+    engine = BreakdownEngine(db)
+    result = {dimension: engine.get(dimension) for dimension in args.dimensions or DIMENSIONS}
+    
+    def show(result):
+        for dimension, rows in result.items():
+            print(f"\n{DIMENSION_TITLES[dimension]}")
+            print_table(rows, [('name', "Bucket", "{}")] + PERFORMANCE_COLUMNS
+                        + [('avg_pnl', "Expectancy", "{:,.2f}"), ('avg_r', "Avg R", "{:+.2f}"),
+                           ('avg_hold_minutes', "Hold (min)", "{:.0f}")])
+    
+    emit(args, result, show)
+
+
+def cmd_scan(db: DatabaseManager, args):
+    engine = MacroStatsEngine(db)
+    bars_read = engine.update(args.symbol, args.timeframe)
+    names = MACRO_WINDOW_NAMES if args.kind == 'macro' else KILLZONE_NAMES
+    rows = [dict(stats, window=names[window_id])
+            for (window_id, weekday), stats in sorted(engine.stats(args.symbol, args.timeframe, args.kind).items())
+            if weekday == ALL_WEEKDAYS]
+    print(f"Read {bars_read} bar rows of {args.symbol} {args.timeframe}", file=sys.stderr)
+    
+    emit(args, rows, lambda rows: print_table(rows, [
+        ('window', "Window", "{}"),
+        ('count', "Days", "{}"),
+        ('mean_range', "Mean range", "{:.2f}"),
+        ('median_range', "Median", "{:.2f}"),
+        ('p90_range', "P90", "{:.2f}"),
+        ('mean_abs_displacement', "|Disp|", "{:.2f}"),
+        ('up_share', "Up", "{:.0%}"),
+        ('high_share', "Sets high", "{:.0%}"),
+        ('low_share', "Sets low", "{:.0%}"),
+    ]))
+
+
+def cmd_simulate(db: DatabaseManager, args):
+    result = simulate_journal(db, args.paths, args.method, args.block, args.ruin, args.seed,
+                              args.unit, args.workers)
+    if result is None:
+        raise ValueError("No closed trades to simulate")
+    
+    def show(result):
+        unit = "R" if result['unit'] == 'r' else "$"
+        print(f"{result['paths']:,} {result['method']} paths of {result['trades']} trades (seed {result['seed']})")
+        for p, value in result['drawdown_percentiles'].items():
+            print(f"  Max drawdown P{p}:  {value:,.2f} {unit}")
+        for p, value in result['final_percentiles'].items():
+            print(f"  Final P&L P{p}:     {value:,.2f} {unit}")
+        print(f"  Risk of ruin ({result['ruin_loss']:g} {unit}): {result['risk_of_ruin']:.2f}%")
+        streaks = result['losing_streaks']
+        print(f"  Losing streak:     median {streaks['median']:.0f}, P95 {streaks['p95']:.0f}, max {streaks['max']}")
+    
+    emit(args, result, show)
+
+
+# ==================== MAINTENANCE ====================
+
+def cmd_db(db: DatabaseManager, args):
+    if args.action == 'info':
+        emit(args, db.get_table_counts(),
+             lambda counts: print_table([{'table': t, 'rows': n} for t, n in counts.items()],
+                                        [('table', "Table", "{}"), ('rows', "Rows", "{:,}")]))
+    elif args.action == 'check':
+        messages = db.integrity_check()
+        print("\n".join(messages))
+        if messages != ['ok']:
+            raise ValueError("Integrity check failed")
+    elif args.action == 'optimize':
+        db.optimize()
+        print("Planner statistics refreshed")
+    elif args.action == 'vacuum':
+        db.vacuum()
+        print("Database vacuumed")
+    elif args.action == 'label':
+        print(f"Labeled {label_bars(db)} bars and {label_trades(db)} trades")
+    elif args.action == 'gc':
+        print(f"Moved {migrate_screenshots(db)} screenshots into the attachment store")
+        result = collect_attachment_garbage(db)
+        print(f"Removed {result['removed']} unreferenced attachments ({result['freed_bytes']:,} bytes)")
+
+
+# ==================== ENTRY POINT ====================
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="ICT Trading Platform batch tools")
+    parser.add_argument("--db", default="trading_data.db", help="journal database")
+    commands = parser.add_subparsers(dest="command", required=True)
+    # Shared by every command that prints a result
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--json", action="store_true", help="print results as JSON")
+    
+    command = commands.add_parser("import", help="bulk import trades, bars or daily market data from CSV")
+    command.add_argument("kind", choices=("trades", "bars", "market"))
+    command.add_argument("file")
+    command.add_argument("--symbol", help="bar symbol (bars only)")
+    command.add_argument("--timeframe", help="bar timeframe, e.g. 1m (bars only)")
+    command.set_defaults(handler=cmd_import)
+    
+    command = commands.add_parser("export", help="export trades or the daily summary to CSV ('-' for stdout)")
+    command.add_argument("kind", choices=("trades", "daily"))
+    command.add_argument("file")
+    command.set_defaults(handler=cmd_export)
+    
+    command = commands.add_parser("stats", parents=[output], help="journal statistics, R-multiples and drawdown")
+    command.set_defaults(handler=cmd_stats)
+    
+    command = commands.add_parser("concepts", parents=[output], help="performance per concept or concept pair")
+    command.add_argument("--pairs", action="store_true", help="concept pairs instead of single concepts")
+    command.add_argument("--min-trades", type=int, default=1)
+    command.set_defaults(handler=cmd_concepts)
+    
+    command = commands.add_parser("breakdown", parents=[output], help="performance by time bucket")
+    command.add_argument("dimensions", nargs="*", metavar="dimension",
+                         help=f"one or more of {', '.join(DIMENSIONS)} (default: all)")
+    command.set_defaults(handler=cmd_breakdown)
+    
+    command = commands.add_parser("scan", parents=[output],
+                                  help="update and show macro/killzone window statistics for a bar series")
+    command.add_argument("symbol")
+    command.add_argument("timeframe")
+    command.add_argument("--kind", choices=("macro", "killzone"), default="macro")
+    command.set_defaults(handler=cmd_scan)
+    
+    command = commands.add_parser("simulate", parents=[output],
+                                  help="Monte Carlo replay of the journal's closed trades")
+    command.add_argument("--paths", type=int, default=DEFAULT_PATHS)
+    command.add_argument("--method", choices=METHODS, default="bootstrap")
+    command.add_argument("--block", type=int, default=DEFAULT_BLOCK)
+    command.add_argument("--ruin", type=float, default=1000.0, help="loss from the start that counts as ruin")
+    command.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    command.add_argument("--unit", choices=("pnl", "r"), default="pnl")
+    command.add_argument("--workers", type=int)
+    command.set_defaults(handler=cmd_simulate)
+    
+    command = commands.add_parser("db", parents=[output], help="database maintenance")
+    command.add_argument("action", choices=("info", "check", "optimize", "vacuum", "label", "gc"))
+    command.set_defaults(handler=cmd_db)
+    
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    db = DatabaseManager(args.db)
+    db.initialize_database()
+    try:
+        args.handler(db, args)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
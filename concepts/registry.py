@@ -0,0 +1,137 @@
+"""
+Concept Registry - Find concept modules by short_name, load their text on demand
+
+Discovery reads only the first few lines of each module in this package to
+pick up its title and short_name, so listing concepts never executes the
+large CONCEPT_DATA bodies. A module is imported the first time its content
+is asked for, and its rendered HTML is kept for every later view.
+"""
+
+import html
+import os
+import re
+import threading
+from importlib import import_module
+from typing import Dict, List, Optional
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# title and short_name are the first keys of every CONCEPT_DATA
+HEADER_BYTES = 2048
+HEADER_FIELD = re.compile(r"""['"](title|short_name)['"]\s*:\s*(['"])(.*?)(?<!\\)\2""")
+BOLD = re.compile(r"\*\*(.+?)\*\*")
+
+# Sections rendered when a card is expanded, in display order
+TEXT_SECTIONS = [
+    ('definition', "Definition"),
+    ('how_to_identify', "How to Identify"),
+    ('trading_rules', "Trading Rules"),
+    ('examples', "Examples"),
+]
+LIST_SECTIONS = [
+    ('related_concepts', "Related Concepts"),
+    ('resources', "Resources"),
+]
+
+
+def read_header(path: str) -> Dict[str, str]:
+    """title and short_name from the top of a concept module, without importing it"""
+    with open(path, encoding='utf-8') as f:
+        header = f.read(HEADER_BYTES)
+    return {key: value for key, _, value in HEADER_FIELD.findall(header)}
+
+
+def format_text(text: str) -> str:
+    """Concept text (with **bold** markers and hand-aligned layout) as rich text"""
+    escaped = BOLD.sub(r"<b>\1</b>", html.escape(text.strip('\n')))
+    return f"<div style='white-space: pre-wrap;'>{escaped}</div>"
+
+
+def render_concept(data: Dict) -> str:
+    """Full concept content as one HTML fragment for a QLabel"""
+    parts = [f"<p>{html.escape(' '.join(data.get('summary', '').split()))}</p>"]
+    
+    if data.get('key_points'):
+        items = "".join(f"<li>{html.escape(point)}</li>" for point in data['key_points'])
+        parts.append(f"<h4>Key Points</h4><ul>{items}</ul>")
+    
+    for key, heading in TEXT_SECTIONS:
+        if data.get(key):
+            parts.append(f"<h4>{heading}</h4>{format_text(data[key])}")
+    
+    for key, heading in LIST_SECTIONS:
+        if data.get(key):
+            items = "".join(f"<li>{html.escape(item)}</li>" for item in data[key])
+            parts.append(f"<h4>{heading}</h4><ul>{items}</ul>")
+    
+    return "".join(parts)
+
+
+class ConceptRegistry:
+    """Index of concept modules by short_name with lazily loaded, cached content"""
+    
+    def __init__(self, package: str = 'concepts', directory: str = PACKAGE_DIR):
+        self.package = package
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.index: Optional[Dict[str, Dict]] = None
+        self.content: Dict[str, Dict] = {}
+        self.rendered: Dict[str, str] = {}
+    
+    def discover(self) -> Dict[str, Dict]:
+        """{short_name: {'short_name', 'title', 'module'}} for every concept module"""
+        with self.lock:
+            if self.index is None:
+                index = {}
+                for name in sorted(os.listdir(self.directory)):
+                    module, extension = os.path.splitext(name)
+                    if extension != '.py' or module in ('__init__', 'registry'):
+                        continue
+                    fields = read_header(os.path.join(self.directory, name))
+                    if 'short_name' not in fields:
+                        continue
+                    index[fields['short_name']] = {
+                        'short_name': fields['short_name'],
+                        'title': fields.get('title', fields['short_name']),
+                        'module': f"{self.package}.{module}"
+                    }
+                self.index = index
+            return self.index
+    
+    def entries(self, first: tuple = ()) -> List[Dict]:
+        """Index entries, the short_names in `first` leading and the rest by title"""
+        index = self.discover()
+        leading = [index[name] for name in first if name in index]
+        rest = sorted((entry for name, entry in index.items() if name not in first),
+                      key=lambda entry: entry['title'])
+        return leading + rest
+    
+    def load(self, short_name: str) -> Dict:
+        """The module's CONCEPT_DATA, imported on first request"""
+        entry = self.discover().get(short_name)
+        if entry is None:
+            raise KeyError(f"Unknown concept {short_name}")
+        with self.lock:
+            if short_name not in self.content:
+                self.content[short_name] = import_module(entry['module']).CONCEPT_DATA
+            return self.content[short_name]
+    
+    def render(self, short_name: str) -> str:
+        """Rendered HTML of a concept, built once"""
+        with self.lock:
+            cached = self.rendered.get(short_name)
+        if cached is None:
+            cached = render_concept(self.load(short_name))
+            with self.lock:
+                self.rendered[short_name] = cached
+        return cached
+
+
+_default_registry = None
+
+
+def get_registry() -> ConceptRegistry:
+    """Shared registry instance, indexed on first use"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ConceptRegistry()
+    return _default_registry
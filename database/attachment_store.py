@@ -0,0 +1,251 @@
+"""
+Attachment Store - Content-addressed storage for trade screenshots
+"""
+
+import hashlib
+import os
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from database.db_manager import DatabaseManager
+
+STORE_DIR = "attachments"
+COPY_CHUNK = 1024 * 1024
+GC_GRACE_SECONDS = 24 * 60 * 60
+
+# Imports and garbage collection can run on different query worker threads
+_store_lock = threading.Lock()
+
+
+def image_size(path: str) -> Tuple[Optional[int], Optional[int]]:
+    """Width and height from a PNG, JPEG or BMP header without decoding it"""
+    with open(path, 'rb') as f:
+        head = f.read(26)
+        
+        if head.startswith(b'\x89PNG\r\n\x1a\n'):
+            return struct.unpack('>II', head[16:24])
+        
+        if head.startswith(b'BM'):
+            width, height = struct.unpack('<ii', head[18:26])
+            return width, abs(height)
+        
+        if head.startswith(b'\xff\xd8'):
+            f.seek(2)
+            while True:
+                byte = f.read(1)
+                while byte and byte != b'\xff':
+                    byte = f.read(1)
+                while byte == b'\xff':
+                    byte = f.read(1)
+                if not byte:
+                    break
+                marker = byte[0]
+                if marker in (0xd8, 0x01) or 0xd0 <= marker <= 0xd7:
+                    continue
+                length_bytes = f.read(2)
+                if len(length_bytes) < 2:
+                    break
+                length = struct.unpack('>H', length_bytes)[0]
+                # Start-of-frame markers carry the dimensions
+                if 0xc0 <= marker <= 0xcf and marker not in (0xc4, 0xc8, 0xcc):
+                    height, width = struct.unpack('>xHH', f.read(5))
+                    return width, height
+                f.seek(length - 2, os.SEEK_CUR)
+    
+    return None, None
+
+
+class AttachmentStore:
+    """Screenshots copied into STORE_DIR under the SHA-256 of their contents
+    
+    Importing the same image twice yields the same path, so charts attached
+    to several trades are stored once. Trades keep referencing blobs through
+    their screenshot_path.
+    
+    File work (hashing, copying, scanning) is split from the table writes so
+    the GUI can run the former on a query worker and the latter on its own
+    thread: copy_file/record, copy_unmanaged_screenshots/adopt_screenshots and
+    find_garbage/delete_garbage.
+    """
+    
+    def __init__(self, db: DatabaseManager, root: str = STORE_DIR):
+        self.db = db
+        self.root = root
+    
+    def blob_path(self, content_hash: str, extension: str) -> str:
+        return os.path.join(self.root, content_hash[:2], content_hash + extension)
+    
+    def is_managed(self, path: str) -> bool:
+        return bool(path) and os.path.abspath(path).startswith(os.path.abspath(self.root) + os.sep)
+    
+    def import_file(self, source: str) -> Dict:
+        """Copy a file into the store and record it; returns its record"""
+        return self.record(self.copy_file(source))
+    
+    def copy_file(self, source: str) -> Dict:
+        """Copy a file into the store in chunks, hashing as it streams
+        
+        Returns the attachment record to pass to record(); nothing is written
+        to the database here.
+        """
+        if self.is_managed(source):
+            existing = self.db.get_attachment(os.path.splitext(os.path.basename(source))[0])
+            if existing:
+                return existing
+        
+        os.makedirs(self.root, exist_ok=True)
+        temp_path = os.path.join(self.root, f".import-{threading.get_ident()}-{time.time_ns()}.tmp")
+        digest = hashlib.sha256()
+        size = 0
+        
+        try:
+            with open(source, 'rb') as src, open(temp_path, 'wb') as dst:
+                for chunk in iter(lambda: src.read(COPY_CHUNK), b''):
+                    digest.update(chunk)
+                    dst.write(chunk)
+                    size += len(chunk)
+            
+            content_hash = digest.hexdigest()
+            extension = os.path.splitext(source)[1].lower() or '.img'
+            width, height = image_size(temp_path)
+            
+            with _store_lock:
+                existing = self.db.get_attachment(content_hash)
+                path = existing['path'] if existing else self.blob_path(content_hash, extension)
+                if os.path.exists(path):
+                    os.remove(temp_path)
+                else:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        
+        return {
+            'hash': content_hash,
+            'path': path,
+            'size_bytes': size,
+            'width': width,
+            'height': height,
+            'original_name': os.path.basename(source),
+            'imported_at': int(time.time())
+        }
+    
+    def record(self, attachment: Dict) -> Dict:
+        """Save a copied blob's record; returns the stored row"""
+        # The blob may have been collected between the copy and now
+        if not os.path.exists(attachment['path']):
+            raise FileNotFoundError(f"{attachment['path']} was removed, import it again")
+        self.db.save_attachment({**attachment, 'imported_at': int(time.time())})
+        return self.db.get_attachment(attachment['hash'])
+    
+    def copy_unmanaged_screenshots(self) -> List[Tuple[str, Dict]]:
+        """Copy screenshots trades still reference by their original path into the store
+        
+        Returns (original path, attachment) pairs for adopt_screenshots().
+        Files that no longer exist are left alone.
+        """
+        copies = []
+        for path in self.db.get_unmanaged_screenshot_paths():
+            if not os.path.isfile(path):
+                continue
+            try:
+                copies.append((path, self.copy_file(path)))
+            except OSError:
+                pass
+        return copies
+    
+    def adopt_screenshots(self, copies: List[Tuple[str, Dict]]) -> int:
+        """Record copied screenshots and point their trades at the stored blobs"""
+        paths = {}
+        for original, attachment in copies:
+            try:
+                paths[original] = self.record(attachment)['path']
+            except OSError:
+                pass
+        self.db.replace_screenshot_paths(paths)
+        return len(paths)
+    
+    def find_garbage(self, grace_seconds: int = GC_GRACE_SECONDS) -> Dict:
+        """List blobs no trade references and remove stray files the table doesn't know
+        
+        Only blobs last imported more than grace_seconds ago are listed, so an
+        image picked in the journal but not saved yet survives the pass. The
+        listed records are deleted by delete_garbage().
+        """
+        cutoff = int(time.time()) - grace_seconds
+        removed = 0
+        freed = 0
+        
+        # Leftovers from interrupted imports or records deleted by hand
+        if os.path.isdir(self.root):
+            with _store_lock:
+                known = {os.path.abspath(path) for path in self.db.get_attachment_paths()}
+                for folder, _, files in os.walk(self.root):
+                    for name in files:
+                        path = os.path.join(folder, name)
+                        if os.path.abspath(path) in known:
+                            continue
+                        try:
+                            if os.path.getmtime(path) < cutoff:
+                                freed += os.path.getsize(path)
+                                os.remove(path)
+                                removed += 1
+                        except OSError:
+                            pass
+        
+        return {
+            'cutoff': cutoff,
+            'unreferenced': self.db.get_unreferenced_attachments(cutoff),
+            'removed': removed,
+            'freed_bytes': freed
+        }
+    
+    def delete_garbage(self, garbage: Dict) -> Dict:
+        """Delete the records (and blobs) find_garbage listed that are still unreferenced"""
+        removed = garbage['removed']
+        freed = garbage['freed_bytes']
+        
+        for attachment in garbage['unreferenced']:
+            with _store_lock:
+                if not self.db.delete_unreferenced_attachment(attachment['hash'], garbage['cutoff']):
+                    continue
+                try:
+                    os.remove(attachment['path'])
+                except OSError:
+                    pass
+            removed += 1
+            freed += attachment['size_bytes']
+        
+        return {'removed': removed, 'freed_bytes': freed}
+    
+    def collect_garbage(self, grace_seconds: int = GC_GRACE_SECONDS) -> Dict:
+        """Both garbage collection steps in one go, for single-threaded callers"""
+        return self.delete_garbage(self.find_garbage(grace_seconds))
+
+
+def copy_screenshot(db: DatabaseManager, source: str) -> Dict:
+    """Query-runner entry point copying one screenshot into the store"""
+    return AttachmentStore(db).copy_file(source)
+
+
+def copy_unmanaged_screenshots(db: DatabaseManager) -> List[Tuple[str, Dict]]:
+    """Query-runner entry point copying pre-store screenshots into the store"""
+    return AttachmentStore(db).copy_unmanaged_screenshots()
+
+
+def find_attachment_garbage(db: DatabaseManager) -> Dict:
+    """Query-runner entry point for the file side of the GC pass"""
+    return AttachmentStore(db).find_garbage()
+
+
+def migrate_screenshots(db: DatabaseManager) -> int:
+    """Move every pre-store screenshot into the store; returns the number moved"""
+    store = AttachmentStore(db)
+    return store.adopt_screenshots(store.copy_unmanaged_screenshots())
+
+
+def collect_attachment_garbage(db: DatabaseManager) -> Dict:
+    """Delete unreferenced screenshots in one go"""
+    return AttachmentStore(db).collect_garbage()
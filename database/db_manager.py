@@ -3,21 +3,74 @@ Database Manager - Handles all SQLite operations
 """
 
 import sqlite3
+import threading
 from datetime import datetime
 from typing import List, Dict, Optional
 
 class DatabaseManager:
+    CONCEPT_TABLES = ('concepts', 'key_points', 'related_concepts', 'resources')
+    TRADE_TABLES = ('trades', 'trade_concepts', 'daily_trade_summary')
+    # Write counters of these live in the database, bumped by triggers, so
+    # commits from other processes (cli.py batch jobs) invalidate caches too
+    STORED_VERSION_TABLES = ('trades', 'trade_concepts', 'concepts')
+    # Most recent closed-trade edit log rows kept when the log is trimmed;
+    # equity curves that fall further behind are rebuilt in full
+    CLOSED_EDITS_KEPT = 10_000
+    
     def __init__(self, db_path: str = "trading_data.db"):
         self.db_path = db_path
         self.conn = None
-        
+        self.main_thread = threading.get_ident()
+        self.worker_conns = {}
+        self.worker_lock = threading.Lock()
+        # Per-table write counters; cached analytics compare them to know
+        # whether anything they were computed from has changed
+        self.data_versions = {}
+        self.version_lock = threading.Lock()
+    
     def get_connection(self):
-        """Get database connection"""
+        """Get database connection for the calling thread
+        
+        The GUI thread keeps ``self.conn``; background query workers each get
+        their own connection so reads never share a cursor across threads.
+        """
+        thread_id = threading.get_ident()
+        if thread_id != self.main_thread:
+            conn = self.worker_conns.get(thread_id)
+            if conn is None:
+                conn = self.open_connection()
+                with self.worker_lock:
+                    self.worker_conns[thread_id] = conn
+            return conn
+        
         if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row
+            self.conn = self.open_connection()
         return self.conn
     
+    def bump_versions(self, *tables: str):
+        """Mark tables as written"""
+        with self.version_lock:
+            for table in tables:
+                self.data_versions[table] = self.data_versions.get(table, 0) + 1
+    
+    def get_versions(self, tables) -> tuple:
+        """Current write counters for a set of tables, usable as a cache key"""
+        tables = tuple(tables)
+        stored = {}
+        if any(table in self.STORED_VERSION_TABLES for table in tables):
+            cursor = self.get_connection().cursor()
+            cursor.execute("SELECT name, version FROM data_versions")
+            stored = {row['name']: row['version'] for row in cursor.fetchall()}
+        return tuple(stored.get(table, 0) if table in self.STORED_VERSION_TABLES
+                     else self.data_versions.get(table, 0) for table in tables)
+    
+    def open_connection(self):
+        """Open a connection in WAL mode so readers don't block the writer"""
+        conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+    
     def initialize_database(self):
         """Create all necessary tables"""
         conn = self.get_connection()
@@ -88,10 +141,49 @@ class DatabaseManager:
                 setup_type TEXT,
                 notes TEXT,
                 screenshot_path TEXT,
-                date_closed TEXT
+                date_closed TEXT,
+                entry_ts INTEGER,
+                trading_day INTEGER,
+                session INTEGER,
+                killzone INTEGER,
+                macro_window INTEGER,
+                risk_per_unit REAL,
+                planned_rr REAL,
+                realized_r REAL,
+                exit_ts INTEGER,
+                entry_minute INTEGER
             )
         """)
         
+        # Entry/exit times (UTC epoch seconds), the entry's session labels and
+        # the R-multiple columns were added later
+        added = self._add_missing_columns(cursor, 'trades', {
+            'entry_ts': 'INTEGER',
+            'trading_day': 'INTEGER',
+            'session': 'INTEGER',
+            'killzone': 'INTEGER',
+            'macro_window': 'INTEGER',
+            'risk_per_unit': 'REAL',
+            'planned_rr': 'REAL',
+            'realized_r': 'REAL',
+            'exit_ts': 'INTEGER',
+            'entry_minute': 'INTEGER'
+        })
+        if 'risk_per_unit' in added:
+            self._refresh_r_multiples(cursor)
+        if 'entry_minute' in added:
+            # Trades labeled before entry_minute existed get labeled again
+            cursor.execute("UPDATE trades SET session = NULL WHERE entry_ts IS NOT NULL")
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_realized_r
+            ON trades(realized_r) WHERE realized_r IS NOT NULL
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_planned_rr
+            ON trades(planned_rr) WHERE planned_rr IS NOT NULL
+        """)
+        
         # Trade concepts junction table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS trade_concepts (
@@ -108,12 +200,159 @@ class DatabaseManager:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 date TEXT NOT NULL,
                 symbol TEXT NOT NULL,
+                open REAL,
                 daily_high REAL,
                 daily_low REAL,
+                close REAL,
+                settlement REAL,
                 UNIQUE(date, symbol)
             )
         """)
         
+        # Databases created before open/close/settlement were tracked
+        self._add_missing_columns(cursor, 'market_data', {
+            'open': 'REAL',
+            'close': 'REAL',
+            'settlement': 'REAL'
+        })
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_market_data_symbol_date
+            ON market_data(symbol, date)
+        """)
+        
+        # Price bars (NEW) - ts is the bar open in UTC epoch seconds; the
+        # label columns are filled in by analysis.labeling
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS bars (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                symbol TEXT NOT NULL,
+                timeframe TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                open REAL,
+                high REAL,
+                low REAL,
+                close REAL,
+                volume REAL,
+                trading_day INTEGER,
+                session INTEGER,
+                killzone INTEGER,
+                macro_window INTEGER,
+                UNIQUE(symbol, timeframe, ts)
+            )
+        """)
+        
+        # Per-occurrence macro/killzone window statistics derived from bars
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS window_occurrences (
+                symbol TEXT NOT NULL,
+                timeframe TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                trading_day INTEGER NOT NULL,
+                window_id INTEGER NOT NULL,
+                range_size REAL,
+                displacement REAL,
+                sets_high INTEGER,
+                sets_low INTEGER,
+                PRIMARY KEY (symbol, timeframe, kind, trading_day, window_id)
+            )
+        """)
+        # Highest bar id each series' occurrences were computed through, so
+        # bars added later (backfilled history included) are found by id
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS occurrence_marks (
+                symbol TEXT NOT NULL,
+                timeframe TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                last_bar_id INTEGER NOT NULL,
+                PRIMARY KEY (symbol, timeframe, kind)
+            )
+        """)
+        
+        # Managed screenshot blobs, one row per distinct image content
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS attachments (
+                hash TEXT PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                size_bytes INTEGER NOT NULL,
+                width INTEGER,
+                height INTEGER,
+                original_name TEXT,
+                imported_at INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_screenshot ON trades(screenshot_path)
+        """)
+        
+        # Journal paging walks trades newest first; concept lookups go by trade
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_date_id ON trades(date DESC, id DESC)
+        """)
+        # (trade_id, concept_name) also covers the concept analytics joins
+        cursor.execute("DROP INDEX IF EXISTS idx_trade_concepts_trade")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trade_concepts_trade_name
+            ON trade_concepts(trade_id, concept_name)
+        """)
+        
+        # Per-day trade aggregates for the calendar, kept in step with trades
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS daily_trade_summary (
+                date TEXT PRIMARY KEY,
+                trade_count INTEGER NOT NULL,
+                wins INTEGER NOT NULL,
+                losses INTEGER NOT NULL,
+                pnl REAL NOT NULL,
+                best_pnl REAL,
+                worst_pnl REAL
+            )
+        """)
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM daily_trade_summary)")
+        if not cursor.fetchone()[0]:
+            self._refresh_daily_summary(cursor)
+        
+        # Closed trades in close order, for the equity curve
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_closed
+            ON trades(date_closed, id, pnl) WHERE pnl IS NOT NULL AND date_closed IS NOT NULL
+        """)
+        
+        # Small partial indexes so labeling passes only visit new rows
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_bars_unlabeled
+            ON bars(id) WHERE session IS NULL
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_unlabeled
+            ON trades(id) WHERE session IS NULL AND entry_ts IS NOT NULL
+        """)
+        
+        # Labels written by an older labeling scheme are cleared so the next
+        # labeling pass recomputes them (and the window stats built on them)
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] < self.LABEL_SCHEME:
+            cursor.execute("UPDATE bars SET session = NULL WHERE session IS NOT NULL")
+            cursor.execute("UPDATE trades SET session = NULL WHERE session IS NOT NULL")
+            cursor.execute("DELETE FROM window_occurrences")
+            cursor.execute("DELETE FROM occurrence_marks")
+            cursor.execute(f"PRAGMA user_version = {self.LABEL_SCHEME}")
+        
+        # Timed trades by entry time; also covers every time breakdown query
+        # so those GROUP BYs never touch the table itself
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_entry_ts
+            ON trades(entry_ts, trading_day, entry_minute, session, killzone, macro_window,
+                      outcome, pnl, realized_r, exit_ts)
+            WHERE entry_ts IS NOT NULL
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_exit_ts
+            ON trades(exit_ts) WHERE exit_ts IS NOT NULL
+        """)
+        
+        self._create_version_triggers(cursor)
+        
         # Concept notes table (NEW)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS concept_notes (
@@ -125,7 +364,88 @@ class DatabaseManager:
         """)
         
         conn.commit()
+    
+    def _create_version_triggers(self, cursor):
+        """Write counters and the closed-trade edit log, maintained by triggers
         
+        Triggers fire for every connection, including other processes, so
+        get_versions() and get_closed_edits() see their commits as well.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS data_versions (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        for table in self.STORED_VERSION_TABLES:
+            cursor.execute("INSERT OR IGNORE INTO data_versions (name) VALUES (?)", (table,))
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()}
+                    AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE data_versions SET version = version + 1 WHERE name = '{table}';
+                    END
+                """)
+        
+        # (date_closed, id) positions on the equity curve that writes touched,
+        # before and after, so the curve rebuilds from the first changed point
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS closed_trade_edits (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                date_closed TEXT NOT NULL,
+                trade_id INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trades_closed_edit_insert AFTER INSERT ON trades
+            WHEN NEW.pnl IS NOT NULL AND NEW.date_closed IS NOT NULL
+            BEGIN
+                INSERT INTO closed_trade_edits (date_closed, trade_id) VALUES (NEW.date_closed, NEW.id);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trades_closed_edit_update AFTER UPDATE OF pnl, date_closed ON trades
+            WHEN OLD.pnl IS NOT NEW.pnl OR OLD.date_closed IS NOT NEW.date_closed
+            BEGIN
+                INSERT INTO closed_trade_edits (date_closed, trade_id)
+                SELECT OLD.date_closed, OLD.id WHERE OLD.pnl IS NOT NULL AND OLD.date_closed IS NOT NULL;
+                INSERT INTO closed_trade_edits (date_closed, trade_id)
+                SELECT NEW.date_closed, NEW.id WHERE NEW.pnl IS NOT NULL AND NEW.date_closed IS NOT NULL;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trades_closed_edit_delete AFTER DELETE ON trades
+            WHEN OLD.pnl IS NOT NULL AND OLD.date_closed IS NOT NULL
+            BEGIN
+                INSERT INTO closed_trade_edits (date_closed, trade_id) VALUES (OLD.date_closed, OLD.id);
+            END
+        """)
+        self._prune_closed_edits(cursor)
+    
+    def _prune_closed_edits(self, cursor):
+        """Trim the closed-trade edit log to its most recent CLOSED_EDITS_KEPT rows
+        
+        AUTOINCREMENT never reuses a deleted seq, so readers can tell from
+        MIN(seq) that edits they had not seen yet were trimmed.
+        """
+        cursor.execute("""
+            DELETE FROM closed_trade_edits
+            WHERE seq <= (SELECT MAX(seq) FROM closed_trade_edits) - ?
+        """, (self.CLOSED_EDITS_KEPT,))
+    
+    def _add_missing_columns(self, cursor, table: str, columns: Dict[str, str]) -> List[str]:
+        """Add any columns missing from an existing table; returns the added names"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row['name'] for row in cursor.fetchall()}
+        
+        added = []
+        for name, col_type in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {col_type}")
+                added.append(name)
+        return added
+    
     # ==================== CONCEPT OPERATIONS ====================
     
     def add_concept(self, title: str, category: str, summary: str = "",
@@ -171,6 +491,7 @@ class DatabaseManager:
                                  (concept_id, resource.strip()))
         
         conn.commit()
+        self.bump_versions(*self.CONCEPT_TABLES)
         return concept_id
     
     def get_all_concepts(self) -> List[Dict]:
@@ -255,6 +576,7 @@ class DatabaseManager:
                                  (concept_id, resource.strip()))
         
         conn.commit()
+        self.bump_versions(*self.CONCEPT_TABLES)
     
     def delete_concept(self, concept_id: int):
         """Delete a concept and all related data"""
@@ -262,6 +584,7 @@ class DatabaseManager:
         cursor = conn.cursor()
         cursor.execute("DELETE FROM concepts WHERE id = ?", (concept_id,))
         conn.commit()
+        self.bump_versions(*self.CONCEPT_TABLES)
     
     def search_concepts(self, query: str) -> List[Dict]:
         """Search concepts by title, category, or summary"""
@@ -306,6 +629,13 @@ class DatabaseManager:
         cursor.execute("SELECT DISTINCT category FROM concepts ORDER BY category")
         return [row['category'] for row in cursor.fetchall()]
     
+    def get_knowledge_counts(self) -> Dict:
+        """Count concepts and distinct categories without loading them"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) AS concepts, COUNT(DISTINCT category) AS categories FROM concepts")
+        return dict(cursor.fetchone())
+    
     # ==================== TRADE OPERATIONS ====================
     
     def add_trade(self, date: str, pair: str, timeframe: str, direction: str,
@@ -313,11 +643,46 @@ class DatabaseManager:
                  take_profit: float = None, exit_price: float = None,
                  quantity: float = None, outcome: str = "pending",
                  setup_type: str = "", notes: str = "",
-                 screenshot_path: str = "", concepts_used: List[str] = None) -> int:
+                 screenshot_path: str = "", concepts_used: List[str] = None,
+                 entry_ts: int = None, exit_ts: int = None, date_closed: str = None) -> int:
         """Add a new trade and return its ID"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        trade_id = self._insert_trade(cursor, date, pair, timeframe, direction, entry_price,
+                                      stop_loss, take_profit, exit_price, quantity, outcome,
+                                      setup_type, notes, screenshot_path, concepts_used,
+                                      entry_ts, exit_ts, date_closed)
+        self._refresh_daily_summary(cursor, [date])
+        
+        conn.commit()
+        self.bump_versions(*self.TRADE_TABLES)
+        return trade_id
+    
+    def add_trades(self, trades: List[Dict]) -> int:
+        """Add many trades (add_trade keyword dicts, optionally with date_closed) in one transaction"""
+        if not trades:
+            return 0
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        for trade in trades:
+            self._insert_trade(cursor, **trade)
+        self._refresh_daily_summary(cursor, sorted({trade['date'] for trade in trades}))
+        
+        conn.commit()
+        self.bump_versions(*self.TRADE_TABLES)
+        return len(trades)
+    
+    def _insert_trade(self, cursor, date: str, pair: str, timeframe: str, direction: str,
+                      entry_price: float = None, stop_loss: float = None,
+                      take_profit: float = None, exit_price: float = None,
+                      quantity: float = None, outcome: str = "pending",
+                      setup_type: str = "", notes: str = "",
+                      screenshot_path: str = "", concepts_used: List[str] = None,
+                      entry_ts: int = None, exit_ts: int = None, date_closed: str = None) -> int:
+        """Insert one trade row, its R-multiples and concepts without committing"""
         pnl = None
         pnl_percent = None
         if exit_price and entry_price and quantity:
@@ -327,18 +692,22 @@ class DatabaseManager:
                 pnl = (entry_price - exit_price) * quantity
             pnl_percent = (pnl / (entry_price * quantity)) * 100 if entry_price else 0
         
-        date_closed = datetime.now().strftime("%Y-%m-%d") if outcome != "pending" else None
+        if outcome == "pending":
+            date_closed = None
+        elif not date_closed:
+            date_closed = datetime.now().strftime("%Y-%m-%d")
         
         cursor.execute("""
             INSERT INTO trades (date, pair, timeframe, direction, entry_price, stop_loss,
                               take_profit, exit_price, quantity, pnl, pnl_percent, outcome,
-                              setup_type, notes, screenshot_path, date_closed)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                              setup_type, notes, screenshot_path, date_closed, entry_ts, exit_ts)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (date, pair, timeframe, direction, entry_price, stop_loss, take_profit,
               exit_price, quantity, pnl, pnl_percent, outcome, setup_type, notes,
-              screenshot_path, date_closed))
+              screenshot_path, date_closed, entry_ts, exit_ts))
         
         trade_id = cursor.lastrowid
+        self._refresh_r_multiples(cursor, trade_id)
         
         if concepts_used:
             for concept in concepts_used:
@@ -346,7 +715,6 @@ class DatabaseManager:
                     cursor.execute("INSERT INTO trade_concepts (trade_id, concept_name) VALUES (?, ?)",
                                  (trade_id, concept.strip()))
         
-        conn.commit()
         return trade_id
     
     def get_all_trades(self) -> List[Dict]:
@@ -364,6 +732,67 @@ class DatabaseManager:
         
         return trades
     
+    TRADE_LIST_SELECT = """
+        SELECT t.id, t.date, t.pair, t.direction, t.entry_price, t.exit_price,
+               t.pnl, t.pnl_percent, t.outcome, t.setup_type,
+               (SELECT group_concat(concept_name, ', ') FROM trade_concepts tc
+                WHERE tc.trade_id = t.id) AS concepts
+        FROM trades t
+    """
+    
+    def get_trades_page(self, limit: int, outcome: str = None,
+                        after: tuple = None) -> List[Dict]:
+        """Get one page of trades for the journal list, newest first
+        
+        ``after`` is the (date, id) of the last row of the previous page
+        (keyset pagination, so deep pages cost the same as the first one).
+        Concepts are joined into a single comma separated string.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        conditions = []
+        params = []
+        if outcome:
+            conditions.append("t.outcome = ?")
+            params.append(outcome)
+        if after:
+            conditions.append("(t.date < ? OR (t.date = ? AND t.id < ?))")
+            params.extend([after[0], after[0], after[1]])
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        cursor.execute(f"""
+            {self.TRADE_LIST_SELECT}
+            {where}
+            ORDER BY t.date DESC, t.id DESC
+            LIMIT ?
+        """, params + [limit])
+        
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def get_trade_list_row(self, trade_id: int) -> Optional[Dict]:
+        """Get one trade in the same shape as get_trades_page rows"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f"{self.TRADE_LIST_SELECT} WHERE t.id = ?", (trade_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+    
+    def get_screenshot_trades(self) -> List[Dict]:
+        """Get trades that have a chart screenshot, newest first"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT id, date, pair, direction, outcome, screenshot_path
+            FROM trades
+            WHERE screenshot_path IS NOT NULL AND screenshot_path != ''
+            ORDER BY date DESC, id DESC
+        """)
+        
+        return [dict(row) for row in cursor.fetchall()]
+    
     def get_trade_by_id(self, trade_id: int) -> Optional[Dict]:
         """Get a single trade with all data"""
         conn = self.get_connection()
@@ -389,6 +818,12 @@ class DatabaseManager:
         
         concepts_used = kwargs.pop('concepts_used', None)
         
+        cursor.execute("SELECT date, outcome, date_closed FROM trades WHERE id = ?", (trade_id,))
+        row = cursor.fetchone()
+        summary_dates = [row['date']] if row else []
+        if kwargs.get('date'):
+            summary_dates.append(kwargs['date'])
+        
         if 'exit_price' in kwargs or 'entry_price' in kwargs or 'quantity' in kwargs:
             trade = self.get_trade_by_id(trade_id)
             entry = kwargs.get('entry_price', trade['entry_price'])
@@ -404,14 +839,25 @@ class DatabaseManager:
                 kwargs['pnl'] = pnl
                 kwargs['pnl_percent'] = (pnl / (entry * qty)) * 100 if entry else 0
         
+        # Only a trade that is closing now gets today's close date; re-saving an
+        # already closed trade keeps its place on the equity curve
         if 'outcome' in kwargs and kwargs['outcome'] != 'pending':
             if not kwargs.get('date_closed'):
-                kwargs['date_closed'] = datetime.now().strftime("%Y-%m-%d")
+                kwargs.pop('date_closed', None)
+                if row is None or row['date_closed'] is None or row['outcome'] == 'pending':
+                    kwargs['date_closed'] = datetime.now().strftime("%Y-%m-%d")
+        
+        # A new entry time invalidates the stored session labels
+        if 'entry_ts' in kwargs:
+            for label in self.TRADE_LABEL_COLUMNS:
+                kwargs.setdefault(label, None)
         
         if kwargs:
             fields = ", ".join([f"{k} = ?" for k in kwargs.keys()])
             values = list(kwargs.values()) + [trade_id]
             cursor.execute(f"UPDATE trades SET {fields} WHERE id = ?", values)
+            self._refresh_r_multiples(cursor, trade_id)
+            self._refresh_daily_summary(cursor, summary_dates)
         
         if concepts_used is not None:
             cursor.execute("DELETE FROM trade_concepts WHERE trade_id = ?", (trade_id,))
@@ -421,13 +867,147 @@ class DatabaseManager:
                                  (trade_id, concept.strip()))
         
         conn.commit()
+        self.bump_versions(*self.TRADE_TABLES)
     
     def delete_trade(self, trade_id: int):
         """Delete a trade"""
         conn = self.get_connection()
         cursor = conn.cursor()
+        cursor.execute("SELECT date FROM trades WHERE id = ?", (trade_id,))
+        row = cursor.fetchone()
         cursor.execute("DELETE FROM trades WHERE id = ?", (trade_id,))
+        cursor.execute("DELETE FROM trade_concepts WHERE trade_id = ?", (trade_id,))
+        if row:
+            self._refresh_daily_summary(cursor, [row['date']])
         conn.commit()
+        self.bump_versions(*self.TRADE_TABLES)
+    
+    def _refresh_r_multiples(self, cursor, trade_id: int = None):
+        """Recompute risk_per_unit, planned_rr and realized_r from the prices
+        
+        One set-based UPDATE serves both the migration backfill (all trades)
+        and single trade writes. R values stay NULL without a usable stop.
+        """
+        where = "WHERE id = ?" if trade_id is not None else ""
+        cursor.execute(f"""
+            UPDATE trades SET
+                risk_per_unit = ABS(entry_price - stop_loss),
+                planned_rr = CASE WHEN ABS(entry_price - stop_loss) > 0
+                    THEN (CASE WHEN lower(direction) = 'long' THEN take_profit - entry_price
+                               ELSE entry_price - take_profit END) / ABS(entry_price - stop_loss) END,
+                realized_r = CASE WHEN ABS(entry_price - stop_loss) > 0
+                    THEN (CASE WHEN lower(direction) = 'long' THEN exit_price - entry_price
+                               ELSE entry_price - exit_price END) / ABS(entry_price - stop_loss) END
+            {where}
+        """, (trade_id,) if trade_id is not None else ())
+    
+    def _refresh_daily_summary(self, cursor, dates: List[str] = None):
+        """Recompute daily_trade_summary rows for some dates (all if None)
+        
+        Each date is re-aggregated from its own trades through the date index,
+        so a single trade write touches one or two summary rows.
+        """
+        where = ""
+        params = []
+        if dates is not None:
+            dates = sorted(set(dates))
+            where = f"WHERE date IN ({', '.join('?' * len(dates))})"
+            params = dates
+        
+        cursor.execute(f"DELETE FROM daily_trade_summary {where}", params)
+        cursor.execute(f"""
+            INSERT INTO daily_trade_summary
+                (date, trade_count, wins, losses, pnl, best_pnl, worst_pnl)
+            SELECT date, COUNT(*), TOTAL(outcome = 'win'), TOTAL(outcome = 'loss'),
+                   COALESCE(SUM(pnl), 0), MAX(pnl), MIN(pnl)
+            FROM trades
+            {where}
+            GROUP BY date
+        """, params)
+    
+    def get_daily_summary(self, start_date: str = None, end_date: str = None) -> List[Dict]:
+        """Get per-day trade count, wins, losses and P&L between two dates"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT * FROM daily_trade_summary
+            WHERE date >= ? AND date <= ?
+            ORDER BY date
+        """, (start_date or '0000-00-00', end_date or '9999-99-99'))
+        
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def get_closed_trade_pnl(self, after: tuple = None) -> List[tuple]:
+        """Get (date_closed, id, pnl) of closed trades in close order, after a cursor"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        condition = "AND (date_closed > ? OR (date_closed = ? AND id > ?))" if after else ""
+        cursor.execute(f"""
+            SELECT date_closed, id, pnl FROM trades
+            WHERE pnl IS NOT NULL AND date_closed IS NOT NULL {condition}
+            ORDER BY date_closed, id
+        """, (after[0], after[0], after[1]) if after else ())
+        
+        return [tuple(row) for row in cursor.fetchall()]
+    
+    def get_closed_edits(self, after_seq: int) -> tuple:
+        """(earliest touched (date_closed, id) or None, last seq) of edits logged after a seq"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT MIN(seq) AS first_seq, MAX(seq) AS last_seq FROM closed_trade_edits WHERE seq > ?
+        """, (after_seq,))
+        row = cursor.fetchone()
+        if row['last_seq'] is None:
+            return None, after_seq
+        
+        cursor.execute("""
+            SELECT date_closed, trade_id FROM closed_trade_edits
+            WHERE seq BETWEEN ? AND ?
+            ORDER BY date_closed, trade_id LIMIT 1
+        """, (row['first_seq'], row['last_seq']))
+        
+        return tuple(cursor.fetchone()), row['last_seq']
+    
+    def get_oldest_closed_edit(self) -> Optional[int]:
+        """Seq of the oldest row left in the closed-trade edit log, or None when empty"""
+        conn = self.get_connection()
+        return conn.execute("SELECT MIN(seq) FROM closed_trade_edits").fetchone()[0]
+    
+    def get_concept_performance(self) -> List[Dict]:
+        """Get trade count, wins, losses and P&L per concept and per concept pair
+        
+        One grouped join over trade_concepts; single concepts come back with
+        ``partner`` NULL, pairs with the alphabetically later concept there.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            WITH used AS (
+                SELECT DISTINCT trade_id, concept_name FROM trade_concepts
+            ),
+            combos AS (
+                SELECT trade_id, concept_name AS concept, NULL AS partner FROM used
+                UNION ALL
+                SELECT a.trade_id, a.concept_name, b.concept_name
+                FROM used a JOIN used b
+                  ON b.trade_id = a.trade_id AND b.concept_name > a.concept_name
+            )
+            SELECT c.concept, c.partner,
+                   COUNT(*) AS trades,
+                   SUM(t.outcome = 'win') AS wins,
+                   SUM(t.outcome = 'loss') AS losses,
+                   TOTAL(t.pnl) AS total_pnl,
+                   AVG(t.pnl) AS expectancy
+            FROM combos c JOIN trades t ON t.id = c.trade_id
+            GROUP BY c.concept, c.partner
+        """)
+        
+        return [dict(row) for row in cursor.fetchall()]
     
     def get_trade_statistics(self) -> Dict:
         """Calculate trade statistics"""
@@ -469,22 +1049,146 @@ class DatabaseManager:
         
         return stats
     
+    def get_r_statistics(self) -> Dict:
+        """Average R, expectancy in R and planned risk/reward over trades with a stop"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT COUNT(realized_r) AS trades,
+                   AVG(realized_r) AS avg_r,
+                   TOTAL(realized_r) AS total_r,
+                   MAX(realized_r) AS best_r,
+                   MIN(realized_r) AS worst_r,
+                   AVG(CASE WHEN realized_r > 0 THEN realized_r END) AS avg_win_r,
+                   AVG(CASE WHEN realized_r < 0 THEN realized_r END) AS avg_loss_r,
+                   AVG(realized_r > 0) * 100 AS win_rate,
+                   AVG(realized_r < 0) * 100 AS loss_rate,
+                   (SELECT AVG(planned_rr) FROM trades WHERE planned_rr IS NOT NULL) AS avg_planned_rr
+            FROM trades
+            WHERE realized_r IS NOT NULL
+        """)
+        stats = dict(cursor.fetchone())
+        
+        # Expectancy = win rate x average win + loss rate x average loss; breakeven
+        # (0R) trades count in neither rate, so this equals the average R
+        win_rate = (stats['win_rate'] or 0) / 100
+        loss_rate = (stats['loss_rate'] or 0) / 100
+        stats['expectancy_r'] = (win_rate * (stats['avg_win_r'] or 0)
+                                 + loss_rate * (stats['avg_loss_r'] or 0)) if stats['trades'] else 0
+        return stats
+    
+    def get_r_distribution(self, bucket: float = 0.5) -> List[Dict]:
+        """Histogram of realized R: [{'low': edge, 'count': n}, ...] in bucket order"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        # SQLite has no FLOOR(); shifting by a large offset makes CAST floor negatives too
+        cursor.execute("""
+            SELECT (CAST(realized_r / :bucket + 1000000 AS INTEGER) - 1000000) * :bucket AS low,
+                   COUNT(*) AS count
+            FROM trades
+            WHERE realized_r IS NOT NULL
+            GROUP BY low
+            ORDER BY low
+        """, {'bucket': bucket})
+        
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def get_closed_trade_r(self) -> List[float]:
+        """Get realized R of closed trades in close order"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT realized_r FROM trades
+            WHERE realized_r IS NOT NULL AND date_closed IS NOT NULL
+            ORDER BY date_closed, id
+        """)
+        
+        return [row[0] for row in cursor.fetchall()]
+    
+    # Grouping expression per breakdown; trading_day is days since 1970-01-01
+    # (a Thursday), so +3 makes Monday 0
+    BREAKDOWN_BUCKETS = {
+        'weekday': "(trading_day + 3) % 7",
+        'hour': "entry_minute / 60",
+        'session': "session",
+        'killzone': "killzone",
+        'macro_window': "macro_window"
+    }
+    
+    def get_time_breakdown(self, dimension: str) -> List[Dict]:
+        """P&L, win rate and R of labeled, timed trades grouped by a time bucket"""
+        bucket = self.BREAKDOWN_BUCKETS.get(dimension)
+        if bucket is None:
+            raise ValueError(f"Unknown breakdown {dimension}")
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f"""
+            SELECT {bucket} AS bucket,
+                   COUNT(*) AS trades,
+                   CAST(TOTAL(outcome = 'win') AS INTEGER) AS wins,
+                   CAST(TOTAL(outcome = 'loss') AS INTEGER) AS losses,
+                   TOTAL(pnl) AS total_pnl,
+                   AVG(pnl) AS avg_pnl,
+                   AVG(realized_r) AS avg_r,
+                   AVG((exit_ts - entry_ts) / 60.0) AS avg_hold_minutes
+            FROM trades
+            WHERE entry_ts IS NOT NULL AND session IS NOT NULL
+            GROUP BY bucket
+            ORDER BY bucket
+        """)
+        
+        return [dict(row) for row in cursor.fetchall()]
+    
     # ==================== MARKET DATA OPERATIONS (NEW) ====================
     
-    def save_market_data(self, date: str, symbol: str, daily_high: float = None, daily_low: float = None):
+    MARKET_DATA_FIELDS = ('open', 'daily_high', 'daily_low', 'close', 'settlement')
+    
+    def save_market_data(self, date: str, symbol: str, daily_high: float = None,
+                         daily_low: float = None, open_price: float = None,
+                         close: float = None, settlement: float = None):
         """Save or update market data for a symbol on a specific date"""
+        self.save_market_data_batch([{
+            'date': date,
+            'symbol': symbol,
+            'open': open_price,
+            'daily_high': daily_high,
+            'daily_low': daily_low,
+            'close': close,
+            'settlement': settlement
+        }])
+    
+    def save_market_data_batch(self, rows: List[Dict]):
+        """Upsert many market data rows in a single transaction"""
+        if not rows:
+            return
+        
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute("""
-            INSERT INTO market_data (date, symbol, daily_high, daily_low)
-            VALUES (?, ?, ?, ?)
+        params = [
+            {'date': row['date'], 'symbol': row['symbol'],
+             **{field: row.get(field) for field in self.MARKET_DATA_FIELDS}}
+            for row in rows
+        ]
+        
+        cursor.executemany("""
+            INSERT INTO market_data (date, symbol, open, daily_high, daily_low, close, settlement)
+            VALUES (:date, :symbol, :open, :daily_high, :daily_low, :close, :settlement)
             ON CONFLICT(date, symbol) DO UPDATE SET
+                open = excluded.open,
                 daily_high = excluded.daily_high,
-                daily_low = excluded.daily_low
-        """, (date, symbol, daily_high, daily_low))
+                daily_low = excluded.daily_low,
+                close = excluded.close,
+                settlement = excluded.settlement
+        """, params)
         
         conn.commit()
+        self.bump_versions('market_data')
     
     def get_market_data(self, date: str, symbol: str) -> Optional[Dict]:
         """Get market data for a symbol on a specific date"""
@@ -511,6 +1215,300 @@ class DatabaseManager:
         
         return [dict(row) for row in cursor.fetchall()]
     
+    def get_market_data_for_date(self, date: str, symbols: List[str]) -> Dict[str, Dict]:
+        """Get the rows saved for a date for many symbols, keyed by symbol"""
+        if not symbols:
+            return {}
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        placeholders = ", ".join("?" for _ in symbols)
+        cursor.execute(f"""
+            SELECT * FROM market_data
+            WHERE date = ? AND symbol IN ({placeholders})
+        """, [date, *symbols])
+        
+        return {row['symbol']: dict(row) for row in cursor.fetchall()}
+    
+    # ==================== BAR & LABEL OPERATIONS (NEW) ====================
+    
+    LABEL_COLUMNS = ('trading_day', 'session', 'killzone', 'macro_window')
+    # Bump when labeling rules change; stored labels are then recomputed
+    # (2: killzones are cleared on holidays and after early closes,
+    #  3: macro windows are too)
+    LABEL_SCHEME = 3
+    # Trades also keep the New York minute of day they were entered at
+    TRADE_LABEL_COLUMNS = LABEL_COLUMNS + ('entry_minute',)
+    
+    def save_bars(self, symbol: str, timeframe: str, bars: List[tuple]):
+        """Upsert (ts, open, high, low, close, volume) bars for a symbol"""
+        if not bars:
+            return
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.executemany("""
+            INSERT INTO bars (symbol, timeframe, ts, open, high, low, close, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(symbol, timeframe, ts) DO UPDATE SET
+                open = excluded.open,
+                high = excluded.high,
+                low = excluded.low,
+                close = excluded.close,
+                volume = excluded.volume
+        """, ((symbol, timeframe, *bar) for bar in bars))
+        
+        conn.commit()
+        self.bump_versions('bars')
+    
+    def get_unlabeled_bars(self, limit: int) -> List[tuple]:
+        """Get (id, ts) for bars that have not been labeled yet"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT id, ts FROM bars WHERE session IS NULL ORDER BY id LIMIT ?
+        """, (limit,))
+        
+        return cursor.fetchall()
+    
+    def get_unlabeled_trades(self) -> List[tuple]:
+        """Get (id, entry_ts) for timed trades that have not been labeled yet"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT id, entry_ts FROM trades
+            WHERE session IS NULL AND entry_ts IS NOT NULL
+        """)
+        
+        return cursor.fetchall()
+    
+    def save_labels(self, table: str, rows: List[tuple]):
+        """Write label rows: LABEL_COLUMNS (TRADE_LABEL_COLUMNS for trades), then id"""
+        if table not in ('bars', 'trades'):
+            raise ValueError(f"Cannot label table {table}")
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        columns = self.TRADE_LABEL_COLUMNS if table == 'trades' else self.LABEL_COLUMNS
+        cursor.executemany(f"""
+            UPDATE {table}
+            SET {", ".join(f"{column} = ?" for column in columns)}
+            WHERE id = ?
+        """, rows)
+        
+        conn.commit()
+        self.bump_versions(table)
+    
+    def get_bar_series(self) -> List[tuple]:
+        """Get (symbol, timeframe, bar count) for every series in the bar store"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT symbol, timeframe, COUNT(*) AS bars FROM bars
+            GROUP BY symbol, timeframe
+            ORDER BY bars DESC
+        """)
+        
+        return [tuple(row) for row in cursor.fetchall()]
+    
+    def get_labeled_bars(self, symbol: str, timeframe: str, from_trading_day: int = None) -> List[tuple]:
+        """Get (trading_day, killzone, macro_window, open, high, low, close) in time order"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT trading_day, killzone, macro_window, open, high, low, close
+            FROM bars
+            WHERE symbol = ? AND timeframe = ? AND session IS NOT NULL
+              AND trading_day >= ?
+            ORDER BY ts
+        """, (symbol, timeframe, from_trading_day if from_trading_day is not None else -1))
+        
+        return cursor.fetchall()
+    
+    def get_last_occurrence_day(self, symbol: str, timeframe: str, kind: str) -> Optional[int]:
+        """Latest trading day with stored window occurrences"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT MAX(trading_day) AS last_day FROM window_occurrences
+            WHERE symbol = ? AND timeframe = ? AND kind = ?
+        """, (symbol, timeframe, kind))
+        
+        return cursor.fetchone()['last_day']
+    
+    def get_occurrence_mark(self, symbol: str, timeframe: str, kind: str) -> int:
+        """Highest bar id the stored occurrences were computed through (0 if none)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT last_bar_id FROM occurrence_marks
+            WHERE symbol = ? AND timeframe = ? AND kind = ?
+        """, (symbol, timeframe, kind))
+        
+        row = cursor.fetchone()
+        return row['last_bar_id'] if row else 0
+    
+    def get_new_labeled_bar_range(self, symbol: str, timeframe: str, after_id: int) -> tuple:
+        """(earliest trading day, highest id) of labeled bars added after a bar id"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT MIN(trading_day) AS first_day, MAX(id) AS last_id FROM bars
+            WHERE id > ? AND symbol = ? AND timeframe = ? AND session IS NOT NULL
+        """, (after_id, symbol, timeframe))
+        
+        row = cursor.fetchone()
+        return row['first_day'], row['last_id']
+    
+    def replace_window_occurrences(self, symbol: str, timeframe: str, kind: str,
+                                   from_trading_day: int, rows: List[tuple], last_bar_id: int):
+        """Replace occurrences from a trading day onwards with freshly computed
+        (trading_day, window_id, range_size, displacement, sets_high, sets_low) rows
+        
+        last_bar_id is recorded as the series' mark in the same transaction.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            DELETE FROM window_occurrences
+            WHERE symbol = ? AND timeframe = ? AND kind = ? AND trading_day >= ?
+        """, (symbol, timeframe, kind, from_trading_day))
+        
+        cursor.executemany("""
+            INSERT INTO window_occurrences (symbol, timeframe, kind, trading_day, window_id,
+                                            range_size, displacement, sets_high, sets_low)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, ((symbol, timeframe, kind, *row) for row in rows))
+        
+        cursor.execute("""
+            INSERT OR REPLACE INTO occurrence_marks (symbol, timeframe, kind, last_bar_id)
+            VALUES (?, ?, ?, ?)
+        """, (symbol, timeframe, kind, last_bar_id))
+        
+        conn.commit()
+        self.bump_versions('window_occurrences')
+    
+    def get_window_occurrences(self, symbol: str, timeframe: str, kind: str) -> List[tuple]:
+        """Get (trading_day, window_id, range_size, displacement, sets_high, sets_low)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT trading_day, window_id, range_size, displacement, sets_high, sets_low
+            FROM window_occurrences
+            WHERE symbol = ? AND timeframe = ? AND kind = ?
+        """, (symbol, timeframe, kind))
+        
+        return cursor.fetchall()
+    
+    # ==================== ATTACHMENT OPERATIONS (NEW) ====================
+    
+    def save_attachment(self, attachment: Dict):
+        """Record a stored blob; importing a known hash again only refreshes imported_at"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            INSERT INTO attachments
+                (hash, path, size_bytes, width, height, original_name, imported_at)
+            VALUES (:hash, :path, :size_bytes, :width, :height, :original_name, :imported_at)
+            ON CONFLICT(hash) DO UPDATE SET imported_at = excluded.imported_at
+        """, attachment)
+        
+        conn.commit()
+        self.bump_versions('attachments')
+    
+    def get_attachment(self, content_hash: str) -> Optional[Dict]:
+        """Get an attachment by content hash"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT * FROM attachments WHERE hash = ?", (content_hash,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+    
+    UNREFERENCED_ATTACHMENT = """
+        a.imported_at < ?
+        AND NOT EXISTS (SELECT 1 FROM trades t WHERE t.screenshot_path = a.path)
+    """
+    
+    def get_unreferenced_attachments(self, imported_before: int) -> List[Dict]:
+        """Get attachments no trade points at, last imported before a cutoff"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f"""
+            SELECT hash, path, size_bytes FROM attachments a
+            WHERE {self.UNREFERENCED_ATTACHMENT}
+        """, (imported_before,))
+        
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def get_attachment_paths(self) -> set:
+        """Get the stored path of every known attachment"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT path FROM attachments")
+        return {row['path'] for row in cursor.fetchall()}
+    
+    def delete_unreferenced_attachment(self, content_hash: str, imported_before: int) -> bool:
+        """Delete an attachment record if it is still unreferenced; True if deleted
+        
+        The condition is re-checked at delete time so a trade saved, or an image
+        re-imported, since the GC pass listed it keeps its blob.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f"""
+            DELETE FROM attachments
+            WHERE hash = ? AND hash IN (
+                SELECT a.hash FROM attachments a WHERE {self.UNREFERENCED_ATTACHMENT}
+            )
+        """, (content_hash, imported_before))
+        conn.commit()
+        self.bump_versions('attachments')
+        return cursor.rowcount > 0
+    
+    def get_unmanaged_screenshot_paths(self) -> List[str]:
+        """Get screenshot paths trades use that are not stored attachments"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT DISTINCT screenshot_path FROM trades
+            WHERE screenshot_path IS NOT NULL AND screenshot_path != ''
+              AND screenshot_path NOT IN (SELECT path FROM attachments)
+        """)
+        return [row[0] for row in cursor.fetchall()]
+    
+    def replace_screenshot_paths(self, paths: Dict[str, str]):
+        """Point every trade using an old screenshot path at its new one"""
+        if not paths:
+            return
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.executemany("""
+            UPDATE trades SET screenshot_path = ? WHERE screenshot_path = ?
+        """, [(new, old) for old, new in paths.items()])
+        
+        conn.commit()
+        self.bump_versions('trades')
+    
     # ==================== CONCEPT NOTES OPERATIONS (NEW) ====================
     
     def save_concept_notes(self, concept_id: str, notes: str):
@@ -529,6 +1527,15 @@ class DatabaseManager:
         """, (concept_id, notes, last_updated))
         
         conn.commit()
+        self.bump_versions('concept_notes')
+    
+    def get_all_concept_notes(self) -> Dict[str, str]:
+        """Get every saved note keyed by concept ID"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT concept_id, notes FROM concept_notes")
+        return {row['concept_id']: row['notes'] for row in cursor.fetchall()}
     
     def get_concept_notes(self, concept_id: str) -> Optional[str]:
         """Get personal notes for a concept"""
@@ -542,8 +1549,42 @@ class DatabaseManager:
         row = cursor.fetchone()
         return row['notes'] if row else None
     
+    # ==================== MAINTENANCE ====================
+    
+    def get_table_counts(self) -> Dict[str, int]:
+        """Row count of every table"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")
+        tables = [row['name'] for row in cursor.fetchall()]
+        return {table: cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+    
+    def integrity_check(self) -> List[str]:
+        """SQLite integrity check messages; ['ok'] when the file is sound"""
+        conn = self.get_connection()
+        return [row[0] for row in conn.execute("PRAGMA integrity_check").fetchall()]
+    
+    def optimize(self):
+        """Trim the closed-trade edit log and refresh the query planner statistics"""
+        conn = self.get_connection()
+        self._prune_closed_edits(conn.cursor())
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+        conn.commit()
+    
+    def vacuum(self):
+        """Rebuild the file to reclaim free pages and fold the WAL back in"""
+        conn = self.get_connection()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+    
     def close(self):
         """Close database connection"""
         if self.conn:
             self.conn.close()
-            self.conn = None
\ No newline at end of file
+            self.conn = None
+        with self.worker_lock:
+            for conn in self.worker_conns.values():
+                conn.close()
+            self.worker_conns.clear()
\ No newline at end of file
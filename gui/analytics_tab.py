@@ -3,18 +3,157 @@ Analytics Tab - Trading performance metrics and statistics
 """
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                            QGroupBox, QGridLayout, QScrollArea)
-from PyQt6.QtCore import Qt
+                            QGroupBox, QGridLayout, QScrollArea, QComboBox,
+                            QTableView, QHeaderView, QPushButton, QDoubleSpinBox,
+                            QSpinBox, QFileDialog, QMessageBox)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PyQt6.QtGui import QFont
 from database.db_manager import DatabaseManager
+from gui.query_runner import QueryRunner, LoadingLabel
+from gui.equity_chart import EquityChart
+from gui.r_histogram import RHistogram
+from gui import theme
+from gui.theme import style
+from analysis.equity import EquityEngine, ROLLING_WINDOW
+from analysis.concept_stats import concept_performance, SOURCE_TABLES as CONCEPT_TABLES
+from analysis.result_cache import ResultCache
+from analysis.monte_carlo import simulate_journal, DEFAULT_BLOCK, DEFAULT_SEED
+from analysis.breakdowns import BreakdownEngine, DIMENSIONS, DIMENSION_TITLES
+from reports.performance_report import generate_report
+from datetime import date
+
+R_BUCKET = 0.5
+
+# Tables whose writes make the tab's numbers stale
+ANALYTICS_TABLES = ('trades', 'trade_concepts', 'concepts')
+
+def load_analytics(db: DatabaseManager, results: ResultCache, equity_engine: EquityEngine,
+                   breakdowns: BreakdownEngine):
+    """Everything the tab shows, read on a query worker thread
+    
+    Each part comes from a cache keyed by the data versions of the tables it
+    reads, so only the parts whose tables were written are recomputed.
+    """
+    stats = results.get('stats', ('trades',), DatabaseManager.get_trade_statistics)
+    counts = results.get('knowledge', ('concepts',), DatabaseManager.get_knowledge_counts)
+    r_stats = results.get('r_stats', ('trades',), DatabaseManager.get_r_statistics)
+    r_distribution = results.get('r_distribution', ('trades',),
+                                 lambda db: db.get_r_distribution(R_BUCKET))
+    return {
+        'stats': (stats, counts['concepts'], counts['categories']),
+        'r': (r_stats, r_distribution),
+        'concepts': results.get('concepts', CONCEPT_TABLES, concept_performance),
+        'breakdowns': breakdowns.get_all(),
+        'equity': equity_engine.update()
+    }
+
+
+class ConceptStatsModel(QAbstractTableModel):
+    """Sortable per-concept (or per-pair) performance rows"""
+    
+    HEADERS = ["Concept", "Trades", "Win Rate", "Expectancy", "Total P&L"]
+    KEYS = ['concept', 'trades', 'win_rate', 'expectancy', 'total_pnl']
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.sort_column = 1
+        self.sort_order = Qt.SortOrder.DescendingOrder
+        theme.notifier.changed.connect(self.on_theme_changed)
+    
+    def on_theme_changed(self):
+        """Repaint the colored cells in the new palette"""
+        if self.rows:
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(len(self.rows) - 1, len(self.HEADERS) - 1),
+                                  [Qt.ItemDataRole.ForegroundRole])
+    
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = list(rows)
+        self.sort_rows()
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        row = self.rows[index.row()]
+        value = row[self.KEYS[index.column()]]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if index.column() == 0:
+                return value
+            if index.column() == 1:
+                return str(value)
+            if value is None:
+                return "-"
+            if index.column() == 2:
+                return f"{value:.1f}%"
+            return f"${value:.2f}"
+        if role == Qt.ItemDataRole.ForegroundRole and index.column() >= 3 and value:
+            return theme.color('green' if value > 0 else 'red')
+        return None
+    
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self.sort_column = column
+        self.sort_order = order
+        self.sort_rows()
+        self.layoutChanged.emit()
+    
+    def sort_rows(self):
+        key = self.KEYS[self.sort_column]
+        descending = self.sort_order == Qt.SortOrder.DescendingOrder
+        # Rows without a value (no decided trades / no P&L) always sort last
+        present = [row for row in self.rows if row[key] is not None]
+        missing = [row for row in self.rows if row[key] is None]
+        present.sort(key=lambda row: row[key], reverse=descending)
+        self.rows = present + missing
+
+
+class BreakdownModel(ConceptStatsModel):
+    """Time breakdown rows; the first column sorts in bucket order"""
+    
+    HEADERS = ["Bucket", "Trades", "Win Rate", "Avg P&L", "Total P&L"]
+    KEYS = ['name', 'trades', 'win_rate', 'avg_pnl', 'total_pnl']
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sort_column = 0
+        self.sort_order = Qt.SortOrder.AscendingOrder
+    
+    def sort_rows(self):
+        if self.sort_column == 0:
+            descending = self.sort_order == Qt.SortOrder.DescendingOrder
+            self.rows.sort(key=lambda row: row['bucket'], reverse=descending)
+        else:
+            super().sort_rows()
 
 class AnalyticsTab(QWidget):
-    def __init__(self, db: DatabaseManager):
+    def __init__(self, db: DatabaseManager, queries: QueryRunner):
         super().__init__()
         self.db = db
+        self.queries = queries
+        self.equity_engine = EquityEngine(db)
+        self.breakdowns = BreakdownEngine(db)
+        self.breakdown_results = {dimension: [] for dimension in DIMENSIONS}
+        self.results = ResultCache(db)
+        self.concept_results = {'concepts': [], 'pairs': []}
+        self.shown_version = None
         self.init_ui()
         self.refresh_data()
-        
+    
     def init_ui(self):
         """Initialize the analytics interface"""
         main_layout = QVBoxLayout(self)
@@ -32,18 +171,26 @@ class AnalyticsTab(QWidget):
         
         # Title
         title = QLabel("📈 Trading Performance Analytics")
-        title.setStyleSheet("font-size: 24px; font-weight: bold; color: #3b82f6; padding: 10px;")
-        layout.addWidget(title)
+        style(title, role="titleSmall", accent="blue")
+        title_layout = QHBoxLayout()
+        title_layout.addWidget(title)
+        title_layout.addStretch()
+        title_layout.addWidget(LoadingLabel(self.queries, "analytics", "⏳ Refreshing..."))
+        title_layout.addWidget(LoadingLabel(self.queries, "report", "⏳ Building report..."))
+        report_btn = QPushButton("📄 Export Report")
+        report_btn.clicked.connect(self.export_report)
+        title_layout.addWidget(report_btn)
+        layout.addLayout(title_layout)
         
         # Overview Stats
         overview_group = QGroupBox("Overview Statistics")
         overview_layout = QGridLayout()
         
         self.total_trades_label = self.create_stat_label("0", "Total Trades")
-        self.wins_label = self.create_stat_label("0", "Wins", "#10b981")
-        self.losses_label = self.create_stat_label("0", "Losses", "#dc2626")
-        self.pending_label = self.create_stat_label("0", "Pending", "#f59e0b")
-        self.win_rate_label = self.create_stat_label("0%", "Win Rate", "#3b82f6")
+        self.wins_label = self.create_stat_label("0", "Wins", "green")
+        self.losses_label = self.create_stat_label("0", "Losses", "red")
+        self.pending_label = self.create_stat_label("0", "Pending", "orange")
+        self.win_rate_label = self.create_stat_label("0%", "Win Rate", "blue")
         
         overview_layout.addWidget(self.total_trades_label, 0, 0)
         overview_layout.addWidget(self.wins_label, 0, 1)
@@ -60,8 +207,8 @@ class AnalyticsTab(QWidget):
         
         self.total_pnl_label = self.create_stat_label("$0.00", "Total P&L")
         self.avg_pnl_label = self.create_stat_label("$0.00", "Avg P&L per Trade")
-        self.best_trade_label = self.create_stat_label("$0.00", "Best Trade", "#10b981")
-        self.worst_trade_label = self.create_stat_label("$0.00", "Worst Trade", "#dc2626")
+        self.best_trade_label = self.create_stat_label("$0.00", "Best Trade", "green")
+        self.worst_trade_label = self.create_stat_label("$0.00", "Worst Trade", "red")
         
         pnl_layout.addWidget(self.total_pnl_label, 0, 0)
         pnl_layout.addWidget(self.avg_pnl_label, 0, 1)
@@ -71,12 +218,183 @@ class AnalyticsTab(QWidget):
         pnl_group.setLayout(pnl_layout)
         layout.addWidget(pnl_group)
         
+        # Equity curve and drawdown
+        equity_group = QGroupBox("Equity Curve")
+        equity_layout = QVBoxLayout()
+        
+        self.equity_chart = EquityChart()
+        equity_layout.addWidget(self.equity_chart)
+        
+        equity_stats_layout = QGridLayout()
+        self.max_drawdown_label = self.create_stat_label("$0.00", "Max Drawdown", "red")
+        self.drawdown_length_label = self.create_stat_label("0", "Longest Drawdown (trades)", "orange")
+        self.rolling_win_rate_label = self.create_stat_label(
+            "0%", f"Win Rate (last {ROLLING_WINDOW})", "blue")
+        self.rolling_expectancy_label = self.create_stat_label(
+            "$0.00", f"Expectancy (last {ROLLING_WINDOW})")
+        
+        equity_stats_layout.addWidget(self.max_drawdown_label, 0, 0)
+        equity_stats_layout.addWidget(self.drawdown_length_label, 0, 1)
+        equity_stats_layout.addWidget(self.rolling_win_rate_label, 0, 2)
+        equity_stats_layout.addWidget(self.rolling_expectancy_label, 0, 3)
+        equity_layout.addLayout(equity_stats_layout)
+        
+        equity_group.setLayout(equity_layout)
+        layout.addWidget(equity_group)
+        
+        # R-multiples
+        r_group = QGroupBox("R-Multiples")
+        r_layout = QVBoxLayout()
+        
+        r_stats_layout = QGridLayout()
+        self.avg_r_label = self.create_stat_label("-", "Average R")
+        self.expectancy_r_label = self.create_stat_label("-", "Expectancy (R)")
+        self.total_r_label = self.create_stat_label("-", "Total R")
+        self.planned_rr_label = self.create_stat_label("-", "Avg Planned R:R", "blue")
+        self.r_trades_label = self.create_stat_label("0", "Trades with Stop", "violet")
+        
+        r_stats_layout.addWidget(self.avg_r_label, 0, 0)
+        r_stats_layout.addWidget(self.expectancy_r_label, 0, 1)
+        r_stats_layout.addWidget(self.total_r_label, 0, 2)
+        r_stats_layout.addWidget(self.planned_rr_label, 0, 3)
+        r_stats_layout.addWidget(self.r_trades_label, 0, 4)
+        r_layout.addLayout(r_stats_layout)
+        
+        self.r_histogram = RHistogram()
+        r_layout.addWidget(self.r_histogram)
+        
+        r_group.setLayout(r_layout)
+        layout.addWidget(r_group)
+        
+        # Monte Carlo risk
+        risk_group = QGroupBox("Monte Carlo Risk")
+        risk_layout = QVBoxLayout()
+        
+        risk_controls = QHBoxLayout()
+        risk_controls.addWidget(QLabel("Resample:"))
+        self.mc_unit_input = QComboBox()
+        self.mc_unit_input.addItem("P&L ($)", 'pnl')
+        self.mc_unit_input.addItem("R-Multiples", 'r')
+        self.mc_unit_input.currentIndexChanged.connect(self.on_mc_unit_changed)
+        risk_controls.addWidget(self.mc_unit_input)
+        
+        risk_controls.addWidget(QLabel("Method:"))
+        self.mc_method_input = QComboBox()
+        self.mc_method_input.addItem("Bootstrap", 'bootstrap')
+        self.mc_method_input.addItem(f"Block Bootstrap ({DEFAULT_BLOCK} trades)", 'block')
+        risk_controls.addWidget(self.mc_method_input)
+        
+        risk_controls.addWidget(QLabel("Paths:"))
+        self.mc_paths_input = QComboBox()
+        for paths in (10_000, 100_000, 250_000, 500_000):
+            self.mc_paths_input.addItem(f"{paths:,}", paths)
+        self.mc_paths_input.setCurrentIndex(1)
+        risk_controls.addWidget(self.mc_paths_input)
+        
+        risk_controls.addWidget(QLabel("Ruin at loss of:"))
+        self.mc_ruin_input = QDoubleSpinBox()
+        self.mc_ruin_input.setRange(1, 1_000_000_000)
+        self.mc_ruin_input.setValue(1000)
+        self.mc_ruin_input.setPrefix("$")
+        risk_controls.addWidget(self.mc_ruin_input)
+        
+        risk_controls.addWidget(QLabel("Seed:"))
+        self.mc_seed_input = QSpinBox()
+        self.mc_seed_input.setRange(0, 2_147_483_647)
+        self.mc_seed_input.setValue(DEFAULT_SEED)
+        risk_controls.addWidget(self.mc_seed_input)
+        
+        run_btn = QPushButton("🎲 Run Simulation")
+        run_btn.clicked.connect(self.run_monte_carlo)
+        risk_controls.addWidget(run_btn)
+        risk_controls.addStretch()
+        risk_controls.addWidget(LoadingLabel(self.queries, "montecarlo", "⏳ Simulating..."))
+        risk_layout.addLayout(risk_controls)
+        
+        risk_stats_layout = QGridLayout()
+        self.mc_median_dd_label = self.create_stat_label("-", "Median Max Drawdown", "orange")
+        self.mc_p95_dd_label = self.create_stat_label("-", "95th pct Max Drawdown", "red")
+        self.mc_p99_dd_label = self.create_stat_label("-", "99th pct Max Drawdown", "red")
+        self.mc_ruin_label = self.create_stat_label("-", "Risk of Ruin", "red")
+        self.mc_streak_label = self.create_stat_label("-", "Losing Streak (median / 95th)", "orange")
+        
+        risk_stats_layout.addWidget(self.mc_median_dd_label, 0, 0)
+        risk_stats_layout.addWidget(self.mc_p95_dd_label, 0, 1)
+        risk_stats_layout.addWidget(self.mc_p99_dd_label, 0, 2)
+        risk_stats_layout.addWidget(self.mc_ruin_label, 0, 3)
+        risk_stats_layout.addWidget(self.mc_streak_label, 0, 4)
+        risk_layout.addLayout(risk_stats_layout)
+        
+        self.mc_details_label = QLabel("Resample your closed trades to see the drawdowns they could produce.")
+        self.mc_details_label.setWordWrap(True)
+        style(self.mc_details_label, role="caption")
+        risk_layout.addWidget(self.mc_details_label)
+        
+        risk_group.setLayout(risk_layout)
+        layout.addWidget(risk_group)
+        
+        # Concept performance
+        concept_group = QGroupBox("Concept Performance")
+        concept_layout = QVBoxLayout()
+        
+        concept_header = QHBoxLayout()
+        concept_header.addWidget(QLabel("Show:"))
+        self.concept_mode_input = QComboBox()
+        self.concept_mode_input.addItems(["Concepts", "Concept Pairs"])
+        self.concept_mode_input.currentTextChanged.connect(self.show_concept_rows)
+        concept_header.addWidget(self.concept_mode_input)
+        concept_header.addStretch()
+        concept_layout.addLayout(concept_header)
+        
+        self.concept_model = ConceptStatsModel(self)
+        self.concept_table = QTableView()
+        self.concept_table.setModel(self.concept_model)
+        self.concept_table.setSortingEnabled(True)
+        self.concept_table.sortByColumn(1, Qt.SortOrder.DescendingOrder)
+        self.concept_table.setMinimumHeight(260)
+        self.concept_table.verticalHeader().setVisible(False)
+        self.concept_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        concept_layout.addWidget(self.concept_table)
+        
+        concept_group.setLayout(concept_layout)
+        layout.addWidget(concept_group)
+        
+        # Time and session breakdowns
+        breakdown_group = QGroupBox("Time & Session Performance")
+        breakdown_layout = QVBoxLayout()
+        
+        breakdown_header = QHBoxLayout()
+        breakdown_header.addWidget(QLabel("Group by:"))
+        self.breakdown_input = QComboBox()
+        for dimension in DIMENSIONS:
+            self.breakdown_input.addItem(DIMENSION_TITLES[dimension], dimension)
+        self.breakdown_input.currentIndexChanged.connect(self.show_breakdown_rows)
+        breakdown_header.addWidget(self.breakdown_input)
+        breakdown_header.addStretch()
+        hint = QLabel("Only trades with an entry time are included")
+        style(hint, role="hint")
+        breakdown_header.addWidget(hint)
+        breakdown_layout.addLayout(breakdown_header)
+        
+        self.breakdown_model = BreakdownModel(self)
+        self.breakdown_table = QTableView()
+        self.breakdown_table.setModel(self.breakdown_model)
+        self.breakdown_table.setSortingEnabled(True)
+        self.breakdown_table.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self.breakdown_table.setMinimumHeight(260)
+        self.breakdown_table.verticalHeader().setVisible(False)
+        self.breakdown_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        breakdown_layout.addWidget(self.breakdown_table)
+        
+        breakdown_group.setLayout(breakdown_layout)
+        layout.addWidget(breakdown_group)
+        
         # Knowledge Base Stats
         kb_group = QGroupBox("Knowledge Base")
         kb_layout = QHBoxLayout()
         
-        self.total_concepts_label = self.create_stat_label("0", "Total Concepts", "#8b5cf6")
-        self.categories_label = self.create_stat_label("0", "Categories", "#8b5cf6")
+        self.total_concepts_label = self.create_stat_label("0", "Total Concepts", "violet")
+        self.categories_label = self.create_stat_label("0", "Categories", "violet")
         
         kb_layout.addWidget(self.total_concepts_label)
         kb_layout.addWidget(self.categories_label)
@@ -91,7 +409,7 @@ class AnalyticsTab(QWidget):
         
         self.insights_label = QLabel("Loading insights...")
         self.insights_label.setWordWrap(True)
-        self.insights_label.setStyleSheet("padding: 15px; line-height: 1.6;")
+        style(self.insights_label, role="body")
         insights_layout.addWidget(self.insights_label)
         
         insights_group.setLayout(insights_layout)
@@ -101,34 +419,21 @@ class AnalyticsTab(QWidget):
         
         scroll.setWidget(content_widget)
         main_layout.addWidget(scroll)
-        
-    def create_stat_label(self, value: str, description: str, color: str = "#e2e8f0"):
+    
+    def create_stat_label(self, value: str, description: str, accent: str = "text"):
         """Create a styled stat label"""
         container = QWidget()
-        container.setStyleSheet(f"""
-            QWidget {{
-                background-color: #334155;
-                border-radius: 8px;
-                padding: 15px;
-            }}
-        """)
+        style(container, role="statCard")
         
         layout = QVBoxLayout(container)
         layout.setSpacing(5)
         
         value_label = QLabel(value)
-        value_label.setStyleSheet(f"""
-            font-size: 32px;
-            font-weight: bold;
-            color: {color};
-        """)
+        style(value_label, role="statValue", accent=accent)
         value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         desc_label = QLabel(description)
-        desc_label.setStyleSheet("""
-            font-size: 13px;
-            color: #94a3b8;
-        """)
+        style(desc_label, role="statDesc")
         desc_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         layout.addWidget(value_label)
@@ -141,9 +446,56 @@ class AnalyticsTab(QWidget):
         return container
     
     def refresh_data(self):
-        """Refresh all analytics data"""
-        # Get trade statistics
-        stats = self.db.get_trade_statistics()
+        """Refresh analytics in the background unless nothing they read has changed"""
+        version = self.db.get_versions(ANALYTICS_TABLES)
+        if version == self.shown_version:
+            return
+        self.queries.submit("analytics:refresh", load_analytics, self.results,
+                            self.equity_engine, self.breakdowns,
+                            on_result=lambda result: self.show_results(result, version))
+    
+    def run_monte_carlo(self):
+        """Simulate in the background; the result stays valid across tab switches"""
+        self.queries.submit("montecarlo:run", simulate_journal,
+                            self.mc_paths_input.currentData(), self.mc_method_input.currentData(),
+                            DEFAULT_BLOCK, self.mc_ruin_input.value(), self.mc_seed_input.value(),
+                            self.mc_unit_input.currentData(), batch=True,
+                            on_result=self.show_monte_carlo, on_error=self.show_monte_carlo_error)
+    
+    def export_report(self):
+        """Write an HTML or PDF performance report in the background"""
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Performance Report",
+            f"trading_report_{date.today().isoformat()}.pdf",
+            "PDF (*.pdf);;HTML (*.html)"
+        )
+        if path:
+            self.queries.submit("report:export", generate_report, path, batch=True,
+                                on_result=self.on_report_exported, on_error=self.on_report_failed)
+    
+    def on_report_exported(self, result):
+        QMessageBox.information(self, "Report Exported", f"Report saved to:\n{result['path']}")
+    
+    def on_report_failed(self, message):
+        QMessageBox.warning(self, "Error", f"Could not build report:\n{message}")
+    
+    def hideEvent(self, event):
+        """Drop a refresh that finishes after the user has moved on"""
+        self.queries.cancel_group("analytics")
+        super().hideEvent(event)
+    
+    def show_results(self, result, version):
+        self.show_data(result['stats'])
+        self.show_r_stats(*result['r'])
+        self.show_concept_stats(result['concepts'])
+        self.show_breakdowns(result['breakdowns'])
+        self.show_equity(result['equity'])
+        self.shown_version = version
+    
+    def show_data(self, result):
+        """Update every label from a finished refresh"""
+        stats, concept_count, category_count = result
         
         # Update overview
         self.total_trades_label.value_label.setText(str(stats['total_trades']))
@@ -154,37 +506,110 @@ class AnalyticsTab(QWidget):
         
         # Update P&L
         total_pnl = stats['total_pnl']
-        pnl_color = "#10b981" if total_pnl >= 0 else "#dc2626"
         self.total_pnl_label.value_label.setText(f"${total_pnl:.2f}")
-        self.total_pnl_label.value_label.setStyleSheet(f"""
-            font-size: 32px;
-            font-weight: bold;
-            color: {pnl_color};
-        """)
+        style(self.total_pnl_label.value_label, accent="green" if total_pnl >= 0 else "red")
         
         avg_pnl = stats['avg_pnl']
-        avg_color = "#10b981" if avg_pnl >= 0 else "#dc2626"
         self.avg_pnl_label.value_label.setText(f"${avg_pnl:.2f}")
-        self.avg_pnl_label.value_label.setStyleSheet(f"""
-            font-size: 32px;
-            font-weight: bold;
-            color: {avg_color};
-        """)
+        style(self.avg_pnl_label.value_label, accent="green" if avg_pnl >= 0 else "red")
         
         self.best_trade_label.value_label.setText(f"${stats['best_trade']:.2f}")
         self.worst_trade_label.value_label.setText(f"${stats['worst_trade']:.2f}")
         
         # Knowledge base stats
-        concepts = self.db.get_all_concepts()
-        categories = self.db.get_all_categories()
-        
-        self.total_concepts_label.value_label.setText(str(len(concepts)))
-        self.categories_label.value_label.setText(str(len(categories)))
+        self.total_concepts_label.value_label.setText(str(concept_count))
+        self.categories_label.value_label.setText(str(category_count))
         
         # Generate insights
-        insights = self.generate_insights(stats, len(concepts))
+        insights = self.generate_insights(stats, concept_count)
         self.insights_label.setText(insights)
     
+    def show_r_stats(self, stats, distribution):
+        """Update the R-multiple cards and histogram"""
+        for label, key in ((self.avg_r_label, 'avg_r'), (self.expectancy_r_label, 'expectancy_r'),
+                           (self.total_r_label, 'total_r')):
+            value = stats[key] if stats['trades'] else None
+            label.value_label.setText("-" if value is None else f"{value:+.2f}R")
+            style(label.value_label, accent="text" if not value else "green" if value > 0 else "red")
+        planned = stats['avg_planned_rr']
+        self.planned_rr_label.value_label.setText("-" if planned is None else f"1:{planned:.2f}")
+        self.r_trades_label.value_label.setText(str(stats['trades']))
+        self.r_histogram.set_buckets(distribution, R_BUCKET)
+    
+    def show_concept_stats(self, result):
+        self.concept_results = result
+        self.show_concept_rows()
+    
+    def show_concept_rows(self):
+        """Fill the table with singles or pairs from the last result"""
+        key = 'pairs' if self.concept_mode_input.currentText() == "Concept Pairs" else 'concepts'
+        self.concept_model.set_rows(self.concept_results[key])
+    
+    def show_breakdowns(self, result):
+        self.breakdown_results = result
+        self.show_breakdown_rows()
+    
+    def show_breakdown_rows(self):
+        """Fill the breakdown table for the selected grouping"""
+        self.breakdown_model.set_rows(self.breakdown_results[self.breakdown_input.currentData()])
+    
+    def show_equity(self, snapshot):
+        """Update the equity chart and drawdown cards"""
+        curve = snapshot['curve']
+        summary = snapshot['summary']
+        self.equity_chart.set_curve(curve['equity'], curve['drawdown'])
+        
+        self.max_drawdown_label.value_label.setText(f"${summary['max_drawdown']:.2f}")
+        self.drawdown_length_label.value_label.setText(str(summary['max_drawdown_trades']))
+        self.rolling_win_rate_label.value_label.setText(f"{summary['rolling_win_rate']:.1f}%")
+        
+        expectancy = summary['rolling_expectancy']
+        self.rolling_expectancy_label.value_label.setText(f"${expectancy:.2f}")
+        style(self.rolling_expectancy_label.value_label, accent="green" if expectancy >= 0 else "red")
+    
+    def on_mc_unit_changed(self):
+        """Ruin is a dollar loss for P&L paths and a number of R for R paths"""
+        if self.mc_unit_input.currentData() == 'r':
+            self.mc_ruin_input.setPrefix("")
+            self.mc_ruin_input.setSuffix(" R")
+            self.mc_ruin_input.setValue(10)
+        else:
+            self.mc_ruin_input.setPrefix("$")
+            self.mc_ruin_input.setSuffix("")
+            self.mc_ruin_input.setValue(1000)
+    
+    def show_monte_carlo(self, result):
+        """Fill the risk cards from a finished simulation"""
+        if result is None:
+            for label in (self.mc_median_dd_label, self.mc_p95_dd_label, self.mc_p99_dd_label,
+                          self.mc_ruin_label, self.mc_streak_label):
+                label.value_label.setText("-")
+            self.mc_details_label.setText("No closed trades to resample yet.")
+            return
+        
+        money = (lambda value: f"{value:.2f}R") if result['unit'] == 'r' else (lambda value: f"${value:.2f}")
+        drawdowns = result['drawdown_percentiles']
+        losing = result['losing_streaks']
+        winning = result['winning_streaks']
+        self.mc_median_dd_label.value_label.setText(money(drawdowns[50]))
+        self.mc_p95_dd_label.value_label.setText(money(drawdowns[95]))
+        self.mc_p99_dd_label.value_label.setText(money(drawdowns[99]))
+        self.mc_ruin_label.value_label.setText(f"{result['risk_of_ruin']:.2f}%")
+        self.mc_streak_label.value_label.setText(f"{losing['median']:.0f} / {losing['p95']:.0f}")
+        
+        dd_text = ", ".join(f"{p}th {money(value)}" for p, value in drawdowns.items())
+        final = result['final_percentiles']
+        self.mc_details_label.setText(
+            f"{result['paths']:,} paths of {result['trades']} trades (seed {result['seed']}). "
+            f"Max drawdown percentiles: {dd_text}. "
+            f"Final P&L 5th/50th/95th: {money(final[5])} / {money(final[50])} / {money(final[95])}. "
+            f"Longest losing streak up to {losing['max']}, winning streak median "
+            f"{winning['median']:.0f} (up to {winning['max']})."
+        )
+    
+    def show_monte_carlo_error(self, message):
+        self.mc_details_label.setText(f"Simulation failed: {message}")
+    
     def generate_insights(self, stats: dict, concept_count: int) -> str:
         """Generate trading insights from statistics"""
         insights = []
@@ -7,6 +7,7 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                             QWidget, QTextEdit, QComboBox, QFrame)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
+from gui.theme import style
 
 class DailyBiasCalculator(QDialog):
     def __init__(self, parent=None):
@@ -15,7 +16,7 @@ class DailyBiasCalculator(QDialog):
         self.setMinimumSize(900, 700)
         self.checkboxes = {}
         self.init_ui()
-        
+    
     def init_ui(self):
         """Initialize the bias calculator interface"""
         layout = QVBoxLayout(self)
@@ -24,11 +25,11 @@ class DailyBiasCalculator(QDialog):
         
         # Header
         header = QLabel("📊 Daily Bias Calculator")
-        header.setStyleSheet("font-size: 24px; font-weight: bold; color: #3b82f6;")
+        style(header, role="titleSmall", accent="blue")
         layout.addWidget(header)
         
         subtitle = QLabel("Complete this checklist to determine your daily market bias")
-        subtitle.setStyleSheet("font-size: 13px; color: #94a3b8; margin-bottom: 10px;")
+        style(subtitle, role="caption")
         layout.addWidget(subtitle)
         
         # Scroll area for checklist
@@ -77,31 +78,13 @@ class DailyBiasCalculator(QDialog):
         
         calculate_btn = QPushButton("🎯 Calculate Bias")
         calculate_btn.setMinimumHeight(45)
-        calculate_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #10b981;
-                font-size: 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #059669;
-            }
-        """)
+        style(calculate_btn, variant="success", scale="large")
         calculate_btn.clicked.connect(self.calculate_bias)
         button_layout.addWidget(calculate_btn)
         
         reset_btn = QPushButton("🔄 Reset")
         reset_btn.setMinimumHeight(45)
-        reset_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f59e0b;
-                font-size: 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #d97706;
-            }
-        """)
+        style(reset_btn, variant="warning", scale="large")
         reset_btn.clicked.connect(self.reset_form)
         button_layout.addWidget(reset_btn)
         
@@ -111,11 +94,11 @@ class DailyBiasCalculator(QDialog):
         button_layout.addWidget(close_btn)
         
         layout.addLayout(button_layout)
-        
+    
     def create_htf_section(self):
         """Create Higher Timeframe Analysis section"""
         group = QGroupBox("1️⃣ Higher Timeframe Analysis (Weekly/Daily)")
-        group.setStyleSheet("QGroupBox { font-weight: bold; color: #60a5fa; }")
+        style(group, role="checklist")
         layout = QVBoxLayout()
         
         checks = [
@@ -129,7 +112,6 @@ class DailyBiasCalculator(QDialog):
         
         for key, text in checks:
             cb = QCheckBox(text)
-            cb.setStyleSheet("font-weight: normal; color: #e2e8f0; padding: 5px;")
             self.checkboxes[key] = cb
             layout.addWidget(cb)
         
@@ -139,7 +121,7 @@ class DailyBiasCalculator(QDialog):
     def create_prev_day_section(self):
         """Create Previous Day Analysis section"""
         group = QGroupBox("2️⃣ Previous Day Analysis")
-        group.setStyleSheet("QGroupBox { font-weight: bold; color: #60a5fa; }")
+        style(group, role="checklist")
         layout = QVBoxLayout()
         
         checks = [
@@ -154,7 +136,6 @@ class DailyBiasCalculator(QDialog):
         
         for key, text in checks:
             cb = QCheckBox(text)
-            cb.setStyleSheet("font-weight: normal; color: #e2e8f0; padding: 5px;")
             self.checkboxes[key] = cb
             layout.addWidget(cb)
         
@@ -164,7 +145,7 @@ class DailyBiasCalculator(QDialog):
     def create_current_day_section(self):
         """Create Current Day Setup section"""
         group = QGroupBox("3️⃣ Current Day Opening & Asian Session")
-        group.setStyleSheet("QGroupBox { font-weight: bold; color: #60a5fa; }")
+        style(group, role="checklist")
         layout = QVBoxLayout()
         
         checks = [
@@ -180,7 +161,6 @@ class DailyBiasCalculator(QDialog):
         
         for key, text in checks:
             cb = QCheckBox(text)
-            cb.setStyleSheet("font-weight: normal; color: #e2e8f0; padding: 5px;")
             self.checkboxes[key] = cb
             layout.addWidget(cb)
         
@@ -190,7 +170,7 @@ class DailyBiasCalculator(QDialog):
     def create_structure_section(self):
         """Create Market Structure section"""
         group = QGroupBox("4️⃣ Market Structure")
-        group.setStyleSheet("QGroupBox { font-weight: bold; color: #60a5fa; }")
+        style(group, role="checklist")
         layout = QVBoxLayout()
         
         checks = [
@@ -206,7 +186,6 @@ class DailyBiasCalculator(QDialog):
         
         for key, text in checks:
             cb = QCheckBox(text)
-            cb.setStyleSheet("font-weight: normal; color: #e2e8f0; padding: 5px;")
             self.checkboxes[key] = cb
             layout.addWidget(cb)
         
@@ -216,7 +195,7 @@ class DailyBiasCalculator(QDialog):
     def create_liquidity_section(self):
         """Create Liquidity Analysis section"""
         group = QGroupBox("5️⃣ Liquidity Analysis")
-        group.setStyleSheet("QGroupBox { font-weight: bold; color: #60a5fa; }")
+        style(group, role="checklist")
         layout = QVBoxLayout()
         
         checks = [
@@ -232,7 +211,6 @@ class DailyBiasCalculator(QDialog):
         
         for key, text in checks:
             cb = QCheckBox(text)
-            cb.setStyleSheet("font-weight: normal; color: #e2e8f0; padding: 5px;")
             self.checkboxes[key] = cb
             layout.addWidget(cb)
         
@@ -242,7 +220,7 @@ class DailyBiasCalculator(QDialog):
     def create_premium_discount_section(self):
         """Create Premium/Discount section"""
         group = QGroupBox("6️⃣ Premium/Discount & Fair Value Gaps")
-        group.setStyleSheet("QGroupBox { font-weight: bold; color: #60a5fa; }")
+        style(group, role="checklist")
         layout = QVBoxLayout()
         
         checks = [
@@ -258,7 +236,6 @@ class DailyBiasCalculator(QDialog):
         
         for key, text in checks:
             cb = QCheckBox(text)
-            cb.setStyleSheet("font-weight: normal; color: #e2e8f0; padding: 5px;")
             self.checkboxes[key] = cb
             layout.addWidget(cb)
         
@@ -271,14 +248,7 @@ class DailyBiasCalculator(QDialog):
         
         # Result label
         self.result_label = QLabel("Complete the checklist and click 'Calculate Bias'")
-        self.result_label.setStyleSheet("""
-            font-size: 18px;
-            font-weight: bold;
-            color: #94a3b8;
-            padding: 15px;
-            background-color: #334155;
-            border-radius: 8px;
-        """)
+        style(self.result_label, role="result", accent="muted")
         self.result_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.result_label.setMinimumHeight(60)
         layout.addWidget(self.result_label)
@@ -288,13 +258,7 @@ class DailyBiasCalculator(QDialog):
         self.analysis_text.setMaximumHeight(120)
         self.analysis_text.setReadOnly(True)
         self.analysis_text.setPlaceholderText("Detailed analysis will appear here...")
-        self.analysis_text.setStyleSheet("""
-            background-color: #1e293b;
-            border: 1px solid #475569;
-            border-radius: 6px;
-            padding: 10px;
-            color: #e2e8f0;
-        """)
+        style(self.analysis_text, role="analysis")
         layout.addWidget(self.analysis_text)
         
         return layout
@@ -396,14 +360,7 @@ class DailyBiasCalculator(QDialog):
         
         if total_checks == 0:
             self.result_label.setText("⚠️ Please complete the checklist")
-            self.result_label.setStyleSheet("""
-                font-size: 18px;
-                font-weight: bold;
-                color: #f59e0b;
-                padding: 15px;
-                background-color: #334155;
-                border-radius: 8px;
-            """)
+            style(self.result_label, accent="orange")
             self.analysis_text.clear()
             return
         
@@ -421,37 +378,30 @@ class DailyBiasCalculator(QDialog):
         
         if difference <= 2:
             bias = "NEUTRAL"
-            color = "#f59e0b"
+            accent = "orange"
             confidence = "Low Conviction"
         elif bullish_score > bearish_score:
             if difference >= 5:
                 bias = "STRONG BULLISH"
-                color = "#10b981"
+                accent = "green"
                 confidence = "High Conviction"
             else:
                 bias = "BULLISH"
-                color = "#10b981"
+                accent = "green"
                 confidence = "Moderate Conviction"
         else:
             if difference >= 5:
                 bias = "STRONG BEARISH"
-                color = "#dc2626"
+                accent = "red"
                 confidence = "High Conviction"
             else:
                 bias = "BEARISH"
-                color = "#dc2626"
+                accent = "red"
                 confidence = "Moderate Conviction"
         
         # Update result label
         self.result_label.setText(f"📊 Daily Bias: {bias} ({confidence})")
-        self.result_label.setStyleSheet(f"""
-            font-size: 18px;
-            font-weight: bold;
-            color: {color};
-            padding: 15px;
-            background-color: #334155;
-            border-radius: 8px;
-        """)
+        style(self.result_label, accent=accent)
         
         # Create detailed analysis
         analysis = f"BIAS ANALYSIS:\n\n"
@@ -488,12 +438,5 @@ class DailyBiasCalculator(QDialog):
             cb.setChecked(False)
         
         self.result_label.setText("Complete the checklist and click 'Calculate Bias'")
-        self.result_label.setStyleSheet("""
-            font-size: 18px;
-            font-weight: bold;
-            color: #94a3b8;
-            padding: 15px;
-            background-color: #334155;
-            border-radius: 8px;
-        """)
+        style(self.result_label, accent="muted")
         self.analysis_text.clear()
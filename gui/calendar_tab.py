@@ -0,0 +1,214 @@
+"""
+Trade Calendar Tab - Daily P&L heatmap from precomputed daily summaries
+"""
+
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                            QComboBox, QScrollArea, QToolTip)
+from PyQt6.QtCore import Qt, QRect, QSize
+from PyQt6.QtGui import QColor, QPainter
+from database.db_manager import DatabaseManager
+from gui.query_runner import QueryRunner, LoadingLabel
+from gui import theme
+from gui.theme import style
+from datetime import date, timedelta
+
+CELL = 14
+GAP = 3
+LABEL_WIDTH = 50
+YEAR_HEIGHT = 7 * (CELL + GAP) + 28
+WEEKS = 54
+
+DAY_LABELS = ["Mon", "", "Wed", "", "Fri", "", ""]
+MONTH_LABELS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def cell_color(summary, max_abs, palette):
+    if summary is None:
+        return theme.color('surface', palette=palette)
+    pnl = summary['pnl']
+    if not pnl:
+        return theme.color('faint', palette=palette)
+    # Square-root scale so one outsized day doesn't wash out the rest;
+    # weak days fade into the background
+    strength = 0.25 + 0.75 * (abs(pnl) / max_abs) ** 0.5
+    background = theme.color('surface', palette=palette).getRgb()[:3]
+    base = theme.color('green' if pnl > 0 else 'red', palette=palette).getRgb()[:3]
+    return QColor(*(int(low + (high - low) * strength) for low, high in zip(background, base)))
+
+
+def layout_cells(days, years, palette):
+    """(rect, color) per day of each year in a theme's palette, plus the date under each grid slot"""
+    cells = []
+    cell_dates = {}
+    max_abs = max((abs(row['pnl']) for row in days.values()), default=0) or 1
+    
+    for block, year in enumerate(years):
+        top = block * YEAR_HEIGHT + 20
+        first = date(year, 1, 1)
+        offset = first.weekday()
+        day = first
+        while day.year == year:
+            index = (day - first).days + offset
+            column, row = divmod(index, 7)
+            rect = QRect(LABEL_WIDTH + column * (CELL + GAP), top + row * (CELL + GAP), CELL, CELL)
+            key = day.isoformat()
+            cells.append((rect, cell_color(days.get(key), max_abs, palette)))
+            cell_dates[(block, column, row)] = key
+            day += timedelta(days=1)
+    
+    return cells, cell_dates
+
+
+def heatmap_size(years):
+    return QSize(LABEL_WIDTH + WEEKS * (CELL + GAP), max(1, len(years)) * YEAR_HEIGHT)
+
+
+def paint_heatmap(painter, years, cells, palette, exposed=None):
+    """Paint laid-out cells and their labels onto any paint device"""
+    painter.setPen(theme.color('muted', palette=palette))
+    for block, year in enumerate(years):
+        top = block * YEAR_HEIGHT
+        painter.drawText(0, top + 14, str(year))
+        for month in range(12):
+            column = ((date(year, month + 1, 1) - date(year, 1, 1)).days + date(year, 1, 1).weekday()) // 7
+            painter.drawText(LABEL_WIDTH + column * (CELL + GAP), top + 14, MONTH_LABELS[month])
+        for row, label in enumerate(DAY_LABELS):
+            if label:
+                painter.drawText(8, top + 20 + row * (CELL + GAP) + CELL - 2, label)
+    
+    painter.setPen(Qt.PenStyle.NoPen)
+    for rect, color in cells:
+        if exposed is None or rect.intersects(exposed):
+            painter.fillRect(rect, color)
+
+
+class TradeHeatmap(QWidget):
+    """One row of week columns per year, one cell per day, colored by P&L
+    
+    Cell rectangles and colors are laid out once in set_days(); painting
+    only fills the precomputed rects that intersect the exposed region.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.years = []
+        self.cells = []
+        self.days = {}
+        self.cell_dates = {}
+        self.setMouseTracking(True)
+        theme.notifier.changed.connect(self.on_theme_changed)
+    
+    def set_days(self, days, years):
+        """days maps 'YYYY-MM-DD' to a daily_trade_summary row"""
+        self.days = days
+        self.years = years
+        self.cells, self.cell_dates = layout_cells(days, years, theme.current_theme())
+        self.setFixedSize(self.sizeHint())
+        self.update()
+    
+    def on_theme_changed(self):
+        """Recolor the laid-out cells in the new palette"""
+        self.set_days(self.days, self.years)
+    
+    def sizeHint(self):
+        return heatmap_size(self.years)
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        paint_heatmap(painter, self.years, self.cells, theme.current_theme(), event.rect())
+    
+    def date_at(self, pos):
+        block = pos.y() // YEAR_HEIGHT
+        column = (pos.x() - LABEL_WIDTH) // (CELL + GAP)
+        row = (pos.y() - block * YEAR_HEIGHT - 20) // (CELL + GAP)
+        if pos.x() < LABEL_WIDTH or row < 0:
+            return None
+        return self.cell_dates.get((block, column, row))
+    
+    def mouseMoveEvent(self, event):
+        key = self.date_at(event.position().toPoint())
+        if key is None:
+            QToolTip.hideText()
+            return
+        QToolTip.showText(event.globalPosition().toPoint(), format_day(key, self.days.get(key)), self)
+
+
+def format_day(key, summary):
+    """Tooltip text for one calendar day"""
+    if summary is None:
+        return f"{key}\nNo trades"
+    closed = summary['wins'] + summary['losses']
+    win_rate = f"{summary['wins'] / closed * 100:.0f}%" if closed else "-"
+    return (f"{key}\nP&L: ${summary['pnl']:.2f}\n"
+            f"Trades: {summary['trade_count']}  Win rate: {win_rate}")
+
+
+class CalendarTab(QWidget):
+    def __init__(self, db: DatabaseManager, queries: QueryRunner):
+        super().__init__()
+        self.db = db
+        self.queries = queries
+        self.first_year = None
+        self.init_ui()
+    
+    def init_ui(self):
+        """Initialize the calendar interface"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(10)
+        
+        header_layout = QHBoxLayout()
+        title = QLabel("📅 Trade Calendar")
+        style(title, role="title", accent="blue")
+        header_layout.addWidget(title)
+        header_layout.addStretch()
+        header_layout.addWidget(LoadingLabel(self.queries, "calendar"))
+        
+        header_layout.addWidget(QLabel("Show:"))
+        self.range_input = QComboBox()
+        self.range_input.addItems(["Last 3 Years", "Last Year", "All Years"])
+        self.range_input.currentTextChanged.connect(self.refresh_data)
+        header_layout.addWidget(self.range_input)
+        layout.addLayout(header_layout)
+        
+        self.summary_label = QLabel("")
+        style(self.summary_label, role="caption")
+        layout.addWidget(self.summary_label)
+        
+        self.heatmap = TradeHeatmap()
+        scroll = QScrollArea()
+        scroll.setWidget(self.heatmap)
+        layout.addWidget(scroll)
+    
+    def refresh_data(self):
+        """Load the selected years' daily summaries in the background"""
+        years_back = {"Last Year": 1, "Last 3 Years": 3}.get(self.range_input.currentText())
+        self.first_year = date.today().year - years_back + 1 if years_back else None
+        start = f"{self.first_year}-01-01" if self.first_year else None
+        self.queries.submit("calendar:days", DatabaseManager.get_daily_summary, start,
+                            on_result=self.show_days)
+    
+    def show_days(self, rows):
+        days = {row['date']: row for row in rows}
+        
+        last_year = max([date.today().year] + [int(key[:4]) for key in days])
+        first_year = self.first_year or min((int(key[:4]) for key in days), default=last_year)
+        years = list(range(last_year, first_year - 1, -1))
+        self.heatmap.set_days(days, years)
+        
+        trade_count = sum(row['trade_count'] for row in rows)
+        wins = sum(row['wins'] for row in rows)
+        closed = wins + sum(row['losses'] for row in rows)
+        pnl = sum(row['pnl'] for row in rows)
+        green_days = sum(1 for row in rows if row['pnl'] > 0)
+        red_days = sum(1 for row in rows if row['pnl'] < 0)
+        win_rate = f"{wins / closed * 100:.1f}%" if closed else "-"
+        self.summary_label.setText(
+            f"{len(rows)} trading days · {trade_count} trades · P&L ${pnl:.2f} · "
+            f"win rate {win_rate} · {green_days} green / {red_days} red days"
+        )
+    
+    def hideEvent(self, event):
+        self.queries.cancel_group("calendar")
+        super().hideEvent(event)
@@ -0,0 +1,100 @@
+"""
+Equity Chart - Downsampled equity curve with drawdown underneath
+"""
+
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QPointF
+from PyQt6.QtGui import QPainter, QPen, QPolygonF
+from analysis.equity import downsample_minmax
+from gui import theme
+import numpy as np
+
+EQUITY_SHARE = 0.7
+MARGIN = 8
+
+
+def build_polygons(equity, drawdown, width, height):
+    """Downsample to a pixel size and map to its coordinates"""
+    plot_width = max(1, width - 2 * MARGIN)
+    plot_height = height - 2 * MARGIN
+    equity_height = plot_height * EQUITY_SHARE
+    drawdown_top = MARGIN + equity_height + MARGIN
+    drawdown_height = plot_height - equity_height - MARGIN
+    n = len(equity)
+    
+    x, y = downsample_minmax(np.r_[0.0, equity], plot_width)
+    low, high = min(y.min(), 0.0), max(y.max(), 0.0)
+    span = (high - low) or 1.0
+    px = MARGIN + x / max(1, n) * plot_width
+    py = MARGIN + (high - y) / span * equity_height
+    equity_line = QPolygonF([QPointF(a, b) for a, b in zip(px, py)])
+    zero_y = MARGIN + high / span * equity_height
+    
+    x, y = downsample_minmax(np.r_[0.0, drawdown], plot_width)
+    deepest = -y.min() or 1.0
+    px = MARGIN + x / max(1, n) * plot_width
+    py = drawdown_top + (-y) / deepest * drawdown_height
+    points = [QPointF(px[0], drawdown_top)]
+    points += [QPointF(a, b) for a, b in zip(px, py)]
+    points.append(QPointF(px[-1], drawdown_top))
+    drawdown_area = QPolygonF(points)
+    
+    return equity_line, drawdown_area, zero_y, drawdown_top
+
+
+def paint_equity(painter, width, height, equity, polygons, palette):
+    """Paint a curve prepared by build_polygons() onto any paint device, in a theme's palette"""
+    painter.fillRect(0, 0, width, height, theme.color('surface', palette=palette))
+    
+    if len(equity) == 0:
+        painter.setPen(theme.color('muted', palette=palette))
+        painter.drawText(0, 0, width, height, Qt.AlignmentFlag.AlignCenter, "No closed trades yet")
+        return
+    
+    equity_line, drawdown_area, zero_y, drawdown_top = polygons
+    
+    # Min/max pairs are already pixel-spaced, so antialiasing only costs time
+    painter.setPen(QPen(theme.color('border', palette=palette), 1, Qt.PenStyle.DashLine))
+    painter.drawLine(QPointF(MARGIN, zero_y), QPointF(width - MARGIN, zero_y))
+    painter.drawLine(QPointF(MARGIN, drawdown_top), QPointF(width - MARGIN, drawdown_top))
+    
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(theme.color('red', 110, palette))
+    painter.drawPolygon(drawdown_area)
+    
+    painter.setBrush(Qt.BrushStyle.NoBrush)
+    color = theme.color('green' if equity[-1] >= 0 else 'red', palette=palette)
+    painter.setPen(QPen(color, 1))
+    painter.drawPolyline(equity_line)
+
+
+class EquityChart(QWidget):
+    """Paints at most two points per pixel column however long the curve is"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.equity = np.empty(0)
+        self.drawdown = np.empty(0)
+        self.polygons = None
+        self.setMinimumHeight(260)
+        theme.notifier.changed.connect(self.on_theme_changed)
+    
+    def set_curve(self, equity, drawdown):
+        self.equity = equity
+        self.drawdown = drawdown
+        self.polygons = None
+        self.update()
+    
+    def resizeEvent(self, event):
+        self.polygons = None
+        super().resizeEvent(event)
+    
+    def on_theme_changed(self):
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self.polygons is None and len(self.equity):
+            self.polygons = build_polygons(self.equity, self.drawdown, self.width(), self.height())
+        paint_equity(painter, self.width(), self.height(), self.equity, self.polygons,
+                     theme.current_theme())
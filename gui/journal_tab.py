@@ -3,22 +3,32 @@ Trade Journal Tab - Log and manage trades
 """
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-                            QTableWidget, QTableWidgetItem, QLabel, QLineEdit,
+                            QTableView, QLabel, QLineEdit,
                             QComboBox, QDoubleSpinBox, QTextEdit, QGroupBox,
                             QSplitter, QHeaderView, QMessageBox, QDateEdit,
-                            QScrollArea, QFileDialog)
-from PyQt6.QtCore import Qt, QDate
-from PyQt6.QtGui import QColor
+                            QScrollArea, QFileDialog, QTimeEdit, QMainWindow, QCheckBox)
+from PyQt6.QtCore import Qt, QDate, QTime
 from database.db_manager import DatabaseManager
+from gui.trade_table_model import TradeTableModel
+from gui.query_runner import QueryRunner, LoadingLabel
+from gui.thumbnails import THUMBNAIL_SIZE, get_thumbnail_service
+from gui.screenshot_gallery import ScreenshotGallery
+from gui.theme import style
+from database.attachment_store import AttachmentStore, copy_screenshot
+from analysis.labeling import label_trades
+from analysis.session_calendar import NY_TZ
+from datetime import datetime
 
 class JournalTab(QWidget):
-    def __init__(self, db: DatabaseManager):
+    def __init__(self, db: DatabaseManager, queries: QueryRunner):
         super().__init__()
         self.db = db
+        self.queries = queries
         self.current_trade_id = None
+        self.gallery = None
         self.init_ui()
         self.load_trades()
-        
+    
     def init_ui(self):
         """Initialize the journal interface"""
         layout = QVBoxLayout(self)
@@ -38,7 +48,7 @@ class JournalTab(QWidget):
         
         splitter.setSizes([400, 500])
         layout.addWidget(splitter)
-        
+    
     def create_list_panel(self):
         """Create trade list panel"""
         panel = QWidget()
@@ -53,11 +63,17 @@ class JournalTab(QWidget):
         
         delete_btn = QPushButton("🗑️ Delete")
         delete_btn.clicked.connect(self.delete_trade)
-        delete_btn.setStyleSheet("background-color: #dc2626;")
+        style(delete_btn, variant="danger")
         header_layout.addWidget(delete_btn)
         
+        gallery_btn = QPushButton("🖼️ Gallery")
+        gallery_btn.clicked.connect(self.open_gallery)
+        header_layout.addWidget(gallery_btn)
+        
         header_layout.addStretch()
         
+        header_layout.addWidget(LoadingLabel(self.queries, "journal"))
+        
         # Filter
         header_layout.addWidget(QLabel("Filter:"))
         self.outcome_filter = QComboBox()
@@ -68,20 +84,23 @@ class JournalTab(QWidget):
         layout.addLayout(header_layout)
         
         # Trade table
-        self.trade_table = QTableWidget()
-        self.trade_table.setColumnCount(10)
-        self.trade_table.setHorizontalHeaderLabels([
-            "Date", "Pair", "Direction", "Entry", "Exit", "P&L", "P&L %", 
-            "Outcome", "Setup", "Concepts"
-        ])
+        # Model/view: rows are fetched a page at a time as the view scrolls and
+        # only the visible cells are ever formatted
+        self.trade_model = TradeTableModel(self.db, self.queries, self)
+        self.trade_table = QTableView()
+        self.trade_table.setModel(self.trade_model)
         
+        # Fixed widths and row height - ResizeToContents would scan every row
         header = self.trade_table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         header.setSectionResizeMode(9, QHeaderView.ResizeMode.Stretch)
+        for column, width in enumerate([90, 80, 75, 85, 85, 85, 70, 80, 110]):
+            self.trade_table.setColumnWidth(column, width)
+        self.trade_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         
-        self.trade_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.trade_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
-        self.trade_table.cellClicked.connect(self.on_trade_selected)
+        self.trade_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.trade_table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.trade_table.clicked.connect(self.on_trade_selected)
         
         layout.addWidget(self.trade_table)
         
@@ -115,6 +134,28 @@ class JournalTab(QWidget):
         date_layout.addWidget(self.date_input)
         row1.addLayout(date_layout)
         
+        # Entry and exit times in New York time; each is only recorded when
+        # its box is ticked, so 00:00 stays a valid time
+        time_layout = QVBoxLayout()
+        self.entry_time_set = QCheckBox("Entry Time (ET)")
+        time_layout.addWidget(self.entry_time_set)
+        self.entry_time_input = QTimeEdit()
+        self.entry_time_input.setDisplayFormat("HH:mm")
+        self.entry_time_input.setEnabled(False)
+        self.entry_time_set.toggled.connect(self.entry_time_input.setEnabled)
+        time_layout.addWidget(self.entry_time_input)
+        row1.addLayout(time_layout)
+        
+        exit_time_layout = QVBoxLayout()
+        self.exit_time_set = QCheckBox("Exit Time (ET)")
+        exit_time_layout.addWidget(self.exit_time_set)
+        self.exit_time_input = QTimeEdit()
+        self.exit_time_input.setDisplayFormat("HH:mm")
+        self.exit_time_input.setEnabled(False)
+        self.exit_time_set.toggled.connect(self.exit_time_input.setEnabled)
+        exit_time_layout.addWidget(self.exit_time_input)
+        row1.addLayout(exit_time_layout)
+        
         pair_layout = QVBoxLayout()
         pair_layout.addWidget(QLabel("Pair"))
         self.pair_input = QLineEdit()
@@ -230,15 +271,27 @@ class JournalTab(QWidget):
         
         # Screenshot
         screenshot_group = QGroupBox("Chart Screenshot")
-        screenshot_layout = QHBoxLayout()
+        screenshot_layout = QVBoxLayout()
+        path_layout = QHBoxLayout()
         self.screenshot_path = QLineEdit()
         self.screenshot_path.setPlaceholderText("No screenshot selected")
         self.screenshot_path.setReadOnly(True)
-        screenshot_layout.addWidget(self.screenshot_path)
+        self.screenshot_path.textChanged.connect(self.update_screenshot_preview)
+        path_layout.addWidget(self.screenshot_path)
         
         browse_btn = QPushButton("Browse...")
         browse_btn.clicked.connect(self.select_screenshot)
-        screenshot_layout.addWidget(browse_btn)
+        path_layout.addWidget(browse_btn)
+        screenshot_layout.addLayout(path_layout)
+        
+        # Thumbnail is decoded off the GUI thread and filled in when ready
+        self.screenshot_preview = QLabel()
+        self.screenshot_preview.setFixedSize(THUMBNAIL_SIZE)
+        self.screenshot_preview.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.screenshot_preview.setVisible(False)
+        screenshot_layout.addWidget(self.screenshot_preview)
+        self.thumbnails = get_thumbnail_service()
+        self.thumbnails.thumbnail_ready.connect(self.on_thumbnail_ready)
         
         screenshot_group.setLayout(screenshot_layout)
         layout.addWidget(screenshot_group)
@@ -247,16 +300,7 @@ class JournalTab(QWidget):
         save_btn = QPushButton("💾 Save Trade")
         save_btn.setMinimumHeight(45)
         save_btn.clicked.connect(self.save_trade)
-        save_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #10b981;
-                font-size: 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #059669;
-            }
-        """)
+        style(save_btn, variant="success", scale="large")
         layout.addWidget(save_btn)
         
         scroll.setWidget(content_widget)
@@ -265,78 +309,42 @@ class JournalTab(QWidget):
         return panel
     
     def load_trades(self):
-        """Load all trades into table"""
-        self.trade_table.setRowCount(0)
-        trades = self.db.get_all_trades()
-        
-        for trade in trades:
-            row = self.trade_table.rowCount()
-            self.trade_table.insertRow(row)
-            
-            self.trade_table.setItem(row, 0, QTableWidgetItem(trade['date']))
-            self.trade_table.setItem(row, 1, QTableWidgetItem(trade['pair']))
-            self.trade_table.setItem(row, 2, QTableWidgetItem(trade['direction'].upper()))
-            self.trade_table.setItem(row, 3, QTableWidgetItem(
-                f"{trade['entry_price']:.5f}" if trade['entry_price'] else "-"
-            ))
-            self.trade_table.setItem(row, 4, QTableWidgetItem(
-                f"{trade['exit_price']:.5f}" if trade['exit_price'] else "-"
-            ))
-            
-            # P&L
-            pnl_item = QTableWidgetItem(
-                f"${trade['pnl']:.2f}" if trade['pnl'] else "-"
-            )
-            if trade['pnl']:
-                pnl_item.setForeground(QColor("#10b981" if trade['pnl'] > 0 else "#dc2626"))
-            self.trade_table.setItem(row, 5, pnl_item)
-            
-            # P&L %
-            pnl_pct_item = QTableWidgetItem(
-                f"{trade['pnl_percent']:.2f}%" if trade['pnl_percent'] else "-"
-            )
-            if trade['pnl_percent']:
-                pnl_pct_item.setForeground(QColor("#10b981" if trade['pnl_percent'] > 0 else "#dc2626"))
-            self.trade_table.setItem(row, 6, pnl_pct_item)
-            
-            # Outcome
-            outcome_item = QTableWidgetItem(trade['outcome'].title())
-            if trade['outcome'] == 'win':
-                outcome_item.setForeground(QColor("#10b981"))
-            elif trade['outcome'] == 'loss':
-                outcome_item.setForeground(QColor("#dc2626"))
-            elif trade['outcome'] == 'pending':
-                outcome_item.setForeground(QColor("#f59e0b"))
-            self.trade_table.setItem(row, 7, outcome_item)
-            
-            self.trade_table.setItem(row, 8, QTableWidgetItem(trade.get('setup_type', '')))
-            self.trade_table.setItem(row, 9, QTableWidgetItem(
-                ', '.join(trade.get('concepts_used', []))
-            ))
-            
-            # Store trade ID
-            self.trade_table.item(row, 0).setData(Qt.ItemDataRole.UserRole, trade['id'])
+        """Reload the trade list from the first page"""
+        self.trade_model.reload()
     
     def filter_trades(self):
         """Filter trades by outcome"""
         outcome_filter = self.outcome_filter.currentText().lower()
-        
-        for row in range(self.trade_table.rowCount()):
-            outcome_item = self.trade_table.item(row, 7)
-            if outcome_filter == "all":
-                self.trade_table.setRowHidden(row, False)
-            else:
-                outcome = outcome_item.text().lower()
-                self.trade_table.setRowHidden(row, outcome != outcome_filter)
+        self.trade_model.set_outcome_filter(None if outcome_filter == "all" else outcome_filter)
     
-    def on_trade_selected(self, row, col):
-        """Load selected trade details"""
-        trade_id = self.trade_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-        self.current_trade_id = trade_id
-        trade = self.db.get_trade_by_id(trade_id)
-        
+    def showEvent(self, event):
+        """Resume paging that was cancelled while the tab was hidden"""
+        super().showEvent(event)
+        if self.trade_model.canFetchMore():
+            self.trade_model.fetchMore()
+    
+    def hideEvent(self, event):
+        """Stop loading list pages nobody is looking at"""
+        self.queries.cancel(TradeTableModel.PAGE_KEY)
+        super().hideEvent(event)
+    
+    def on_trade_selected(self, index):
+        """Load selected trade details in the background"""
+        self.load_trade(self.trade_model.trade_id(index.row()))
+    
+    def load_trade(self, trade_id):
+        """Load a trade into the form in the background"""
+        self.queries.submit("journal:trade", DatabaseManager.get_trade_by_id, trade_id,
+                            on_result=self.show_trade)
+    
+    def show_trade(self, trade):
+        """Fill the form with a loaded trade"""
+        # Only switch the edited trade once the form actually shows it
         if trade:
+            self.current_trade_id = trade['id']
             self.date_input.setDate(QDate.fromString(trade['date'], "yyyy-MM-dd"))
+            self.show_time(self.entry_time_set, self.entry_time_input, trade.get('entry_ts'))
+            self.show_time(self.exit_time_set, self.exit_time_input, trade.get('exit_ts'))
             self.pair_input.setText(trade['pair'])
             self.timeframe_input.setCurrentText(trade['timeframe'])
             self.direction_input.setCurrentText(trade['direction'].title())
@@ -354,10 +362,22 @@ class JournalTab(QWidget):
             
             self.concepts_input.setText('\n'.join(trade.get('concepts_used', [])))
     
+    def show_time(self, time_set, time_input, ts):
+        """Show a stored timestamp in a time input, unticking it when there is none"""
+        time_set.setChecked(ts is not None)
+        if ts is None:
+            time_input.setTime(QTime(0, 0))
+        else:
+            moment = datetime.fromtimestamp(ts, NY_TZ)
+            time_input.setTime(QTime(moment.hour, moment.minute))
+    
     def add_new_trade(self):
         """Clear form for new trade"""
+        self.queries.cancel("journal:trade")
         self.current_trade_id = None
         self.date_input.setDate(QDate.currentDate())
+        self.show_time(self.entry_time_set, self.entry_time_input, None)
+        self.show_time(self.exit_time_set, self.exit_time_input, None)
         self.pair_input.clear()
         self.timeframe_input.setCurrentIndex(0)
         self.direction_input.setCurrentIndex(0)
@@ -373,6 +393,31 @@ class JournalTab(QWidget):
         self.concepts_input.clear()
         self.pair_input.setFocus()
     
+    def update_screenshot_preview(self):
+        """Show the thumbnail of the current screenshot, if it has loaded"""
+        path = self.screenshot_path.text()
+        pixmap = self.thumbnails.pixmap(path)
+        if pixmap is not None:
+            self.screenshot_preview.setPixmap(pixmap)
+        elif path in self.thumbnails.failed:
+            self.screenshot_preview.setText("⚠️ Image not found")
+        else:
+            self.screenshot_preview.setText("⏳ Loading preview...")
+        self.screenshot_preview.setVisible(bool(path))
+    
+    def on_thumbnail_ready(self, path):
+        if path == self.screenshot_path.text():
+            self.update_screenshot_preview()
+    
+    def open_gallery(self):
+        """Open the screenshot gallery window"""
+        if self.gallery is None:
+            self.gallery = ScreenshotGallery(self.queries, self)
+            self.gallery.trade_activated.connect(self.load_trade)
+        self.gallery.refresh()
+        self.gallery.show()
+        self.gallery.raise_()
+    
     def select_screenshot(self):
         """Select screenshot file"""
         filename, _ = QFileDialog.getOpenFileName(
@@ -382,7 +427,67 @@ class JournalTab(QWidget):
             "Images (*.png *.jpg *.jpeg *.bmp)"
         )
         if filename:
-            self.screenshot_path.setText(filename)
+            # A file that failed to load earlier (still being written) gets another try
+            self.thumbnails.forget(filename)
+            # Copy into the managed store (hashing and deduplicating) off the GUI thread
+            self.queries.submit("journal:attach", copy_screenshot, filename,
+                                on_result=self.on_screenshot_imported,
+                                on_error=self.on_screenshot_import_failed)
+    
+    def on_screenshot_imported(self, attachment):
+        try:
+            attachment = AttachmentStore(self.db).record(attachment)
+        except OSError as e:
+            self.on_screenshot_import_failed(str(e))
+            return
+        self.thumbnails.forget(attachment['path'])
+        if self.screenshot_path.text() == attachment['path']:
+            # Same file again: setText() won't signal, but the preview should retry
+            self.update_screenshot_preview()
+        else:
+            self.screenshot_path.setText(attachment['path'])
+        if attachment['width']:
+            self.show_status(f"📎 Screenshot stored ({attachment['width']}×{attachment['height']}, "
+                             f"{attachment['size_bytes'] / 1024:.0f} KB)")
+    
+    def on_screenshot_import_failed(self, message):
+        QMessageBox.warning(self, "Error", f"Could not import screenshot:\n{message}")
+    
+    def entry_timestamp(self):
+        """UTC epoch seconds of the entered date and New York entry time, or None"""
+        if not self.entry_time_set.isChecked():
+            return None
+        
+        entry_time = self.entry_time_input.time()
+        entry_date = self.date_input.date()
+        entry = datetime(entry_date.year(), entry_date.month(), entry_date.day(),
+                         entry_time.hour(), entry_time.minute(), tzinfo=NY_TZ)
+        return int(entry.timestamp())
+    
+    def exit_timestamp(self, entry_ts):
+        """UTC epoch seconds of the exit time, or None
+        
+        The exit is on the trade date, or the next day if it is earlier than
+        the entry (a position held overnight).
+        """
+        if not self.exit_time_set.isChecked():
+            return None
+        
+        exit_time = self.exit_time_input.time()
+        exit_date = self.date_input.date()
+        if entry_ts is not None and exit_time < self.entry_time_input.time():
+            exit_date = exit_date.addDays(1)
+        exit_moment = datetime(exit_date.year(), exit_date.month(), exit_date.day(),
+                               exit_time.hour(), exit_time.minute(), tzinfo=NY_TZ)
+        return int(exit_moment.timestamp())
+    
+    def close_date(self, date, outcome, exit_ts):
+        """New York date the trade closed on: the exit date, else the trade date"""
+        if outcome == 'pending':
+            return None
+        if exit_ts is not None:
+            return datetime.fromtimestamp(exit_ts, NY_TZ).strftime("%Y-%m-%d")
+        return date
     
     def save_trade(self):
         """Save current trade"""
@@ -405,6 +510,9 @@ class JournalTab(QWidget):
         screenshot = self.screenshot_path.text()
         
         concepts = [c.strip() for c in self.concepts_input.toPlainText().split('\n') if c.strip()]
+        entry_ts = self.entry_timestamp()
+        exit_ts = self.exit_timestamp(entry_ts)
+        date_closed = self.close_date(date, outcome, exit_ts)
         
         if self.current_trade_id:
             # Update existing
@@ -423,12 +531,16 @@ class JournalTab(QWidget):
                 setup_type=setup,
                 notes=notes,
                 screenshot_path=screenshot,
-                concepts_used=concepts
+                concepts_used=concepts,
+                entry_ts=entry_ts,
+                exit_ts=exit_ts,
+                date_closed=date_closed
             )
-            QMessageBox.information(self, "Success", "Trade updated successfully!")
+            trade_id = self.current_trade_id
+            message = "Trade updated"
         else:
             # Add new
-            self.db.add_trade(
+            trade_id = self.db.add_trade(
                 date=date,
                 pair=pair,
                 timeframe=timeframe,
@@ -442,11 +554,30 @@ class JournalTab(QWidget):
                 setup_type=setup,
                 notes=notes,
                 screenshot_path=screenshot,
-                concepts_used=concepts
+                concepts_used=concepts,
+                entry_ts=entry_ts,
+                exit_ts=exit_ts,
+                date_closed=date_closed
             )
-            QMessageBox.information(self, "Success", "Trade added successfully!")
+            message = "Trade added"
         
-        self.load_trades()
+        # Tag the trade with its session, killzone and macro window
+        label_trades(self.db)
+        
+        # Patch just this row into the list instead of reloading it
+        row = self.trade_model.upsert_trade(self.db.get_trade_list_row(trade_id))
+        if trade_id == self.current_trade_id:
+            if row >= 0:
+                self.trade_table.selectRow(row)
+            else:
+                self.trade_table.clearSelection()
+        self.show_status(f"✅ {message}: {pair} {date}")
+    
+    def show_status(self, message):
+        """Show a transient message in the main window status bar"""
+        window = self.window()
+        if isinstance(window, QMainWindow):
+            window.statusBar().showMessage(message, 4000)
     
     def delete_trade(self):
         """Delete selected trade"""
@@ -463,6 +594,6 @@ class JournalTab(QWidget):
         
         if reply == QMessageBox.StandardButton.Yes:
             self.db.delete_trade(self.current_trade_id)
+            self.trade_model.remove_trade(self.current_trade_id)
             self.add_new_trade()
-            self.load_trades()
-            QMessageBox.information(self, "Success", "Trade deleted successfully!")
\ No newline at end of file
+            self.show_status("🗑️ Trade deleted")
\ No newline at end of file
@@ -10,14 +10,36 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt6.QtCore import Qt, QTime
 from PyQt6.QtGui import QColor
 from database.db_manager import DatabaseManager
+from gui.query_runner import QueryRunner, LoadingLabel
+from gui import theme
+from gui.theme import style
+from analysis.macro_schedule import get_schedule, HOURLY_MACRO
+from concepts.registry import get_registry
+from startup_profile import get_profiler
 
 class KnowledgeTab(QWidget):
-    def __init__(self, db: DatabaseManager):
+    # Concept cards listed before the rest of the registry
+    FEATURED_CONCEPTS = ('FVG', 'OB')
+    
+    def __init__(self, db: DatabaseManager, queries: QueryRunner):
         super().__init__()
         self.db = db
+        self.queries = queries
         self.concept_cards = {}
         self.init_ui()
+        self.apply_item_colors()
         self.load_concept_notes()
+        theme.notifier.changed.connect(self.on_theme_changed)
+    
+    def on_theme_changed(self):
+        """Recolor the items the stylesheet doesn't reach"""
+        self.apply_item_colors()
+    
+    def apply_item_colors(self):
+        """Palette colors for the macro times reference table"""
+        for item, tone in self.reference_items:
+            item.setBackground(theme.color(tone, 0x22))
+            item.setForeground(theme.color(tone + '_fg'))
         
     def init_ui(self):
         """Initialize the knowledge base interface"""
@@ -29,24 +51,16 @@ class KnowledgeTab(QWidget):
         header_layout = QHBoxLayout()
         
         title = QLabel("📚 ICT Knowledge Base")
-        title.setStyleSheet("font-size: 28px; font-weight: bold; color: #3b82f6;")
+        style(title, role="title", accent="blue")
         header_layout.addWidget(title)
         
         header_layout.addStretch()
         
+        header_layout.addWidget(LoadingLabel(self.queries, "knowledge", "⏳ Loading notes..."))
+        
         # Save all button
         save_all_btn = QPushButton("💾 Save All Notes")
-        save_all_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #10b981;
-                font-size: 14px;
-                font-weight: bold;
-                padding: 10px 24px;
-            }
-            QPushButton:hover {
-                background-color: #059669;
-            }
-        """)
+        style(save_all_btn, variant="success")
         save_all_btn.clicked.connect(self.save_all_notes)
         header_layout.addWidget(save_all_btn)
         
@@ -100,7 +114,7 @@ class KnowledgeTab(QWidget):
         
         # Title and description
         title = QLabel("⏰ ICT Algorithmic Macro Times - Weekly Overview")
-        title.setStyleSheet("font-size: 22px; font-weight: bold; color: #fbbf24; margin-bottom: 5px;")
+        style(title, role="headingLarge", accent="amber")
         layout.addWidget(title)
         
         subtitle = QLabel(
@@ -108,7 +122,7 @@ class KnowledgeTab(QWidget):
             "creating predictable price movements. Focus on these windows for high-probability setups."
         )
         subtitle.setWordWrap(True)
-        subtitle.setStyleSheet("color: #94a3b8; font-size: 13px; margin-bottom: 10px; padding: 10px; background-color: #1e293b; border-radius: 6px;")
+        style(subtitle, role="intro")
         layout.addWidget(subtitle)
         
         # Scroll area for content
@@ -141,7 +155,7 @@ class KnowledgeTab(QWidget):
     def create_weekly_calendar(self):
         """Create weekly calendar view with macro time indicators"""
         group = QGroupBox("Weekly Macro Time Map")
-        group.setStyleSheet("QGroupBox { font-size: 16px; font-weight: bold; color: #fbbf24; }")
+        style(group, role="section", accent="amber")
         
         layout = QVBoxLayout()
         
@@ -153,12 +167,13 @@ class KnowledgeTab(QWidget):
             ("🟢 Major Macro", "#10b981"),
             ("🟡 Standard Macro", "#fbbf24"),
             ("🔴 Killzone", "#dc2626"),
-            ("🔵 EOD/EO4H", "#3b82f6")
+            ("🔵 EOD/EO4H", "#3b82f6"),
+            ("🟣 Asian Session", "#8b5cf6")
         ]
         
         for label, color in legend_items:
             lbl = QLabel(label)
-            lbl.setStyleSheet(f"background-color: {color}22; color: {color}; padding: 4px 8px; border-radius: 4px; font-size: 11px;")
+            style(lbl, role="legend", fill=color)
             legend_layout.addWidget(lbl)
         
         legend_layout.addStretch()
@@ -169,7 +184,7 @@ class KnowledgeTab(QWidget):
         self.weekly_table.setColumnCount(8)  # Time + 7 days
         self.weekly_table.setRowCount(24)  # 24 hours
         
-        headers = ["Hour (EST)", "Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+        headers = ["Hour (ET)", "Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
         self.weekly_table.setHorizontalHeaderLabels(headers)
         
         # Populate hours
@@ -198,109 +213,43 @@ class KnowledgeTab(QWidget):
         
     def highlight_macro_times(self):
         """Highlight algo macro times in the weekly calendar"""
+        schedule = get_schedule()
         
-        # Define macro times (EST) - these are the key algorithmic execution windows
-        macro_times = {
-            # Format: (hour, minute_start, minute_end): (color, label, description)
-            
-            # EVERY HOUR x:50-x:10 Macro (20 minutes)
-            'hourly_macro': {
-                'times': [(h, 50, 10) for h in range(24)],  # Every hour
-                'color': '#fbbf2444',
-                'label': '🟡',
-                'desc': '20min Macro'
-            },
-            
-            # Major Killzone Times
-            'london_open': {
-                'times': [(2, 0, 0), (3, 0, 0)],  # 2:00-4:00 AM EST
-                'color': '#dc262644',
-                'label': '🔴 London',
-                'desc': 'London Open Killzone'
-            },
-            
-            'ny_open': {
-                'times': [(8, 30, 0), (9, 0, 0), (9, 30, 0), (10, 0, 0)],  # 8:30-11:00 AM EST
-                'color': '#dc262644',
-                'label': '🔴 NY AM',
-                'desc': 'New York AM Killzone'
-            },
-            
-            'ny_lunch': {
-                'times': [(11, 0, 0), (12, 0, 0), (13, 0, 0)],  # 11:00 AM-2:00 PM EST
-                'color': '#3b82f644',
-                'label': '🔵 Lunch',
-                'desc': 'NY Lunch Macro'
-            },
-            
-            'ny_pm': {
-                'times': [(13, 0, 0), (14, 0, 0), (15, 0, 0)],  # 1:00-4:00 PM EST
-                'color': '#dc262644',
-                'label': '🔴 NY PM',
-                'desc': 'New York PM Killzone'
-            },
-            
-            # End of Day/4H Macros
-            'eod': {
-                'times': [(15, 0, 0), (16, 0, 0)],  # 3:00-5:00 PM EST
-                'color': '#3b82f644',
-                'label': '🔵 EOD',
-                'desc': 'End of Day Macro'
-            },
-        }
-        
-        # Days when markets are active (Mon-Fri = columns 2-6)
-        active_days = [2, 3, 4, 5, 6]  # Monday to Friday
-        
-        # Apply hourly macros to all days
         for hour in range(24):
-            for day in range(1, 8):  # All days
-                cell = self.weekly_table.item(hour, day)
-                if cell:
-                    # Add 50-10 minute macro indicator
-                    cell.setBackground(QColor(macro_times['hourly_macro']['color']))
-                    cell.setText(macro_times['hourly_macro']['label'])
-                    cell.setToolTip(f"{hour:02d}:50-{(hour+1)%24:02d}:10\n{macro_times['hourly_macro']['desc']}")
-        
-        # Apply specific killzone times (only on trading days)
-        for macro_type, macro_data in macro_times.items():
-            if macro_type == 'hourly_macro':
-                continue  # Already applied
+            for day in range(7):
+                cell = self.weekly_table.item(hour, day + 1)
+                if not cell:
+                    continue
                 
-            for hour, _, _ in macro_data['times']:
-                for day in active_days:
-                    cell = self.weekly_table.item(hour, day)
-                    if cell:
-                        # Overlay killzone color (stronger)
-                        cell.setBackground(QColor(macro_data['color']))
-                        cell.setText(macro_data['label'])
-                        cell.setToolTip(f"{hour:02d}:00\n{macro_data['desc']}")
-        
-        # Mark Sunday evening (18:00) as market open
-        sunday_open = self.weekly_table.item(18, 1)
-        if sunday_open:
-            sunday_open.setBackground(QColor("#10b98144"))
-            sunday_open.setText("📈 Open")
-            sunday_open.setToolTip("18:00 EST - Market Week Opens")
-        
-        # Mark Friday afternoon (17:00) as market close
-        friday_close = self.weekly_table.item(17, 6)
-        if friday_close:
-            friday_close.setBackground(QColor("#6b728044"))
-            friday_close.setText("📉 Close")
-            friday_close.setToolTip("17:00 EST - Market Week Closes")
+                # Weekly open/close markers, then killzones (trading days only),
+                # then the :50-:10 macro that runs every hour
+                marker = schedule.marker_for_hour(day, hour)
+                window = schedule.window_for_hour(day, hour)
+                
+                if marker:
+                    cell.setBackground(QColor(f"{marker['color']}44"))
+                    cell.setText(marker['label'])
+                    cell.setToolTip(f"{hour:02d}:00 ET - {marker['desc']}")
+                elif window:
+                    cell.setBackground(QColor(f"{window['color']}44"))
+                    cell.setText(window['label'])
+                    cell.setToolTip(f"{hour:02d}:00\n{window['desc']}")
+                else:
+                    cell.setBackground(QColor(f"{HOURLY_MACRO['color']}44"))
+                    cell.setText(HOURLY_MACRO['label'])
+                    cell.setToolTip(f"{hour:02d}:50-{(hour+1)%24:02d}:10\n{HOURLY_MACRO['desc']}")
     
     def create_macro_times_reference(self):
         """Create detailed macro times reference guide"""
         group = QGroupBox("Algorithmic Macro Times - Detailed Reference")
-        group.setStyleSheet("QGroupBox { font-size: 16px; font-weight: bold; color: #a78bfa; }")
+        style(group, role="section", accent="purple")
         
         layout = QVBoxLayout()
         
         # Create reference table
         ref_table = QTableWidget()
         ref_table.setColumnCount(5)
-        ref_table.setHorizontalHeaderLabels(["Time Window (EST)", "Type", "Duration", "Expected Behavior", "Trading Notes"])
+        ref_table.setHorizontalHeaderLabels(["Time Window (ET)", "Type", "Duration", "Expected Behavior", "Trading Notes"])
         
         macro_data = [
             # [Time, Type, Duration, Expected Behavior, Trading Notes]
@@ -342,6 +291,8 @@ class KnowledgeTab(QWidget):
         ]
         
         ref_table.setRowCount(len(macro_data))
+        # (item, palette tone) pairs, recolored when the theme changes
+        self.reference_items = []
         
         for row, data in enumerate(macro_data):
             for col, value in enumerate(data):
@@ -350,11 +301,11 @@ class KnowledgeTab(QWidget):
                 
                 # Color code by type
                 if "Killzone" in data[1]:
-                    item.setBackground(QColor("#dc262622"))
+                    self.reference_items.append((item, 'red'))
                 elif "Macro" in data[1]:
-                    item.setBackground(QColor("#fbbf2422"))
+                    self.reference_items.append((item, 'amber'))
                 elif "Silver Bullet" in data[1]:
-                    item.setBackground(QColor("#10b98122"))
+                    self.reference_items.append((item, 'green'))
                     
                 ref_table.setItem(row, col, item)
         
@@ -371,20 +322,12 @@ class KnowledgeTab(QWidget):
             "• TIME THEN PRICE: Wait for the right time window before expecting price movement\n"
             "• The 20-minute macro (x:50-x:10) happens EVERY hour - this is algorithmic execution\n"
             "• Killzones have the highest probability - but still need proper setup\n"
-            "• Sunday 18:00 to Friday 17:00 EST is the full trading week\n"
+            "• Sunday 18:00 to Friday 17:00 ET is the full trading week\n"
             "• Major news events override normal macro behavior - be cautious\n"
             "• Combine time analysis with FVG, Order Blocks, and liquidity for best results"
         )
         notes.setWordWrap(True)
-        notes.setStyleSheet("""
-            background-color: #422006;
-            color: #fbbf24;
-            padding: 15px;
-            border-radius: 6px;
-            border-left: 4px solid #fbbf24;
-            font-size: 12px;
-            line-height: 1.6;
-        """)
+        style(notes, role="callout")
         layout.addWidget(notes)
         
         group.setLayout(layout)
@@ -393,7 +336,7 @@ class KnowledgeTab(QWidget):
     def create_observations_section(self):
         """Create section for user to track their own time-based observations"""
         group = QGroupBox("📝 Your Time & Price Observations")
-        group.setStyleSheet("QGroupBox { font-size: 16px; font-weight: bold; color: #10b981; }")
+        style(group, role="section", accent="green")
         
         layout = QVBoxLayout()
         
@@ -404,7 +347,7 @@ class KnowledgeTab(QWidget):
             "• How does your asset behave during each macro?\n"
             "• When do you see the cleanest setups?"
         )
-        instructions.setStyleSheet("color: #94a3b8; font-size: 12px; margin-bottom: 10px;")
+        style(instructions, role="hint")
         layout.addWidget(instructions)
         
         self.time_observations = QTextEdit()
@@ -430,7 +373,7 @@ class KnowledgeTab(QWidget):
         
         # Title
         title = QLabel("Core ICT Concepts")
-        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #10b981; margin-bottom: 10px;")
+        style(title, role="heading", accent="green")
         layout.addWidget(title)
         
         # Scroll area
@@ -442,14 +385,9 @@ class KnowledgeTab(QWidget):
         content_layout = QVBoxLayout(content)
         content_layout.setSpacing(12)
         
-        # Core concepts - starting with FVG and Order Blocks
-        core_concepts = [
-            ("Fair Value Gap (FVG)", "FVG", self.get_fvg_content()),
-            ("Order Blocks (OB)", "OB", self.get_ob_content()),
-        ]
-        
-        for display_name, short_name, concept_data in core_concepts:
-            card = self.create_concept_card(display_name, short_name, concept_data)
+        # Every module in the concepts package, starting with FVG and Order Blocks
+        for entry in get_registry().entries(first=self.FEATURED_CONCEPTS):
+            card = self.create_concept_card(entry['title'], entry['short_name'])
             content_layout.addWidget(card)
         
         content_layout.addStretch()
@@ -466,7 +404,7 @@ class KnowledgeTab(QWidget):
         
         # Title
         title = QLabel("Quick Notes & References")
-        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #a78bfa; margin-bottom: 10px;")
+        style(title, role="heading", accent="purple")
         layout.addWidget(title)
         
         # Quick notes area
@@ -507,7 +445,7 @@ class KnowledgeTab(QWidget):
         
         for concept in future_concepts:
             label = QLabel(f"• {concept}")
-            label.setStyleSheet("color: #64748b; font-size: 13px; padding: 2px;")
+            style(label, role="listItem")
             coming_layout.addWidget(label)
         
         coming_layout.addStretch()
@@ -526,7 +464,7 @@ class KnowledgeTab(QWidget):
         
         # Title
         title = QLabel("Quick Notes & References")
-        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #a78bfa; margin-bottom: 10px;")
+        style(title, role="heading", accent="purple")
         layout.addWidget(title)
         
         # Quick notes area
@@ -564,7 +502,7 @@ class KnowledgeTab(QWidget):
         
         for concept in future_concepts:
             label = QLabel(f"• {concept}")
-            label.setStyleSheet("color: #64748b; font-size: 13px; padding: 2px;")
+            style(label, role="listItem")
             coming_layout.addWidget(label)
         
         coming_layout.addStretch()
@@ -575,54 +513,38 @@ class KnowledgeTab(QWidget):
         
         return panel
     
-    def create_concept_card(self, display_name, short_name, concept_data):
-        """Create an expandable concept card"""
+    def create_concept_card(self, display_name, short_name):
+        """Create an expandable concept card; its text is loaded on first expand"""
         card = QGroupBox(display_name)
-        card.setStyleSheet("""
-            QGroupBox {
-                font-size: 15px;
-                font-weight: bold;
-                border: 2px solid #3b82f6;
-                border-radius: 8px;
-                margin-top: 10px;
-                padding-top: 15px;
-                background-color: #1e293b;
-            }
-            QGroupBox::title {
-                color: #60a5fa;
-            }
-        """)
+        style(card, role="card", accent="blue")
         
         layout = QVBoxLayout()
         layout.setSpacing(10)
         
-        # Summary (always visible)
-        summary_label = QLabel(concept_data['summary'])
-        summary_label.setWordWrap(True)
-        summary_label.setStyleSheet("color: #94a3b8; font-size: 13px; font-weight: normal; padding: 5px;")
-        layout.addWidget(summary_label)
-        
-        # Key points (always visible)
-        if concept_data.get('key_points'):
-            points_label = QLabel("Key Points:")
-            points_label.setStyleSheet("color: #10b981; font-size: 12px; font-weight: bold; margin-top: 5px;")
-            layout.addWidget(points_label)
-            
-            for point in concept_data['key_points'][:3]:  # Show first 3 points
-                point_label = QLabel(f"• {point}")
-                point_label.setWordWrap(True)
-                point_label.setStyleSheet("color: #cbd5e1; font-size: 12px; font-weight: normal; padding-left: 10px;")
-                layout.addWidget(point_label)
+        # Full content (hidden until expanded)
+        toggle = QPushButton("▸ Show concept")
+        toggle.setCheckable(True)
+        style(toggle, variant="link")
+        layout.addWidget(toggle)
+        
+        details = QLabel()
+        details.setWordWrap(True)
+        details.setTextFormat(Qt.TextFormat.RichText)
+        details.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        style(details, role="details")
+        details.hide()
+        layout.addWidget(details)
+        toggle.toggled.connect(lambda expanded: self.toggle_concept(short_name, expanded))
         
         # Separator
         line = QFrame()
         line.setFrameShape(QFrame.Shape.HLine)
-        line.setStyleSheet("background-color: #475569; margin: 8px 0;")
+        style(line, role="separator")
         layout.addWidget(line)
         
         # Your personal notes section
         notes_label = QLabel("📝 Your Notes:")
-        notes_label.setStyleSheet("color: #fbbf24; font-size: 13px; font-weight: bold;")
+        style(notes_label, role="fieldTitle", accent="amber")
         layout.addWidget(notes_label)
         
         notes_area = QTextEdit()
@@ -632,97 +554,26 @@ class KnowledgeTab(QWidget):
             "Screenshots, examples, trade results..."
         )
         notes_area.setMaximumHeight(150)
-        notes_area.setStyleSheet("""
-            QTextEdit {
-                background-color: #0f172a;
-                border: 1px solid #475569;
-                border-radius: 4px;
-                padding: 8px;
-                font-size: 12px;
-            }
-        """)
+        style(notes_area, role="notes")
         layout.addWidget(notes_area)
         
         # Store reference
         self.concept_cards[short_name] = {
             'notes': notes_area,
-            'data': concept_data
+            'toggle': toggle,
+            'details': details
         }
         
         card.setLayout(layout)
         return card
     
-    def get_fvg_content(self):
-        """Get Fair Value Gap content"""
-        return {
-            'summary': 'A three-candle price imbalance where the market moved so fast it left an unfilled gap. Price often returns to "fill" these gaps.',
-            'key_points': [
-                'FVGs represent footprints of institutional order flow',
-                'Consequent Encroachment (50% level) is the strongest reaction point',
-                'Best used during killzone times when volatility is high',
-                'Combine with BOS/MSS for highest probability setups',
-                'FVGs can invert (IFVG) when price breaks through completely',
-                'Not every FVG is tradeable - context and confluence matter'
-            ],
-            'definition': """
-**Bullish FVG:**
-- High of Candle 1 does NOT overlap with Low of Candle 3
-- Gap = area between them
-- Acts as SUPPORT when price returns
-
-**Bearish FVG:**
-- Low of Candle 1 does NOT overlap with High of Candle 3
-- Gap = area between them
-- Acts as RESISTANCE when price returns
-
-**Entry Methods:**
-1. Aggressive: Enter at start of gap
-2. Standard: Enter at 50% (Consequent Encroachment)
-3. Conservative: Wait for confirmation
-
-**Invalidation:**
-- Price closes completely through it without reaction
-""",
-            'category': 'ICT Concepts'
-        }
-    
-    def get_ob_content(self):
-        """Get Order Blocks content"""
-        return {
-            'summary': 'Zones where institutional traders placed large orders, creating areas that act as support or resistance when price returns.',
-            'key_points': [
-                'The last opposite candle before an impulsive move is the OB',
-                'Works best when aligned with higher timeframe trend',
-                'OBs get weaker with multiple tests - first test is strongest',
-                'Failed Order Blocks become Breaker Blocks (polarity change)',
-                'Best during killzone times when institutions are active',
-                'Use 50% of OB (Mean Threshold) for better entry'
-            ],
-            'definition': """
-**Bullish Order Block:**
-- Last BEARISH candle before strong bullish move
-- Represents where institutions placed BUY orders
-- Acts as SUPPORT when price returns
-
-**Bearish Order Block:**
-- Last BULLISH candle before strong bearish move
-- Represents where institutions placed SELL orders
-- Acts as RESISTANCE when price returns
-
-**Entry Methods:**
-1. Aggressive: Buy/Sell stop above/below key candles
-2. Conservative: Wait for price to return to OB zone
-3. High Probability: Combine with FVG + liquidity sweep
-
-**Stop Loss:**
-- Bullish OB: 10-20 pips below the low
-- Bearish OB: 10-20 pips above the high
-
-**Invalidation:**
-- Price closes completely through without reaction
-""",
-            'category': 'ICT Concepts'
-        }
+    def toggle_concept(self, short_name, expanded):
+        """Show or hide a concept's full text, rendering it on first expand"""
+        card = self.concept_cards[short_name]
+        if expanded and not card['details'].text():
+            card['details'].setText(get_registry().render(short_name))
+        card['details'].setVisible(expanded)
+        card['toggle'].setText("▾ Hide concept" if expanded else "▸ Show concept")
     
     def save_all_notes(self):
         """Save all personal notes to database"""
@@ -763,19 +614,21 @@ class KnowledgeTab(QWidget):
             )
     
     def load_concept_notes(self):
-        """Load saved notes from database"""
-        for concept_id, card in self.concept_cards.items():
-            notes = self.db.get_concept_notes(concept_id)
-            if notes:
-                card['notes'].setPlainText(notes)
-        
-        # Load quick notes
-        quick_notes = self.db.get_concept_notes('QUICK_NOTES')
-        if quick_notes:
-            self.quick_notes.setPlainText(quick_notes)
+        """Load saved notes from database in the background"""
+        self.queries.submit("knowledge:notes", DatabaseManager.get_all_concept_notes,
+                            on_result=self.show_concept_notes)
+    
+    def show_concept_notes(self, all_notes):
+        """Fill note editors, leaving alone any the user typed into meanwhile"""
+        editors = {concept_id: card['notes'] for concept_id, card in self.concept_cards.items()}
+        editors['QUICK_NOTES'] = self.quick_notes
         
         # Load time & price observations (after UI is created)
         if hasattr(self, 'time_observations'):
-            time_obs = self.db.get_concept_notes('TIME_PRICE_OBSERVATIONS')
-            if time_obs:
-                self.time_observations.setPlainText(time_obs)
\ No newline at end of file
+            editors['TIME_PRICE_OBSERVATIONS'] = self.time_observations
+        
+        with get_profiler().phase("knowledge notes loaded"):
+            for concept_id, editor in editors.items():
+                notes = all_notes.get(concept_id)
+                if notes and not editor.toPlainText():
+                    editor.setPlainText(notes)
\ No newline at end of file
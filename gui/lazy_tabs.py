@@ -0,0 +1,45 @@
+"""
+Lazy Tabs - Placeholder pages that build their real tab on first activation
+"""
+
+from importlib import import_module
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt6.QtCore import Qt
+from gui.theme import style
+
+
+class LazyTab(QWidget):
+    """Cheap stand-in for a tab page; build() imports and constructs the real one
+    
+    The page stays in the QTabWidget and only swaps its contents, so tab
+    indices never change. Even the tab's module is imported on first use.
+    """
+    
+    def __init__(self, module: str, class_name: str, *args, parent=None):
+        super().__init__(parent)
+        self.module = module
+        self.class_name = class_name
+        self.args = args
+        self.widget = None
+        
+        self.page_layout = QVBoxLayout(self)
+        self.page_layout.setContentsMargins(0, 0, 0, 0)
+        self.placeholder = QLabel("⏳ Loading...")
+        self.placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        style(self.placeholder, role="placeholder")
+        self.page_layout.addWidget(self.placeholder)
+    
+    def is_built(self):
+        return self.widget is not None
+    
+    def build(self):
+        """The real tab, constructed the first time it is needed"""
+        if self.widget is None:
+            tab_class = getattr(import_module(self.module), self.class_name)
+            self.widget = tab_class(*self.args)
+            self.page_layout.removeWidget(self.placeholder)
+            self.placeholder.deleteLater()
+            self.placeholder = None
+            self.page_layout.addWidget(self.widget)
+        return self.widget
@@ -4,22 +4,49 @@ Main Window - Primary application interface
 
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QTabWidget, QLabel, QPushButton, QStatusBar)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPalette, QColor
-from gui.knowledge_tab import KnowledgeTab
-from gui.journal_tab import JournalTab
-from gui.analytics_tab import AnalyticsTab
-from gui.market_tab import MarketTab
-from gui.time_then_price import TimeThenPriceTab
+from PyQt6.QtCore import Qt, QTimer
+from gui.query_runner import QueryRunner
+from gui import theme
+from gui.lazy_tabs import LazyTab
+from gui.thumbnails import get_thumbnail_service
 from database.db_manager import DatabaseManager
+from database.attachment_store import (AttachmentStore, copy_unmanaged_screenshots,
+                                       find_attachment_garbage)
+from startup_profile import get_profiler
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    ATTACHMENT_GC_DELAY_MS = 10000
+    # Idle-time prebuilding of the remaining tabs starts after the first paint
+    PREBUILD_DELAY_MS = 1500
+    
+    # (attribute, tab title, module, class, method to refresh on show or None)
+    TABS = [
+        ('time_then_price_tab', "⏰ Time Then Price", 'gui.time_then_price', 'TimeThenPriceTab', None),
+        ('market_tab', "📊 Market Data", 'gui.market_tab', 'MarketTab', 'load_market_data'),
+        ('knowledge_tab', "📚 Knowledge Base", 'gui.knowledge_tab', 'KnowledgeTab', None),
+        ('journal_tab', "📝 Trade Journal", 'gui.journal_tab', 'JournalTab', None),
+        ('analytics_tab', "📈 Analytics", 'gui.analytics_tab', 'AnalyticsTab', 'refresh_data'),
+        ('calendar_tab', "📅 Calendar", 'gui.calendar_tab', 'CalendarTab', 'refresh_data'),
+    ]
+    
+    def __init__(self, prebuild_tabs: bool = True):
         super().__init__()
         self.db = DatabaseManager()
-        self.init_ui()
-        self.apply_dark_theme()
-        
+        self.queries = QueryRunner(self.db, parent=self)
+        profiler = get_profiler()
+        # Styled before any widget exists so each is polished once, against the final sheet
+        with profiler.phase("apply_theme"):
+            theme.apply_theme(self)
+        with profiler.phase("init_ui"):
+            self.init_ui()
+        
+        # Only the visible tab is built up front; the rest follow when idle
+        if prebuild_tabs:
+            QTimer.singleShot(self.PREBUILD_DELAY_MS, self.prebuild_next_tab)
+        
+        # Tidy the screenshot store once the UI has settled
+        QTimer.singleShot(self.ATTACHMENT_GC_DELAY_MS, self.maintain_attachments)
+    
     def init_ui(self):
         """Initialize the user interface"""
         self.setWindowTitle("ICT Trading Platform - Knowledge & Journal")
@@ -40,20 +67,15 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.tabs.setDocumentMode(True)
         
-        # Create tabs
-        self.time_then_price_tab = TimeThenPriceTab(self.db)
-        self.market_tab = MarketTab(self.db)
-        self.knowledge_tab = KnowledgeTab(self.db)
-        self.journal_tab = JournalTab(self.db)
-        self.analytics_tab = AnalyticsTab(self.db)
-        
-        self.tabs.addTab(self.time_then_price_tab, "⏰ Time Then Price")
-        self.tabs.addTab(self.market_tab, "📊 Market Data")
-        self.tabs.addTab(self.knowledge_tab, "📚 Knowledge Base")
-        self.tabs.addTab(self.journal_tab, "📝 Trade Journal")
-        self.tabs.addTab(self.analytics_tab, "📈 Analytics")
+        # Create tabs as placeholders; each is built on first activation
+        self.lazy_tabs = []
+        for attribute, title, module, class_name, _ in self.TABS:
+            self.lazy_tabs.append(LazyTab(module, class_name, self.db, self.queries))
+            self.tabs.addTab(self.lazy_tabs[-1], title)
+            setattr(self, attribute, None)
         
         main_layout.addWidget(self.tabs)
+        self.build_tab(self.tabs.currentIndex())
         
         # Status bar
         self.status_bar = QStatusBar()
@@ -62,35 +84,24 @@ class MainWindow(QMainWindow):
         
         # Connect signals
         self.tabs.currentChanged.connect(self.on_tab_changed)
-        
+        self.queries.query_failed.connect(self.on_query_failed)
+    
     def create_header(self):
         """Create application header"""
         header = QWidget()
         header.setFixedHeight(80)
-        header.setStyleSheet("""
-            QWidget {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #1e293b, stop:1 #334155);
-                border-bottom: 2px solid #3b82f6;
-            }
-        """)
+        header.setObjectName("appHeader")
+        header.setAttribute(Qt.WidgetAttribute.WA_StyledBackground)
         
         layout = QHBoxLayout(header)
         layout.setContentsMargins(20, 10, 20, 10)
         
         # Title
         title_label = QLabel("ICT Trading Platform")
-        title_label.setStyleSheet("""
-            font-size: 28px;
-            font-weight: bold;
-            color: #f1f5f9;
-        """)
+        title_label.setObjectName("appTitle")
         
         subtitle_label = QLabel("Knowledge Base & Trading Journal")
-        subtitle_label.setStyleSheet("""
-            font-size: 14px;
-            color: #94a3b8;
-        """)
+        subtitle_label.setObjectName("appSubtitle")
         
         title_layout = QVBoxLayout()
         title_layout.addWidget(title_label)
@@ -100,203 +111,84 @@ class MainWindow(QMainWindow):
         layout.addLayout(title_layout)
         layout.addStretch()
         
+        # Dark / light switch
+        self.theme_button = QPushButton()
+        self.theme_button.setObjectName("themeToggle")
+        self.theme_button.clicked.connect(self.toggle_theme)
+        self.update_theme_button()
+        layout.addWidget(self.theme_button)
+        
         # Version label
         version_label = QLabel("v1.2.0")
-        version_label.setStyleSheet("color: #64748b; font-size: 12px;")
+        version_label.setObjectName("appVersion")
         layout.addWidget(version_label)
         
         return header
     
+    def build_tab(self, index):
+        """Construct the real tab at index if it is still a placeholder"""
+        lazy_tab = self.lazy_tabs[index]
+        if not lazy_tab.is_built():
+            with get_profiler().phase(f"tab {lazy_tab.class_name}"):
+                setattr(self, self.TABS[index][0], lazy_tab.build())
+        return lazy_tab.widget
+    
+    def prebuild_next_tab(self):
+        """Build one unbuilt tab, then yield to the event loop before the next"""
+        for index, lazy_tab in enumerate(self.lazy_tabs):
+            if not lazy_tab.is_built():
+                self.build_tab(index)
+                QTimer.singleShot(0, self.prebuild_next_tab)
+                return
+    
     def on_tab_changed(self, index):
-        """Handle tab change"""
-        tab_names = ["Time Then Price", "Market Data", "Knowledge Base", "Trade Journal", "Analytics"]
-        if index < len(tab_names):
-            self.status_bar.showMessage(f"Viewing: {tab_names[index]}")
-            
-            # Refresh analytics when switching to it
-            if index == 4:
-                self.analytics_tab.refresh_data()
-            # Refresh market data when switching to it
-            elif index == 1:
-                self.market_tab.load_todays_data()
+        """Build the tab if needed and refresh the ones that show live data"""
+        if 0 <= index < len(self.TABS):
+            tab = self.build_tab(index)
+            _, title, _, _, refresh = self.TABS[index]
+            self.status_bar.showMessage(f"Viewing: {title}")
+            if refresh:
+                getattr(tab, refresh)()
+    
+    def on_query_failed(self, key, message):
+        """Surface a background query that failed without its own error handler"""
+        self.status_bar.showMessage(f"⚠️ {key} failed: {message}", 10000)
+    
+    def maintain_attachments(self):
+        """Copy screenshots saved before the store existed into it, then collect garbage
+        
+        Files are copied and scanned on a query worker; the table writes
+        happen here on the GUI thread.
+        """
+        self.queries.submit("maintenance:screenshots", copy_unmanaged_screenshots,
+                            on_result=self.on_screenshots_copied)
+    
+    def on_screenshots_copied(self, copies):
+        moved = AttachmentStore(self.db).adopt_screenshots(copies)
+        if moved:
+            self.status_bar.showMessage(f"Moved {moved} screenshot(s) into the attachment store", 5000)
+        self.queries.submit("maintenance:attachments", find_attachment_garbage,
+                            on_result=self.on_attachment_garbage_found)
+    
+    def on_attachment_garbage_found(self, garbage):
+        result = AttachmentStore(self.db).delete_garbage(garbage)
+        if result['removed']:
+            self.status_bar.showMessage(
+                f"Removed {result['removed']} unused screenshot(s), "
+                f"freed {result['freed_bytes'] / 1024 / 1024:.1f} MB", 5000)
+    
+    def toggle_theme(self):
+        """Swap the application stylesheet between the dark and light themes"""
+        with get_profiler().phase("toggle_theme"):
+            theme.toggle_theme(self)
+            self.update_theme_button()
+        self.status_bar.showMessage(f"{theme.current_theme().title()} theme", 3000)
+    
+    def update_theme_button(self):
+        self.theme_button.setText("☀️ Light" if theme.current_theme() == 'dark' else "🌙 Dark")
     
-    def apply_dark_theme(self):
-        """Apply dark theme to the application"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #0f172a;
-            }
-            QTabWidget::pane {
-                border: none;
-                background-color: #1e293b;
-            }
-            QTabBar::tab {
-                background-color: #334155;
-                color: #94a3b8;
-                padding: 12px 24px;
-                margin-right: 2px;
-                border-top-left-radius: 6px;
-                border-top-right-radius: 6px;
-                font-size: 14px;
-                font-weight: 500;
-            }
-            QTabBar::tab:selected {
-                background-color: #1e293b;
-                color: #3b82f6;
-                border-bottom: 2px solid #3b82f6;
-            }
-            QTabBar::tab:hover {
-                background-color: #475569;
-                color: #e2e8f0;
-            }
-            QStatusBar {
-                background-color: #1e293b;
-                color: #94a3b8;
-                border-top: 1px solid #334155;
-            }
-            QPushButton {
-                background-color: #3b82f6;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 6px;
-                font-size: 14px;
-                font-weight: 500;
-            }
-            QPushButton:hover {
-                background-color: #2563eb;
-            }
-            QPushButton:pressed {
-                background-color: #1d4ed8;
-            }
-            QPushButton:disabled {
-                background-color: #475569;
-                color: #64748b;
-            }
-            QLineEdit, QTextEdit, QComboBox, QSpinBox, QDoubleSpinBox {
-                background-color: #334155;
-                color: #e2e8f0;
-                border: 1px solid #475569;
-                border-radius: 6px;
-                padding: 8px;
-                font-size: 13px;
-            }
-            QLineEdit:focus, QTextEdit:focus, QComboBox:focus {
-                border: 1px solid #3b82f6;
-            }
-            QLabel {
-                color: #e2e8f0;
-                font-size: 13px;
-            }
-            QListWidget, QTreeWidget, QTableWidget {
-                background-color: #1e293b;
-                color: #e2e8f0;
-                border: 1px solid #334155;
-                border-radius: 6px;
-                font-size: 13px;
-            }
-            QListWidget::item, QTreeWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #334155;
-            }
-            QListWidget::item:selected, QTreeWidget::item:selected {
-                background-color: #3b82f6;
-                color: white;
-            }
-            QListWidget::item:hover, QTreeWidget::item:hover {
-                background-color: #334155;
-            }
-            QScrollBar:vertical {
-                background-color: #1e293b;
-                width: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #475569;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #64748b;
-            }
-            QScrollBar:horizontal {
-                background-color: #1e293b;
-                height: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:horizontal {
-                background-color: #475569;
-                border-radius: 6px;
-                min-width: 20px;
-            }
-            QScrollBar::add-line, QScrollBar::sub-line {
-                border: none;
-                background: none;
-            }
-            QComboBox::drop-down {
-                border: none;
-                padding-right: 10px;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid #94a3b8;
-                margin-right: 5px;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #334155;
-                color: #e2e8f0;
-                selection-background-color: #3b82f6;
-                border: 1px solid #475569;
-            }
-            QGroupBox {
-                color: #e2e8f0;
-                border: 1px solid #475569;
-                border-radius: 6px;
-                margin-top: 12px;
-                font-weight: 500;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-            QTableWidget {
-                gridline-color: #334155;
-            }
-            QTableWidget::item {
-                padding: 5px;
-            }
-            QTableWidget::item:selected {
-                background-color: #3b82f6;
-            }
-            QHeaderView::section {
-                background-color: #334155;
-                color: #e2e8f0;
-                padding: 8px;
-                border: none;
-                border-right: 1px solid #475569;
-                border-bottom: 1px solid #475569;
-                font-weight: 600;
-            }
-            QDateEdit {
-                background-color: #334155;
-                color: #e2e8f0;
-                border: 1px solid #475569;
-                border-radius: 6px;
-                padding: 8px;
-            }
-            QDateEdit::drop-down {
-                border: none;
-                padding-right: 10px;
-            }
-            QDateEdit::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid #94a3b8;
-                margin-right: 5px;
-            }
-        """)
\ No newline at end of file
+    def closeEvent(self, event):
+        """Let running background queries finish before the app exits"""
+        self.queries.shutdown()
+        get_thumbnail_service().shutdown()
+        super().closeEvent(event)
@@ -6,23 +6,54 @@ NOW WITH DAILY BIAS CALCULATOR BUTTON
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                             QLineEdit, QPushButton, QGridLayout, QGroupBox,
                             QScrollArea, QDateEdit, QMessageBox, QFrame, QSplitter)
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import Qt, QDate, QTimer
 from PyQt6.QtGui import QDoubleValidator, QFont
 from database.db_manager import DatabaseManager
+from gui.query_runner import QueryRunner, LoadingLabel
 from gui.bias_calculator import DailyBiasCalculator
+from gui.theme import style
+from analysis.levels import parse_prices, circuit_breaker_levels, next_day_projection
+import numpy as np
 import webbrowser
 
 class MarketTab(QWidget):
-    def __init__(self, db: DatabaseManager):
+    # CME cards share symbols with asset cards, so they are stored under a prefix
+    CME_PREFIX = "CME:"
+    SAVE_DELAY_MS = 1000
+    RECOMPUTE_DELAY_MS = 50
+    
+    def __init__(self, db: DatabaseManager, queries: QueryRunner):
         super().__init__()
         self.db = db
+        self.queries = queries
         self.cb_cards = {}
         self.general_cb_inputs = {}
         self.general_cb_results = {}
         self.cme_inputs = {}
         self.cme_results = {}
-        self.init_ui()
+        self.dirty_cards = set()
+        self.edited_during_load = set()
+        self.loading_cards = False
+        # Session date the cards currently show; edits are saved under it
+        self.loaded_date = QDate.currentDate().toString("yyyy-MM-dd")
+        self.dirty_cb = set()
+        self.dirty_cme = set()
+        self.general_dirty = False
+        
+        # Bursts of edits (typing, loading saved cards) collapse into one recompute
+        self.recompute_timer = QTimer(self)
+        self.recompute_timer.setSingleShot(True)
+        self.recompute_timer.setInterval(self.RECOMPUTE_DELAY_MS)
+        self.recompute_timer.timeout.connect(self.recompute_dashboard)
+        
+        # Edits are coalesced and written in one batch shortly after typing stops
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(self.SAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self.save_dirty_cards)
         
+        self.init_ui()
+    
     def init_ui(self):
         """Initialize the market analysis interface"""
         layout = QVBoxLayout(self)
@@ -33,40 +64,30 @@ class MarketTab(QWidget):
         header_layout = QHBoxLayout()
         
         title = QLabel("📊 Market Analysis Dashboard")
-        title.setStyleSheet("font-size: 28px; font-weight: bold; color: #3b82f6;")
+        style(title, role="title", accent="blue")
         header_layout.addWidget(title)
         
         header_layout.addStretch()
         
+        header_layout.addWidget(LoadingLabel(self.queries, "market"))
+        
         # Daily Bias Calculator button (NEW!)
         bias_calc_btn = QPushButton("🎯 Daily Bias Calculator")
-        bias_calc_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #8b5cf6;
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-                padding: 10px 20px;
-                border-radius: 6px;
-            }
-            QPushButton:hover {
-                background-color: #7c3aed;
-            }
-        """)
+        style(bias_calc_btn, variant="violet")
         bias_calc_btn.clicked.connect(self.open_bias_calculator)
         bias_calc_btn.setToolTip("Open comprehensive daily bias checklist")
         header_layout.addWidget(bias_calc_btn)
         
         # Date selector
         date_label = QLabel("Date:")
-        date_label.setStyleSheet("font-size: 14px; font-weight: 500; margin-left: 10px;")
+        style(date_label, role="fieldLabel")
         header_layout.addWidget(date_label)
         
         self.date_input = QDateEdit()
         self.date_input.setDate(QDate.currentDate())
         self.date_input.setCalendarPopup(True)
         self.date_input.setMinimumWidth(150)
-        self.date_input.setStyleSheet("font-size: 14px; padding: 8px;")
+        self.date_input.dateChanged.connect(self.load_market_data)
         header_layout.addWidget(self.date_input)
         
         layout.addLayout(header_layout)
@@ -89,7 +110,7 @@ class MarketTab(QWidget):
         """Open the Daily Bias Calculator dialog"""
         dialog = DailyBiasCalculator(self)
         dialog.exec()
-        
+    
     def create_your_assets_panel(self):
         """Create panel for your 9 main trading assets"""
         panel = QWidget()
@@ -98,7 +119,7 @@ class MarketTab(QWidget):
         
         # Title
         title = QLabel("Your Trading Assets - Circuit Breakers")
-        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #10b981; margin-bottom: 10px;")
+        style(title, role="heading", accent="green")
         layout.addWidget(title)
         
         # Scroll area
@@ -164,20 +185,7 @@ class MarketTab(QWidget):
     def create_asset_cb_card(self, display_name, symbol, asset_type):
         """Create compact circuit breaker card for one asset"""
         card = QGroupBox(display_name)
-        card.setStyleSheet("""
-            QGroupBox {
-                font-size: 14px;
-                font-weight: bold;
-                border: 2px solid #3b82f6;
-                border-radius: 8px;
-                margin-top: 10px;
-                padding-top: 15px;
-                background-color: #1e293b;
-            }
-            QGroupBox::title {
-                color: #60a5fa;
-            }
-        """)
+        style(card, role="card", accent="blue")
         
         layout = QGridLayout()
         layout.setSpacing(8)
@@ -188,52 +196,55 @@ class MarketTab(QWidget):
         high_input = QLineEdit()
         high_input.setPlaceholderText("High")
         high_input.setMaximumWidth(70)
-        high_input.textChanged.connect(lambda: self.calc_cb(symbol))
+        high_input.textChanged.connect(lambda: self.mark_dirty('cb', symbol))
         layout.addWidget(high_input, 0, 1)
         
         layout.addWidget(QLabel("L:"), 0, 2)
         low_input = QLineEdit()
         low_input.setPlaceholderText("Low")
         low_input.setMaximumWidth(70)
-        low_input.textChanged.connect(lambda: self.calc_cb(symbol))
+        low_input.textChanged.connect(lambda: self.mark_dirty('cb', symbol))
         layout.addWidget(low_input, 0, 3)
         
         layout.addWidget(QLabel("C:"), 0, 4)
         close_input = QLineEdit()
         close_input.setPlaceholderText("Close")
         close_input.setMaximumWidth(70)
-        close_input.textChanged.connect(lambda: self.calc_cb(symbol))
+        close_input.textChanged.connect(lambda: self.mark_dirty('cb', symbol))
         layout.addWidget(close_input, 0, 5)
         
         # Row 2: CME Settlement (for proper next day calculation)
         layout.addWidget(QLabel("Settlement:"), 1, 0, 1, 2)
         settlement_input = QLineEdit()
         settlement_input.setPlaceholderText("CME Settlement (optional)")
-        settlement_input.textChanged.connect(lambda: self.calc_cb(symbol))
+        settlement_input.textChanged.connect(lambda: self.mark_dirty('cb', symbol))
         layout.addWidget(settlement_input, 1, 2, 1, 4)
         
         # Circuit Breaker Results
         cb1_label = QLabel("CB1: —")
-        cb1_label.setStyleSheet("background-color: #422006; color: #fbbf24; padding: 4px; border-radius: 3px; font-size: 11px;")
+        style(cb1_label, role="chip", tint="amber")
         layout.addWidget(cb1_label, 2, 0, 1, 2)
         
         cb2_label = QLabel("CB2: —")
-        cb2_label.setStyleSheet("background-color: #7c2d12; color: #fb923c; padding: 4px; border-radius: 3px; font-size: 11px;")
+        style(cb2_label, role="chip", tint="orange")
         layout.addWidget(cb2_label, 2, 2, 1, 2)
         
         cb3_label = QLabel("CB3: —")
-        cb3_label.setStyleSheet("background-color: #7f1d1d; color: #fca5a5; padding: 4px; border-radius: 3px; font-size: 11px;")
+        style(cb3_label, role="chip", tint="red")
         layout.addWidget(cb3_label, 2, 4, 1, 2)
         
         # Next Day Projections
         proj_high_label = QLabel("Next High: —")
-        proj_high_label.setStyleSheet("background-color: #14532d; color: #86efac; padding: 4px; border-radius: 3px; font-size: 11px; font-weight: bold;")
+        style(proj_high_label, role="chipStrong", tint="green")
         layout.addWidget(proj_high_label, 3, 0, 1, 3)
         
         proj_low_label = QLabel("Next Low: —")
-        proj_low_label.setStyleSheet("background-color: #7f1d1d; color: #fca5a5; padding: 4px; border-radius: 3px; font-size: 11px; font-weight: bold;")
+        style(proj_low_label, role="chipStrong", tint="red")
         layout.addWidget(proj_low_label, 3, 3, 1, 3)
         
+        for line_edit in (high_input, low_input, close_input, settlement_input):
+            line_edit.textChanged.connect(lambda: self.schedule_save(symbol))
+        
         # Store references
         self.cb_cards[symbol] = {
             'high': high_input,
@@ -254,7 +265,7 @@ class MarketTab(QWidget):
     def create_general_calculator(self):
         """Create general calculator for any asset"""
         group = QGroupBox("General Calculator (Any Asset)")
-        group.setStyleSheet("QGroupBox { font-size: 16px; font-weight: bold; color: #a78bfa; }")
+        style(group, role="section", accent="purple")
         
         layout = QGridLayout()
         layout.setSpacing(10)
@@ -268,43 +279,43 @@ class MarketTab(QWidget):
         # Price inputs
         layout.addWidget(QLabel("High:"), 1, 0)
         high_input = QLineEdit()
-        high_input.textChanged.connect(self.calc_general_cb)
+        high_input.textChanged.connect(lambda: self.mark_dirty('general'))
         layout.addWidget(high_input, 1, 1)
         
         layout.addWidget(QLabel("Low:"), 1, 2)
         low_input = QLineEdit()
-        low_input.textChanged.connect(self.calc_general_cb)
+        low_input.textChanged.connect(lambda: self.mark_dirty('general'))
         layout.addWidget(low_input, 1, 3)
         
         layout.addWidget(QLabel("Close:"), 2, 0)
         close_input = QLineEdit()
-        close_input.textChanged.connect(self.calc_general_cb)
+        close_input.textChanged.connect(lambda: self.mark_dirty('general'))
         layout.addWidget(close_input, 2, 1, 1, 3)
         
         # Results
         line = QFrame()
         line.setFrameShape(QFrame.Shape.HLine)
-        line.setStyleSheet("background-color: #475569;")
+        style(line, role="separator")
         layout.addWidget(line, 3, 0, 1, 4)
         
         cb1_label = QLabel("CB Level 1: —")
-        cb1_label.setStyleSheet("background-color: #422006; color: #fbbf24; padding: 8px; border-radius: 4px;")
+        style(cb1_label, role="chipLarge", tint="amber")
         layout.addWidget(cb1_label, 4, 0, 1, 4)
         
         cb2_label = QLabel("CB Level 2: —")
-        cb2_label.setStyleSheet("background-color: #7c2d12; color: #fb923c; padding: 8px; border-radius: 4px;")
+        style(cb2_label, role="chipLarge", tint="orange")
         layout.addWidget(cb2_label, 5, 0, 1, 4)
         
         cb3_label = QLabel("CB Level 3: —")
-        cb3_label.setStyleSheet("background-color: #7f1d1d; color: #fca5a5; padding: 8px; border-radius: 4px;")
+        style(cb3_label, role="chipLarge", tint="red")
         layout.addWidget(cb3_label, 6, 0, 1, 4)
         
         proj_high_label = QLabel("Next Day High: —")
-        proj_high_label.setStyleSheet("background-color: #14532d; color: #86efac; padding: 8px; border-radius: 4px;")
+        style(proj_high_label, role="chipLarge", tint="green")
         layout.addWidget(proj_high_label, 7, 0, 1, 4)
         
         proj_low_label = QLabel("Next Day Low: —")
-        proj_low_label.setStyleSheet("background-color: #7f1d1d; color: #fca5a5; padding: 8px; border-radius: 4px;")
+        style(proj_low_label, role="chipLarge", tint="red")
         layout.addWidget(proj_low_label, 8, 0, 1, 4)
         
         self.general_cb_inputs = {
@@ -328,7 +339,7 @@ class MarketTab(QWidget):
     def create_cme_section(self):
         """Create CME reference data section for indices"""
         group = QGroupBox("CME Reference Data (Indices)")
-        group.setStyleSheet("QGroupBox { font-size: 16px; font-weight: bold; color: #fbbf24; }")
+        style(group, role="section", accent="amber")
         
         layout = QVBoxLayout()
         
@@ -340,26 +351,14 @@ class MarketTab(QWidget):
             "Used for calculating official circuit breaker levels."
         )
         info.setWordWrap(True)
-        info.setStyleSheet("color: #94a3b8; font-size: 12px;")
+        style(info, role="hint")
         info_layout.addWidget(info)
         
         info_layout.addStretch()
         
         # Button to open CME website
         cme_button = QPushButton("🌐 Get CME Data")
-        cme_button.setStyleSheet("""
-            QPushButton {
-                background-color: #0891b2;
-                color: white;
-                font-size: 13px;
-                font-weight: bold;
-                padding: 10px 20px;
-                border-radius: 6px;
-            }
-            QPushButton:hover {
-                background-color: #0e7490;
-            }
-        """)
+        style(cme_button, variant="cyan")
         cme_button.clicked.connect(self.open_cme_website)
         cme_button.setToolTip("Opens CME Group website in your browser")
         info_layout.addWidget(cme_button)
@@ -369,7 +368,7 @@ class MarketTab(QWidget):
         # Separator
         line = QFrame()
         line.setFrameShape(QFrame.Shape.HLine)
-        line.setStyleSheet("background-color: #475569; margin: 10px 0;")
+        style(line, role="separator")
         layout.addWidget(line)
         
         # Create CME input for each index
@@ -389,54 +388,57 @@ class MarketTab(QWidget):
     def create_cme_card(self, display_name, symbol):
         """Create CME data card for an index"""
         card = QFrame()
-        card.setStyleSheet("background-color: #1e293b; border: 1px solid #475569; border-radius: 6px; padding: 10px;")
+        style(card, role="inset")
         
         layout = QGridLayout(card)
         layout.setSpacing(8)
         
         # Title
         title = QLabel(display_name)
-        title.setStyleSheet("font-weight: bold; font-size: 13px; color: #fbbf24;")
+        style(title, role="fieldTitle", accent="amber")
         layout.addWidget(title, 0, 0, 1, 4)
         
         # Inputs
         layout.addWidget(QLabel("Prior Settlement:"), 1, 0)
         settlement_input = QLineEdit()
         settlement_input.setPlaceholderText("CME Settlement")
-        settlement_input.textChanged.connect(lambda: self.calc_cme(symbol))
+        settlement_input.textChanged.connect(lambda: self.mark_dirty('cme', symbol))
         layout.addWidget(settlement_input, 1, 1, 1, 3)
         
         layout.addWidget(QLabel("Opening Price:"), 2, 0)
         open_input = QLineEdit()
         open_input.setPlaceholderText("Today's Open")
-        open_input.textChanged.connect(lambda: self.calc_cme(symbol))
+        open_input.textChanged.connect(lambda: self.mark_dirty('cme', symbol))
         layout.addWidget(open_input, 2, 1, 1, 3)
         
         # CME Limit Up/Down Results
         limit_up_7 = QLabel("Limit Up 7%: —")
-        limit_up_7.setStyleSheet("background-color: #14532d; color: #86efac; padding: 4px; border-radius: 3px; font-size: 11px;")
+        style(limit_up_7, role="chip", tint="green")
         layout.addWidget(limit_up_7, 3, 0, 1, 2)
         
         limit_down_7 = QLabel("Limit Down 7%: —")
-        limit_down_7.setStyleSheet("background-color: #7f1d1d; color: #fca5a5; padding: 4px; border-radius: 3px; font-size: 11px;")
+        style(limit_down_7, role="chip", tint="red")
         layout.addWidget(limit_down_7, 3, 2, 1, 2)
         
         limit_up_13 = QLabel("Limit Up 13%: —")
-        limit_up_13.setStyleSheet("background-color: #14532d; color: #86efac; padding: 4px; border-radius: 3px; font-size: 11px;")
+        style(limit_up_13, role="chip", tint="green")
         layout.addWidget(limit_up_13, 4, 0, 1, 2)
         
         limit_down_13 = QLabel("Limit Down 13%: —")
-        limit_down_13.setStyleSheet("background-color: #7f1d1d; color: #fca5a5; padding: 4px; border-radius: 3px; font-size: 11px;")
+        style(limit_down_13, role="chip", tint="red")
         layout.addWidget(limit_down_13, 4, 2, 1, 2)
         
         limit_up_20 = QLabel("Limit Up 20%: —")
-        limit_up_20.setStyleSheet("background-color: #14532d; color: #86efac; padding: 4px; border-radius: 3px; font-size: 11px;")
+        style(limit_up_20, role="chip", tint="green")
         layout.addWidget(limit_up_20, 5, 0, 1, 2)
         
         limit_down_20 = QLabel("Limit Down 20%: —")
-        limit_down_20.setStyleSheet("background-color: #7f1d1d; color: #fca5a5; padding: 4px; border-radius: 3px; font-size: 11px;")
+        style(limit_down_20, role="chip", tint="red")
         layout.addWidget(limit_down_20, 5, 2, 1, 2)
         
+        for line_edit in (settlement_input, open_input):
+            line_edit.textChanged.connect(lambda: self.schedule_save(self.CME_PREFIX + symbol))
+        
         self.cme_inputs[symbol] = {
             'settlement': settlement_input,
             'open_ref': open_input
@@ -453,161 +455,242 @@ class MarketTab(QWidget):
         
         return card
     
-    def calc_cb(self, symbol):
-        """Calculate circuit breakers for your assets with proper next day high/low"""
-        card = self.cb_cards[symbol]
+    def mark_dirty(self, kind, symbol=None):
+        """Queue a card for the next dashboard recompute"""
+        if kind == 'cb':
+            self.dirty_cb.add(symbol)
+        elif kind == 'cme':
+            self.dirty_cme.add(symbol)
+        else:
+            self.general_dirty = True
+        self.recompute_timer.start()
+    
+    def recompute_dashboard(self):
+        """Recompute every dirty card in one vectorized pass, then update labels together"""
+        updates = []
+        
+        if self.dirty_cb:
+            updates.extend(self.calc_cb(sorted(self.dirty_cb)))
+            self.dirty_cb.clear()
+        
+        if self.dirty_cme:
+            updates.extend(self.calc_cme(sorted(self.dirty_cme)))
+            self.dirty_cme.clear()
+        
+        if self.general_dirty:
+            updates.extend(self.calc_general_cb())
+            self.general_dirty = False
+        
+        self.apply_label_updates(updates)
+    
+    def apply_label_updates(self, updates):
+        """Apply (label, text) pairs in a single repaint, skipping unchanged labels"""
+        if not updates:
+            return
         
+        self.setUpdatesEnabled(False)
         try:
-            high_text = card['high'].text().strip()
-            low_text = card['low'].text().strip()
-            close_text = card['close'].text().strip()
-            settlement_text = card['settlement'].text().strip()
-            
-            if not (high_text and low_text and close_text):
-                card['cb1'].setText("CB1: —")
-                card['cb2'].setText("CB2: —")
-                card['cb3'].setText("CB3: —")
-                card['proj_high'].setText("Next High: —")
-                card['proj_low'].setText("Next Low: —")
-                return
-            
-            high = float(high_text)
-            low = float(low_text)
-            close = float(close_text)
-            
-            # Circuit breakers based on close
-            cb1_up = close * 1.07
-            cb1_down = close * 0.93
-            cb2_up = close * 1.13
-            cb2_down = close * 0.87
-            cb3_up = close * 1.20
-            cb3_down = close * 0.80
-            
-            # Next day high/low projections
-            # If settlement is provided, use CME method
-            # Otherwise use range-based method
-            if settlement_text:
-                settlement = float(settlement_text)
-                # CME method: Settlement +/- range
-                range_val = high - low
-                proj_high = settlement + range_val
-                proj_low = settlement - range_val
+            for label, text in updates:
+                if label.text() != text:
+                    label.setText(text)
+        finally:
+            self.setUpdatesEnabled(True)
+    
+    def calc_cb(self, symbols):
+        """Calculate circuit breakers and next day high/low for several asset cards"""
+        cards = [self.cb_cards[symbol] for symbol in symbols]
+        
+        high, high_ok = parse_prices([card['high'].text() for card in cards])
+        low, low_ok = parse_prices([card['low'].text() for card in cards])
+        close, close_ok = parse_prices([card['close'].text() for card in cards])
+        settlement, settlement_ok = parse_prices([card['settlement'].text() for card in cards])
+        
+        complete = (high_ok & low_ok & close_ok & settlement_ok &
+                    ~np.isnan(high) & ~np.isnan(low) & ~np.isnan(close))
+        
+        # Circuit breakers are based on close; projections use the CME method
+        # when a settlement is given and a 61.8% range extension otherwise
+        up, down = circuit_breaker_levels(close)
+        proj_high, proj_low = next_day_projection(high, low, settlement)
+        
+        updates = []
+        for i, card in enumerate(cards):
+            if complete[i]:
+                updates += [
+                    (card['cb1'], f"CB1: ↑{up[i, 0]:.2f} ↓{down[i, 0]:.2f}"),
+                    (card['cb2'], f"CB2: ↑{up[i, 1]:.2f} ↓{down[i, 1]:.2f}"),
+                    (card['cb3'], f"CB3: ↑{up[i, 2]:.2f} ↓{down[i, 2]:.2f}"),
+                    (card['proj_high'], f"Next High: {proj_high[i]:.2f}"),
+                    (card['proj_low'], f"Next Low: {proj_low[i]:.2f}")
+                ]
             else:
-                # Traditional method: extend the range
-                range_val = high - low
-                proj_high = high + (range_val * 0.618)  # 61.8% Fibonacci extension
-                proj_low = low - (range_val * 0.618)
-            
-            # Update labels
-            card['cb1'].setText(f"CB1: ↑{cb1_up:.2f} ↓{cb1_down:.2f}")
-            card['cb2'].setText(f"CB2: ↑{cb2_up:.2f} ↓{cb2_down:.2f}")
-            card['cb3'].setText(f"CB3: ↑{cb3_up:.2f} ↓{cb3_down:.2f}")
-            card['proj_high'].setText(f"Next High: {proj_high:.2f}")
-            card['proj_low'].setText(f"Next Low: {proj_low:.2f}")
-            
-        except ValueError:
-            card['cb1'].setText("CB1: —")
-            card['cb2'].setText("CB2: —")
-            card['cb3'].setText("CB3: —")
-            card['proj_high'].setText("Next High: —")
-            card['proj_low'].setText("Next Low: —")
+                updates += [
+                    (card['cb1'], "CB1: —"),
+                    (card['cb2'], "CB2: —"),
+                    (card['cb3'], "CB3: —"),
+                    (card['proj_high'], "Next High: —"),
+                    (card['proj_low'], "Next Low: —")
+                ]
+        
+        return updates
     
     def calc_general_cb(self):
         """Calculate for general calculator"""
         inputs = self.general_cb_inputs
         results = self.general_cb_results
         
+        (high, low, close), valid = parse_prices([
+            inputs['high'].text(), inputs['low'].text(), inputs['close'].text()
+        ])
+        
+        if not valid.all() or np.isnan([high, low, close]).any():
+            return [
+                (results['cb1'], "CB Level 1: —"),
+                (results['cb2'], "CB Level 2: —"),
+                (results['cb3'], "CB Level 3: —"),
+                (results['proj_high'], "Next Day High: —"),
+                (results['proj_low'], "Next Day Low: —")
+            ]
+        
+        up, down = circuit_breaker_levels([close])
+        proj_high, proj_low = next_day_projection([high], [low], extension=0.5)
+        
+        return [
+            (results['cb1'], f"CB Level 1 (7%): ↑ {up[0, 0]:.2f}  |  ↓ {down[0, 0]:.2f}"),
+            (results['cb2'], f"CB Level 2 (13%): ↑ {up[0, 1]:.2f}  |  ↓ {down[0, 1]:.2f}"),
+            (results['cb3'], f"CB Level 3 (20%): ↑ {up[0, 2]:.2f}  |  ↓ {down[0, 2]:.2f}"),
+            (results['proj_high'], f"Next Day High: {proj_high[0]:.2f}"),
+            (results['proj_low'], f"Next Day Low: {proj_low[0]:.2f}")
+        ]
+    
+    def calc_cme(self, symbols):
+        """Calculate CME Limit Up/Limit Down levels for several index cards"""
+        # Use prior settlement price as reference (CME standard)
+        settlement, valid = parse_prices([self.cme_inputs[symbol]['settlement'].text()
+                                          for symbol in symbols])
+        up, down = circuit_breaker_levels(settlement)
+        
+        updates = []
+        for i, symbol in enumerate(symbols):
+            results = self.cme_results[symbol]
+            if valid[i] and not np.isnan(settlement[i]):
+                updates += [
+                    (results['limit_up_7'], f"↑ {up[i, 0]:.2f}"),
+                    (results['limit_down_7'], f"↓ {down[i, 0]:.2f}"),
+                    (results['limit_up_13'], f"↑ {up[i, 1]:.2f}"),
+                    (results['limit_down_13'], f"↓ {down[i, 1]:.2f}"),
+                    (results['limit_up_20'], f"↑ {up[i, 2]:.2f}"),
+                    (results['limit_down_20'], f"↓ {down[i, 2]:.2f}")
+                ]
+            else:
+                updates += [
+                    (results['limit_up_7'], "Limit Up 7%: —"),
+                    (results['limit_down_7'], "Limit Down 7%: —"),
+                    (results['limit_up_13'], "Limit Up 13%: —"),
+                    (results['limit_down_13'], "Limit Down 13%: —"),
+                    (results['limit_up_20'], "Limit Up 20%: —"),
+                    (results['limit_down_20'], "Limit Down 20%: —")
+                ]
+        
+        return updates
+    
+    def schedule_save(self, card_key):
+        """Queue a card for the next batched save"""
+        if self.loading_cards:
+            return
+        if self.queries.is_loading("market:session"):
+            self.edited_during_load.add(card_key)
+        self.dirty_cards.add(card_key)
+        self.save_timer.start()
+    
+    def save_dirty_cards(self):
+        """Persist every edited card in one batched upsert"""
+        self.save_timer.stop()
+        if not self.dirty_cards:
+            return
+        
+        rows = [self.card_to_row(card_key, self.loaded_date) for card_key in sorted(self.dirty_cards)]
+        self.dirty_cards.clear()
+        self.db.save_market_data_batch(rows)
+    
+    def card_to_row(self, card_key, date):
+        """Build a market_data row from the current card inputs"""
+        if card_key.startswith(self.CME_PREFIX):
+            inputs = self.cme_inputs[card_key[len(self.CME_PREFIX):]]
+            return {
+                'date': date,
+                'symbol': card_key,
+                'open': self.parse_price(inputs['open_ref']),
+                'settlement': self.parse_price(inputs['settlement'])
+            }
+        
+        card = self.cb_cards[card_key]
+        return {
+            'date': date,
+            'symbol': card_key,
+            'daily_high': self.parse_price(card['high']),
+            'daily_low': self.parse_price(card['low']),
+            'close': self.parse_price(card['close']),
+            'settlement': self.parse_price(card['settlement'])
+        }
+    
+    def parse_price(self, line_edit):
+        """Return the numeric value of an input, or None if empty/invalid"""
         try:
-            high_text = inputs['high'].text().strip()
-            low_text = inputs['low'].text().strip()
-            close_text = inputs['close'].text().strip()
-            
-            if not (high_text and low_text and close_text):
-                results['cb1'].setText("CB Level 1: —")
-                results['cb2'].setText("CB Level 2: —")
-                results['cb3'].setText("CB Level 3: —")
-                results['proj_high'].setText("Next Day High: —")
-                results['proj_low'].setText("Next Day Low: —")
-                return
-            
-            high = float(high_text)
-            low = float(low_text)
-            close = float(close_text)
-            
-            cb1_up = close * 1.07
-            cb1_down = close * 0.93
-            cb2_up = close * 1.13
-            cb2_down = close * 0.87
-            cb3_up = close * 1.20
-            cb3_down = close * 0.80
-            
-            range_val = high - low
-            proj_high = high + (range_val * 0.5)
-            proj_low = low - (range_val * 0.5)
-            
-            results['cb1'].setText(f"CB Level 1 (7%): ↑ {cb1_up:.2f}  |  ↓ {cb1_down:.2f}")
-            results['cb2'].setText(f"CB Level 2 (13%): ↑ {cb2_up:.2f}  |  ↓ {cb2_down:.2f}")
-            results['cb3'].setText(f"CB Level 3 (20%): ↑ {cb3_up:.2f}  |  ↓ {cb3_down:.2f}")
-            results['proj_high'].setText(f"Next Day High: {proj_high:.2f}")
-            results['proj_low'].setText(f"Next Day Low: {proj_low:.2f}")
-            
+            return float(line_edit.text().strip())
         except ValueError:
-            results['cb1'].setText("CB Level 1: —")
-            results['cb2'].setText("CB Level 2: —")
-            results['cb3'].setText("CB Level 3: —")
-            results['proj_high'].setText("Next Day High: —")
-            results['proj_low'].setText("Next Day Low: —")
+            return None
+    
+    def set_price(self, line_edit, value):
+        """Show a stored price in an input without touching unchanged fields"""
+        text = "" if value is None else f"{value:.10g}"
+        if line_edit.text() != text:
+            line_edit.setText(text)
     
-    def calc_cme(self, symbol):
-        """Calculate CME Limit Up/Limit Down levels"""
-        inputs = self.cme_inputs[symbol]
-        results = self.cme_results[symbol]
+    def load_market_data(self):
+        """Populate asset and CME cards with the values saved for the selected date"""
+        # Flush pending edits first, under the date they were typed against
+        self.save_dirty_cards()
+        
+        self.loaded_date = self.date_input.date().toString("yyyy-MM-dd")
+        card_keys = list(self.cb_cards) + [self.CME_PREFIX + symbol for symbol in self.cme_inputs]
+        self.edited_during_load.clear()
+        self.queries.submit("market:session", DatabaseManager.get_market_data_for_date,
+                            self.loaded_date, card_keys, on_result=self.show_market_data)
+    
+    def show_market_data(self, rows):
+        """Fill cards from a finished load, clearing cards with nothing saved for the date
+        
+        Cards edited while the load ran keep what was typed.
+        """
+        skip = self.edited_during_load
+        self.edited_during_load = set()
         
+        self.loading_cards = True
         try:
-            settlement_text = inputs['settlement'].text().strip()
-            
-            if not settlement_text:
-                results['limit_up_7'].setText("Limit Up 7%: —")
-                results['limit_down_7'].setText("Limit Down 7%: —")
-                results['limit_up_13'].setText("Limit Up 13%: —")
-                results['limit_down_13'].setText("Limit Down 13%: —")
-                results['limit_up_20'].setText("Limit Up 20%: —")
-                results['limit_down_20'].setText("Limit Down 20%: —")
-                return
+            for symbol, card in self.cb_cards.items():
+                if symbol in skip:
+                    continue
+                row = rows.get(symbol, {})
+                self.set_price(card['high'], row.get('daily_high'))
+                self.set_price(card['low'], row.get('daily_low'))
+                self.set_price(card['close'], row.get('close'))
+                self.set_price(card['settlement'], row.get('settlement'))
             
-            # Use prior settlement price as reference (CME standard)
-            settlement = float(settlement_text)
-            
-            # Calculate CME Limit Up/Down levels
-            # These are the official circuit breaker halt levels
-            limit_up_7 = settlement * 1.07
-            limit_down_7 = settlement * 0.93
-            
-            limit_up_13 = settlement * 1.13
-            limit_down_13 = settlement * 0.87
-            
-            limit_up_20 = settlement * 1.20
-            limit_down_20 = settlement * 0.80
-            
-            # Update labels with proper formatting
-            results['limit_up_7'].setText(f"↑ {limit_up_7:.2f}")
-            results['limit_down_7'].setText(f"↓ {limit_down_7:.2f}")
-            results['limit_up_13'].setText(f"↑ {limit_up_13:.2f}")
-            results['limit_down_13'].setText(f"↓ {limit_down_13:.2f}")
-            results['limit_up_20'].setText(f"↑ {limit_up_20:.2f}")
-            results['limit_down_20'].setText(f"↓ {limit_down_20:.2f}")
-            
-        except ValueError:
-            results['limit_up_7'].setText("Limit Up 7%: —")
-            results['limit_down_7'].setText("Limit Down 7%: —")
-            results['limit_up_13'].setText("Limit Up 13%: —")
-            results['limit_down_13'].setText("Limit Down 13%: —")
-            results['limit_up_20'].setText("Limit Up 20%: —")
-            results['limit_down_20'].setText("Limit Down 20%: —")
+            for symbol, inputs in self.cme_inputs.items():
+                if self.CME_PREFIX + symbol in skip:
+                    continue
+                row = rows.get(self.CME_PREFIX + symbol, {})
+                self.set_price(inputs['settlement'], row.get('settlement'))
+                self.set_price(inputs['open_ref'], row.get('open'))
+        finally:
+            self.loading_cards = False
     
-    def load_todays_data(self):
-        """Load today's data - placeholder for future use"""
-        pass
+    def hideEvent(self, event):
+        """Write pending card edits when the tab is hidden or the window closes"""
+        self.queries.cancel_group("market")
+        self.save_dirty_cards()
+        super().hideEvent(event)
     
     def open_cme_website(self):
         """Open CME Group price limits page in default browser"""
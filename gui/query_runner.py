@@ -0,0 +1,138 @@
+"""
+Query Runner - Runs database reads on a worker pool and delivers results as signals
+"""
+
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtCore import QObject, QThreadPool, pyqtSignal
+from database.db_manager import DatabaseManager
+from gui.theme import style
+
+
+class QuerySignals(QObject):
+    """Cross-thread result delivery for background queries"""
+    done = pyqtSignal(str, int, object)
+    failed = pyqtSignal(str, int, str)
+
+
+class QueryRunner(QObject):
+    """Keyed background queries where a newer request for a key replaces the older one
+    
+    Keys are namespaced by tab ("journal:page", "analytics:stats", ...) so a
+    tab can cancel everything it has in flight with cancel_group(). A failed
+    query goes to its on_error handler, or is reported through query_failed.
+    
+    Long batch jobs (simulations, report builds) are submitted with
+    batch=True and run on their own single-thread pool, so they never hold
+    the threads interactive reads are waiting for.
+    """
+    
+    loading_changed = pyqtSignal(str, bool)
+    query_failed = pyqtSignal(str, str)
+    
+    def __init__(self, db: DatabaseManager, max_threads: int = 2, batch_threads: int = 1, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.batch_pool = QThreadPool(self)
+        self.batch_pool.setMaxThreadCount(batch_threads)
+        # Keep threads alive so their connections are reused
+        self.pool.setExpiryTimeout(-1)
+        self.batch_pool.setExpiryTimeout(-1)
+        
+        self.signals = QuerySignals()
+        self.signals.done.connect(self.on_done)
+        self.signals.failed.connect(self.on_failed)
+        
+        self.generation = 0
+        self.pending = {}
+    
+    def submit(self, key, fn, *args, on_result, on_error=None, batch=False):
+        """Run fn(db, *args) in the background; on_result gets its return value"""
+        self.cancel(key, notify=False)
+        
+        self.generation += 1
+        generation = self.generation
+        self.pending[key] = (generation, on_result, on_error)
+        # A plain callable is owned and deleted by the pool, so nothing on the
+        # Python side has to outlive a query that is already running
+        pool = self.batch_pool if batch else self.pool
+        pool.start(lambda: self.run_query(key, generation, fn, args))
+        self.loading_changed.emit(key, True)
+    
+    def run_query(self, key, generation, fn, args):
+        """Pool thread body; requests cancelled or replaced while queued are skipped"""
+        if not self.is_current(key, generation):
+            return
+        try:
+            result = fn(self.db, *args)
+        except Exception as e:
+            self.signals.failed.emit(key, generation, str(e))
+        else:
+            self.signals.done.emit(key, generation, result)
+    
+    def is_current(self, key, generation):
+        entry = self.pending.get(key)
+        return entry is not None and entry[0] == generation
+    
+    def cancel(self, key, notify=True):
+        """Drop a pending request; a query already running finishes but is ignored"""
+        if self.pending.pop(key, None) is not None and notify:
+            self.loading_changed.emit(key, False)
+    
+    def cancel_group(self, group):
+        """Cancel every pending request whose key starts with 'group:'"""
+        for key in [key for key in self.pending if key.startswith(group + ":")]:
+            self.cancel(key)
+    
+    def is_loading(self, key):
+        return key in self.pending
+    
+    def group_loading(self, group):
+        return any(key.startswith(group + ":") for key in self.pending)
+    
+    def shutdown(self, timeout_ms=2000):
+        """Discard queued work and wait for running queries before closing the DB"""
+        self.pending.clear()
+        for pool in (self.pool, self.batch_pool):
+            pool.clear()
+        for pool in (self.pool, self.batch_pool):
+            pool.waitForDone(timeout_ms)
+    
+    def take(self, key, generation):
+        """Pop the pending entry for a finished query, or None if it went stale"""
+        if not self.is_current(key, generation):
+            return None
+        entry = self.pending.pop(key)
+        self.loading_changed.emit(key, False)
+        return entry
+    
+    def on_done(self, key, generation, result):
+        entry = self.take(key, generation)
+        if entry:
+            entry[1](result)
+    
+    def on_failed(self, key, generation, message):
+        entry = self.take(key, generation)
+        if entry is None:
+            return
+        if entry[2]:
+            entry[2](message)
+        else:
+            self.query_failed.emit(key, message)
+
+
+class LoadingLabel(QLabel):
+    """Small "Loading..." indicator shown while a tab has queries in flight"""
+    
+    def __init__(self, queries: QueryRunner, group: str, text: str = "⏳ Loading...", parent=None):
+        super().__init__(text, parent)
+        self.queries = queries
+        self.group = group
+        style(self, role="loading")
+        self.setVisible(False)
+        queries.loading_changed.connect(self.on_loading_changed)
+    
+    def on_loading_changed(self, key, loading):
+        if key.startswith(self.group + ":"):
+            self.setVisible(self.queries.group_loading(self.group))
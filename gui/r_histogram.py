@@ -0,0 +1,67 @@
+"""
+R Histogram - Distribution of realized R-multiples
+"""
+
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtGui import QPainter
+from gui import theme
+
+MARGIN = 8
+LABEL_HEIGHT = 16
+
+
+def paint_r_histogram(painter, width, height, buckets, bucket, palette):
+    """Paint get_r_distribution() buckets onto any paint device, in a theme's palette"""
+    painter.fillRect(0, 0, width, height, theme.color('surface', palette=palette))
+    
+    if not buckets:
+        painter.setPen(theme.color('muted', palette=palette))
+        painter.drawText(0, 0, width, height, Qt.AlignmentFlag.AlignCenter, "No trades with a stop loss yet")
+        return
+    
+    # Fill the gaps so empty buckets show as empty, not as missing columns
+    first = round(buckets[0]['low'] / bucket)
+    last = round(buckets[-1]['low'] / bucket)
+    counts = {round(row['low'] / bucket): row['count'] for row in buckets}
+    steps = list(range(first, last + 1))
+    tallest = max(counts.values())
+    
+    bar_width = (width - 2 * MARGIN) / len(steps)
+    plot_height = height - 2 * MARGIN - LABEL_HEIGHT
+    label_every = max(1, int(40 // max(bar_width, 1)) + 1)
+    
+    for i, step in enumerate(steps):
+        count = counts.get(step, 0)
+        left = MARGIN + i * bar_width
+        bar_height = count / tallest * plot_height
+        painter.fillRect(QRectF(left + 1, MARGIN + plot_height - bar_height, max(1, bar_width - 2), bar_height),
+                         theme.color('green' if step >= 0 else 'red', palette=palette))
+        if i % label_every == 0:
+            painter.setPen(theme.color('muted', palette=palette))
+            painter.drawText(QRectF(left, MARGIN + plot_height, bar_width * label_every, LABEL_HEIGHT),
+                             Qt.AlignmentFlag.AlignLeft, f"{step * bucket:g}R")
+
+
+class RHistogram(QWidget):
+    """One bar per R bucket from DatabaseManager.get_r_distribution()"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.buckets = []
+        self.bucket = 0.5
+        self.setMinimumHeight(180)
+        theme.notifier.changed.connect(self.on_theme_changed)
+    
+    def set_buckets(self, buckets, bucket=0.5):
+        self.buckets = buckets
+        self.bucket = bucket
+        self.update()
+    
+    def on_theme_changed(self):
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        paint_r_histogram(painter, self.width(), self.height(), self.buckets, self.bucket,
+                          theme.current_theme())
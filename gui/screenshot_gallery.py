@@ -0,0 +1,118 @@
+"""
+Screenshot Gallery - Browse chart screenshots of all trades
+"""
+
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QListView
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, pyqtSignal
+from PyQt6.QtGui import QPixmap
+from database.db_manager import DatabaseManager
+from gui.query_runner import QueryRunner, LoadingLabel
+from gui.thumbnails import THUMBNAIL_SIZE, get_thumbnail_service
+from gui import theme
+from gui.theme import style
+
+
+class ScreenshotListModel(QAbstractListModel):
+    """Trades with screenshots; thumbnails are requested only when painted"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.trades = []
+        self.rows_by_path = {}
+        self.thumbnails = get_thumbnail_service()
+        self.thumbnails.thumbnail_ready.connect(self.on_thumbnail_ready)
+        
+        self.placeholder = QPixmap(THUMBNAIL_SIZE)
+        self.placeholder.fill(theme.color('raised'))
+        theme.notifier.changed.connect(self.on_theme_changed)
+    
+    def on_theme_changed(self):
+        """Refill the placeholder and repaint the rows still showing it"""
+        self.placeholder.fill(theme.color('raised'))
+        if self.trades:
+            self.dataChanged.emit(self.index(0), self.index(len(self.trades) - 1),
+                                  [Qt.ItemDataRole.DecorationRole])
+    
+    def set_trades(self, trades):
+        self.beginResetModel()
+        self.trades = trades
+        self.rows_by_path = {}
+        for row, trade in enumerate(trades):
+            self.rows_by_path.setdefault(trade['screenshot_path'], []).append(row)
+        self.endResetModel()
+    
+    def trade_id(self, row):
+        return self.trades[row]['id']
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.trades)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        trade = self.trades[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{trade['date']}  {trade['pair']}  {trade['outcome'].title()}"
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.thumbnails.pixmap(trade['screenshot_path']) or self.placeholder
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return trade['screenshot_path']
+        return None
+    
+    def on_thumbnail_ready(self, path):
+        for row in self.rows_by_path.get(path, []):
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+
+class ScreenshotGallery(QDialog):
+    """Grid of trade screenshots; double-click opens the trade in the journal"""
+    
+    trade_activated = pyqtSignal(int)
+    
+    def __init__(self, queries: QueryRunner, parent=None):
+        super().__init__(parent)
+        self.queries = queries
+        self.setWindowTitle("Screenshot Gallery")
+        self.resize(1100, 750)
+        
+        layout = QVBoxLayout(self)
+        
+        header_layout = QHBoxLayout()
+        self.count_label = QLabel("")
+        style(self.count_label, accent="muted")
+        header_layout.addWidget(self.count_label)
+        header_layout.addStretch()
+        header_layout.addWidget(LoadingLabel(self.queries, "gallery"))
+        layout.addLayout(header_layout)
+        
+        self.model = ScreenshotListModel(self)
+        self.view = QListView()
+        self.view.setViewMode(QListView.ViewMode.IconMode)
+        self.view.setMovement(QListView.Movement.Static)
+        self.view.setResizeMode(QListView.ResizeMode.Adjust)
+        # Batched layout and uniform sizes keep thousands of items cheap
+        self.view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.view.setUniformItemSizes(True)
+        self.view.setIconSize(THUMBNAIL_SIZE)
+        self.view.setGridSize(QSize(THUMBNAIL_SIZE.width() + 20, THUMBNAIL_SIZE.height() + 40))
+        self.view.setModel(self.model)
+        self.view.doubleClicked.connect(self.on_double_clicked)
+        layout.addWidget(self.view)
+    
+    def refresh(self):
+        """Reload the list of screenshots in the background"""
+        self.queries.submit("gallery:trades", DatabaseManager.get_screenshot_trades,
+                            on_result=self.show_trades)
+    
+    def show_trades(self, trades):
+        self.model.set_trades(trades)
+        self.count_label.setText(f"{len(trades)} screenshot(s)")
+    
+    def on_double_clicked(self, index):
+        self.trade_activated.emit(self.model.trade_id(index.row()))
+    
+    def hideEvent(self, event):
+        self.queries.cancel_group("gallery")
+        super().hideEvent(event)
@@ -0,0 +1,341 @@
+"""
+Theme - One stylesheet for every widget, in a dark and a light palette
+
+Widgets don't carry their own CSS. They get an object name for their role
+(title, hint, card, ...) plus dynamic properties for what varies (accent,
+variant, tint, fill), and the rules for those live here, compiled once per
+palette. Role rules are keyed by object name because Qt indexes id
+selectors, so a widget is only matched against the rules for its own role.
+
+The sheet is installed on the main window, which parents every tab and
+dialog; switching theme swaps that single sheet. (On the QApplication, Qt
+re-polishes every parentless widget again when it is added to a layout,
+which costs more than the per-widget sheets it replaces.) Colors set on
+table items, returned by models or drawn by painted widgets can't come from
+a sheet, so they use color() and re-read it when notifier.changed fires.
+The paint_* helpers take the palette name, so reports paint the same in
+any theme.
+"""
+
+from string import Template
+from typing import Dict
+
+from PyQt6.QtCore import QObject, QSettings, Qt, pyqtSignal
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QWidget
+
+THEMES = ('dark', 'light')
+DEFAULT_THEME = 'dark'
+SETTINGS_KEY = "appearance/theme"
+
+PALETTES = {
+    'dark': {
+        'window': "#0f172a", 'surface': "#1e293b", 'raised': "#334155", 'hover': "#475569",
+        'border': "#475569", 'handle_hover': "#64748b",
+        'text': "#e2e8f0", 'text_strong': "#f1f5f9", 'text_soft': "#cbd5e1",
+        'muted': "#94a3b8", 'faint': "#64748b",
+        'header_start': "#1e293b", 'header_end': "#334155",
+        'blue': "#3b82f6", 'blue_hover': "#2563eb", 'blue_pressed': "#1d4ed8", 'sky': "#60a5fa",
+        'green': "#10b981", 'green_hover': "#059669",
+        'amber': "#fbbf24", 'orange': "#f59e0b", 'orange_hover': "#d97706",
+        'red': "#dc2626", 'red_hover': "#b91c1c",
+        'purple': "#a78bfa", 'violet': "#8b5cf6", 'violet_hover': "#7c3aed",
+        'cyan': "#0891b2", 'cyan_hover': "#0e7490", 'slate': "#64748b",
+        'amber_bg': "#422006", 'amber_fg': "#fbbf24",
+        'orange_bg': "#7c2d12", 'orange_fg': "#fb923c",
+        'red_bg': "#7f1d1d", 'red_fg': "#fca5a5",
+        'green_bg': "#14532d", 'green_fg': "#86efac",
+        'disabled_bg': "#475569", 'disabled_fg': "#64748b",
+    },
+    'light': {
+        'window': "#f1f5f9", 'surface': "#ffffff", 'raised': "#e2e8f0", 'hover': "#cbd5e1",
+        'border': "#cbd5e1", 'handle_hover': "#94a3b8",
+        'text': "#0f172a", 'text_strong': "#020617", 'text_soft': "#334155",
+        'muted': "#475569", 'faint': "#64748b",
+        'header_start': "#e2e8f0", 'header_end': "#f8fafc",
+        'blue': "#2563eb", 'blue_hover': "#1d4ed8", 'blue_pressed': "#1e40af", 'sky': "#1d4ed8",
+        'green': "#059669", 'green_hover': "#047857",
+        'amber': "#b45309", 'orange': "#d97706", 'orange_hover': "#b45309",
+        'red': "#dc2626", 'red_hover': "#b91c1c",
+        'purple': "#7c3aed", 'violet': "#7c3aed", 'violet_hover': "#6d28d9",
+        'cyan': "#0891b2", 'cyan_hover': "#0e7490", 'slate': "#94a3b8",
+        'amber_bg': "#fef3c7", 'amber_fg': "#92400e",
+        'orange_bg': "#ffedd5", 'orange_fg': "#9a3412",
+        'red_bg': "#fee2e2", 'red_fg': "#991b1b",
+        'green_bg': "#dcfce7", 'green_fg': "#166534",
+        'disabled_bg': "#e2e8f0", 'disabled_fg': "#94a3b8",
+    },
+}
+
+# Values of the `accent` property and the palette color each one uses
+ACCENTS = {
+    'blue': 'blue', 'sky': 'sky', 'green': 'green', 'amber': 'amber', 'orange': 'orange',
+    'red': 'red', 'purple': 'purple', 'violet': 'violet', 'slate': 'slate',
+    'muted': 'muted', 'text': 'text',
+}
+# Card frames: border color and title color per accent
+CARD_ACCENTS = {
+    'blue': ('blue', 'sky'), 'slate': ('slate', 'muted'), 'green': ('green', 'green'),
+    'purple': ('purple', 'purple'), 'amber': ('amber', 'amber'),
+}
+# Filled buttons: background, hover and font weight per variant
+BUTTON_VARIANTS = {
+    'success': ('green', 'green_hover', 'bold'), 'warning': ('orange', 'orange_hover', 'bold'),
+    'danger': ('red', 'red_hover', '500'), 'violet': ('violet', 'violet_hover', 'bold'),
+    'cyan': ('cyan', 'cyan_hover', 'bold'),
+}
+# Tinted chips: background and text per tint
+TINTS = ('amber', 'orange', 'red', 'green')
+# Hour blocks and legend swatches are tinted with the macro schedule's own colors
+SCHEDULE_COLORS = ("#fbbf24", "#dc2626", "#ef4444", "#10b981", "#3b82f6", "#8b5cf6", "#6b7280")
+
+BASE_SHEET = Template("""
+QMainWindow, QDialog { background-color: $window; }
+QTabWidget::pane { border: none; background-color: $surface; }
+QTabBar::tab {
+    background-color: $raised; color: $muted; padding: 12px 24px; margin-right: 2px;
+    border-top-left-radius: 6px; border-top-right-radius: 6px; font-size: 14px; font-weight: 500;
+}
+QTabBar::tab:selected { background-color: $surface; color: $blue; border-bottom: 2px solid $blue; }
+QTabBar::tab:hover { background-color: $hover; color: $text; }
+QStatusBar { background-color: $surface; color: $muted; border-top: 1px solid $raised; }
+QPushButton {
+    background-color: $blue; color: white; border: none; padding: 10px 20px;
+    border-radius: 6px; font-size: 14px; font-weight: 500;
+}
+QPushButton:hover { background-color: $blue_hover; }
+QPushButton:pressed { background-color: $blue_pressed; }
+QPushButton:disabled { background-color: $disabled_bg; color: $disabled_fg; }
+QLineEdit, QTextEdit, QComboBox, QSpinBox, QDoubleSpinBox, QDateEdit, QTimeEdit {
+    background-color: $raised; color: $text; border: 1px solid $border;
+    border-radius: 6px; padding: 8px; font-size: 13px;
+}
+QLineEdit:focus, QTextEdit:focus, QComboBox:focus { border: 1px solid $blue; }
+QLabel { color: $text; font-size: 13px; }
+QCheckBox { color: $text; }
+QScrollArea { background-color: transparent; }
+QScrollArea > QWidget#qt_scrollarea_viewport > QWidget { background-color: transparent; }
+QListWidget, QTreeWidget, QTableView {
+    background-color: $surface; color: $text; border: 1px solid $raised;
+    border-radius: 6px; font-size: 13px;
+}
+QListWidget::item, QTreeWidget::item { padding: 8px; border-bottom: 1px solid $raised; }
+QListWidget::item:selected, QTreeWidget::item:selected { background-color: $blue; color: white; }
+QListWidget::item:hover, QTreeWidget::item:hover { background-color: $raised; }
+QScrollBar:vertical { background-color: $surface; width: 12px; border-radius: 6px; }
+QScrollBar::handle:vertical { background-color: $border; border-radius: 6px; min-height: 20px; }
+QScrollBar::handle:vertical:hover { background-color: $handle_hover; }
+QScrollBar:horizontal { background-color: $surface; height: 12px; border-radius: 6px; }
+QScrollBar::handle:horizontal { background-color: $border; border-radius: 6px; min-width: 20px; }
+QScrollBar::add-line, QScrollBar::sub-line { border: none; background: none; }
+QComboBox::drop-down, QDateEdit::drop-down { border: none; padding-right: 10px; }
+QComboBox::down-arrow, QDateEdit::down-arrow {
+    image: none; border-left: 5px solid transparent; border-right: 5px solid transparent;
+    border-top: 5px solid $muted; margin-right: 5px;
+}
+QComboBox QAbstractItemView {
+    background-color: $raised; color: $text; selection-background-color: $blue; border: 1px solid $border;
+}
+QGroupBox {
+    color: $text; border: 1px solid $border; border-radius: 6px;
+    margin-top: 12px; font-weight: 500; padding-top: 10px;
+}
+QGroupBox::title { subcontrol-origin: margin; left: 10px; padding: 0 5px; }
+QTableView { gridline-color: $raised; }
+QTableView::item { padding: 5px; }
+QTableView::item:selected { background-color: $blue; }
+QHeaderView::section {
+    background-color: $raised; color: $text; padding: 8px; border: none;
+    border-right: 1px solid $border; border-bottom: 1px solid $border; font-weight: 600;
+}
+
+/* Application header */
+QWidget#appHeader {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 $header_start, stop:1 $header_end);
+    border-bottom: 2px solid $blue;
+}
+QLabel#appTitle { font-size: 28px; font-weight: bold; color: $text_strong; background: transparent; }
+QLabel#appSubtitle { font-size: 14px; color: $muted; background: transparent; }
+QLabel#appVersion { font-size: 12px; color: $faint; background: transparent; }
+QPushButton#themeToggle { background-color: $raised; color: $text; padding: 6px 12px; font-size: 13px; }
+QPushButton#themeToggle:hover { background-color: $hover; }
+
+/* Label roles */
+QLabel#title { font-size: 28px; font-weight: bold; }
+QLabel#titleSmall { font-size: 24px; font-weight: bold; }
+QLabel#headingLarge { font-size: 22px; font-weight: bold; margin-bottom: 5px; }
+QLabel#heading { font-size: 18px; font-weight: bold; margin-bottom: 10px; }
+QLabel#fieldTitle { font-size: 13px; font-weight: bold; }
+QLabel#fieldLabel { font-size: 14px; font-weight: 500; margin-left: 10px; }
+QLabel#hint { color: $muted; font-size: 12px; }
+QLabel#caption { color: $muted; font-size: 13px; }
+QLabel#intro {
+    color: $muted; font-size: 13px; margin-bottom: 10px; padding: 10px;
+    background-color: $surface; border-radius: 6px;
+}
+QLabel#listItem { color: $faint; font-size: 13px; padding: 2px; }
+QLabel#loading { color: $orange; font-size: 12px; }
+QLabel#placeholder { color: $muted; font-size: 16px; }
+QLabel#body { padding: 15px; }
+QLabel#details { color: $text_soft; font-size: 12px; font-weight: normal; padding: 5px; }
+QLabel#callout {
+    background-color: $amber_bg; color: $amber_fg; padding: 15px; border-radius: 6px;
+    border-left: 4px solid $amber; font-size: 12px;
+}
+QLabel#principles { color: $amber; font-size: 13px; padding: 10px; }
+QLabel#clock {
+    font-size: 18px; font-weight: bold; color: $green; background-color: $surface;
+    padding: 10px 20px; border-radius: 8px; border: 2px solid $green;
+}
+QLabel#result {
+    font-size: 18px; font-weight: bold; padding: 15px;
+    background-color: $raised; border-radius: 8px;
+}
+QLabel#chip, QLabel#chipStrong { padding: 4px; border-radius: 3px; font-size: 11px; }
+QLabel#chipStrong { font-weight: bold; }
+QLabel#chipLarge { padding: 8px; border-radius: 4px; }
+QLabel#legend { padding: 4px 8px; border-radius: 4px; font-size: 11px; }
+QLabel#hour { color: $text; font-size: 10px; font-weight: bold; background: transparent; }
+
+/* Stat cards */
+QWidget#statCard, QLabel#statValue, QLabel#statDesc {
+    background-color: $raised; border-radius: 8px; padding: 15px;
+}
+QLabel#statValue { font-size: 32px; font-weight: bold; }
+QLabel#statDesc { font-size: 13px; color: $muted; }
+
+/* Frames */
+QFrame#separator { background-color: $border; margin: 8px 0; }
+QFrame#inset { background-color: $surface; border: 1px solid $border; border-radius: 6px; padding: 10px; }
+QFrame#hourBlock { border: 1px solid $border; border-radius: 3px; background-color: $raised; }
+QFrame#hourBlock:hover { border: 2px solid $amber; }
+
+/* Group boxes */
+QGroupBox#card {
+    font-size: 15px; font-weight: bold; border: 2px solid $blue; border-radius: 8px;
+    margin-top: 10px; padding-top: 15px; background-color: $surface;
+}
+QGroupBox#panel {
+    font-size: 16px; font-weight: bold; border: 2px solid $green; border-radius: 8px;
+    padding: 15px; margin-top: 10px; background-color: $surface;
+}
+QGroupBox#banner {
+    font-size: 16px; font-weight: bold; color: $amber; background-color: $amber_bg;
+    border: 2px solid $amber; border-radius: 8px; padding: 15px; margin-top: 10px;
+}
+QGroupBox#banner::title { subcontrol-origin: margin; left: 15px; padding: 0 5px; }
+QGroupBox#section { font-size: 16px; font-weight: bold; }
+QGroupBox#checklist { font-weight: bold; color: $sky; }
+QGroupBox#checklist QCheckBox { font-weight: normal; padding: 5px; }
+
+/* Text areas */
+QTextEdit#notes {
+    background-color: $window; border: 1px solid $border; border-radius: 4px; padding: 8px; font-size: 12px;
+}
+QTextEdit#analysis { background-color: $surface; padding: 10px; }
+
+/* Buttons */
+QPushButton[scale="large"] { font-size: 16px; font-weight: bold; }
+QPushButton[variant="link"], QPushButton[variant="link"]:checked {
+    background-color: transparent; color: $muted; text-align: left; font-size: 13px; padding: 5px;
+}
+QPushButton[variant="link"]:hover { color: $sky; background-color: transparent; }
+""")
+
+
+def build_stylesheet(palette: Dict[str, str]) -> str:
+    """The full application sheet for one palette"""
+    rules = [BASE_SHEET.substitute(palette)]
+    
+    for accent, token in ACCENTS.items():
+        rules.append(f'QLabel[accent="{accent}"], QGroupBox[accent="{accent}"] {{ color: {palette[token]}; }}')
+    
+    for accent, (border, title) in CARD_ACCENTS.items():
+        rules.append(f'QGroupBox#card[accent="{accent}"], QGroupBox#panel[accent="{accent}"] '
+                     f'{{ border-color: {palette[border]}; color: {palette[title]}; }}')
+        rules.append(f'QGroupBox#card[accent="{accent}"]::title {{ color: {palette[title]}; }}')
+    
+    for variant, (background, hover, weight) in BUTTON_VARIANTS.items():
+        rules.append(f'QPushButton[variant="{variant}"] {{ background-color: {palette[background]}; '
+                     f'font-weight: {weight}; }}')
+        rules.append(f'QPushButton[variant="{variant}"]:hover {{ background-color: {palette[hover]}; }}')
+    
+    for tint in TINTS:
+        rules.append(f'QLabel[tint="{tint}"] {{ background-color: {palette[tint + "_bg"]}; '
+                     f'color: {palette[tint + "_fg"]}; }}')
+    
+    for color in SCHEDULE_COLORS:
+        rules.append(f'QFrame#hourBlock[fill="{color}"] {{ background-color: {color}; }}')
+        rules.append(f'QLabel#legend[fill="{color}"] {{ background-color: {color}22; color: {color}; }}')
+    
+    return "\n".join(rules)
+
+
+class ThemeNotifier(QObject):
+    """Announces theme switches to code that sets colors outside the stylesheet"""
+    changed = pyqtSignal(str)
+
+
+notifier = ThemeNotifier()
+
+_current_theme = DEFAULT_THEME
+_stylesheets: Dict[str, str] = {}
+_colors: Dict[tuple, QColor] = {}
+
+
+def current_theme() -> str:
+    return _current_theme
+
+
+def color(token: str, alpha: int = 255, palette: str = None) -> QColor:
+    """Shared QColor for a palette entry of a theme (the active one by default), optionally translucent"""
+    palette = palette or _current_theme
+    key = (palette, token, alpha)
+    value = _colors.get(key)
+    if value is None:
+        value = _colors[key] = QColor(PALETTES[palette][token])
+        value.setAlpha(alpha)
+    return value
+
+
+def saved_theme() -> str:
+    theme = QSettings().value(SETTINGS_KEY, DEFAULT_THEME)
+    return theme if theme in THEMES else DEFAULT_THEME
+
+
+def apply_theme(window: QWidget, theme: str = None, save: bool = False):
+    """Install the (cached) sheet for a theme on the top-level window"""
+    global _current_theme
+    theme = theme or saved_theme()
+    if theme not in _stylesheets:
+        _stylesheets[theme] = build_stylesheet(PALETTES[theme])
+    changed = theme != _current_theme
+    _current_theme = theme
+    window.setStyleSheet(_stylesheets[theme])
+    if save:
+        QSettings().setValue(SETTINGS_KEY, theme)
+    if changed:
+        notifier.changed.emit(theme)
+
+
+def toggle_theme(window: QWidget) -> str:
+    """Switch between dark and light; returns the new theme"""
+    theme = 'light' if _current_theme == 'dark' else 'dark'
+    apply_theme(window, theme, save=True)
+    return theme
+
+
+def style(widget: QWidget, role: str = None, **properties) -> QWidget:
+    """Set a widget's role (its object name) and styling properties; re-polishes only this widget, and only on a change"""
+    changed = False
+    if role and widget.objectName() != role:
+        widget.setObjectName(role)
+        changed = True
+    for name, value in properties.items():
+        if widget.property(name) != value:
+            widget.setProperty(name, value)
+            changed = True
+    # polish() drops the widget's cached style rules itself, so no unpolish() round trip is needed
+    if changed and widget.testAttribute(Qt.WidgetAttribute.WA_WState_Polished):
+        widget.style().polish(widget)
+    return widget
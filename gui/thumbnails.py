@@ -0,0 +1,222 @@
+"""
+Thumbnails - Off-thread screenshot decoding with a size-bounded disk cache
+"""
+
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QSize, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader, QPixmap
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+
+THUMBNAIL_SIZE = QSize(240, 160)
+CACHE_DIR = "thumbnail_cache"
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+MEMORY_ITEMS = 300
+HASH_CHUNK = 1024 * 1024
+
+
+class ThumbnailDiskCache:
+    """PNG thumbnails keyed by a hash of the source image's contents
+    
+    The same chart attached from two places shares one entry, and an image
+    overwritten in place gets a new one. Entries are touched on every hit so
+    eviction drops the least recently used files first.
+    """
+    
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.keys = {}
+        self.total_bytes = None
+    
+    def content_key(self, path):
+        """Hash of the file contents, remembered per (path, size, mtime)"""
+        stat = os.stat(path)
+        stamp = (path, stat.st_size, stat.st_mtime_ns)
+        with self.lock:
+            key = self.keys.get(stamp)
+        if key is None:
+            # Hashed outside the lock so other workers aren't held up by file reads
+            digest = hashlib.blake2b(digest_size=16)
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+                    digest.update(chunk)
+            key = f"{digest.hexdigest()}_{THUMBNAIL_SIZE.width()}x{THUMBNAIL_SIZE.height()}"
+            with self.lock:
+                self.keys[stamp] = key
+        return key
+    
+    def entry_path(self, key):
+        return os.path.join(self.directory, key + ".png")
+    
+    def load(self, key):
+        """Cached thumbnail or None"""
+        path = self.entry_path(key)
+        image = QImage(path)
+        if image.isNull():
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return image
+    
+    def store(self, key, image):
+        """Write a thumbnail atomically, then evict down to the size limit"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.entry_path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        if not image.save(temp_path, "PNG"):
+            return
+        
+        with self.lock:
+            # A rewritten entry replaces its old file, so only the difference counts
+            try:
+                old_size = os.path.getsize(path)
+            except OSError:
+                old_size = 0
+            os.replace(temp_path, path)
+            if self.total_bytes is None:
+                self.total_bytes = sum(size for _, size, _ in self.entries())
+            else:
+                self.total_bytes += os.path.getsize(path) - old_size
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+    
+    def entries(self):
+        """(path, size, last used) for every cached thumbnail"""
+        result = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".png"):
+                stat = entry.stat()
+                result.append((entry.path, stat.st_size, stat.st_mtime))
+        return result
+    
+    def evict(self):
+        """Remove least recently used thumbnails until 90% of the limit is free"""
+        target = self.max_bytes * 0.9
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self.total_bytes = total
+
+
+class ThumbnailSignals(QObject):
+    loaded = pyqtSignal(str, QImage)
+    failed = pyqtSignal(str)
+
+
+class ThumbnailTask(QRunnable):
+    """Decode one screenshot straight to thumbnail size on a pool thread"""
+    
+    def __init__(self, path, cache, signals):
+        super().__init__()
+        self.path = path
+        self.cache = cache
+        self.signals = signals
+    
+    def run(self):
+        try:
+            key = self.cache.content_key(self.path)
+        except OSError:
+            self.signals.failed.emit(self.path)
+            return
+        
+        image = self.cache.load(key)
+        if image is None:
+            reader = QImageReader(self.path)
+            reader.setAutoTransform(True)
+            size = reader.size()
+            # Let the decoder downscale (JPEG decodes at 1/2, 1/4, 1/8 directly)
+            if size.isValid():
+                reader.setScaledSize(size.scaled(THUMBNAIL_SIZE, Qt.AspectRatioMode.KeepAspectRatio))
+            image = reader.read()
+            if image.isNull():
+                self.signals.failed.emit(self.path)
+                return
+            if image.width() > THUMBNAIL_SIZE.width() or image.height() > THUMBNAIL_SIZE.height():
+                image = image.scaled(THUMBNAIL_SIZE, Qt.AspectRatioMode.KeepAspectRatio,
+                                     Qt.TransformationMode.SmoothTransformation)
+            self.cache.store(key, image)
+        
+        self.signals.loaded.emit(self.path, image)
+
+
+class ThumbnailService(QObject):
+    """Hands out thumbnail pixmaps without ever decoding on the GUI thread
+    
+    pixmap() returns immediately: either a ready pixmap or None, in which case
+    the image is queued and thumbnail_ready fires with its path once loaded.
+    """
+    
+    thumbnail_ready = pyqtSignal(str)
+    
+    def __init__(self, cache: ThumbnailDiskCache = None, parent=None):
+        super().__init__(parent)
+        self.cache = cache or ThumbnailDiskCache()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self.memory = OrderedDict()
+        self.in_flight = set()
+        self.failed = set()
+        self.requests = 0
+        
+        self.signals = ThumbnailSignals()
+        self.signals.loaded.connect(self.on_loaded)
+        self.signals.failed.connect(self.on_failed)
+    
+    def pixmap(self, path):
+        """Thumbnail for a screenshot path, or None while it is loading"""
+        if not path:
+            return None
+        pixmap = self.memory.get(path)
+        if pixmap is not None:
+            self.memory.move_to_end(path)
+            return pixmap
+        if path not in self.in_flight and path not in self.failed:
+            self.in_flight.add(path)
+            # Newest requests first, so whatever is on screen now wins over
+            # rows the user already scrolled past
+            self.requests += 1
+            self.pool.start(ThumbnailTask(path, self.cache, self.signals), self.requests)
+        return None
+    
+    def forget(self, path):
+        """Drop a path so the next request re-reads the file"""
+        self.memory.pop(path, None)
+        self.failed.discard(path)
+    
+    def on_loaded(self, path, image):
+        self.in_flight.discard(path)
+        self.memory[path] = QPixmap.fromImage(image)
+        while len(self.memory) > MEMORY_ITEMS:
+            self.memory.popitem(last=False)
+        self.thumbnail_ready.emit(path)
+    
+    def on_failed(self, path):
+        self.in_flight.discard(path)
+        self.failed.add(path)
+        self.thumbnail_ready.emit(path)
+    
+    def shutdown(self, timeout_ms=2000):
+        self.pool.clear()
+        self.pool.waitForDone(timeout_ms)
+
+
+_service = None
+
+def get_thumbnail_service() -> ThumbnailService:
+    """Shared thumbnail service (created on first use, needs a QApplication)"""
+    global _service
+    if _service is None:
+        _service = ThumbnailService()
+    return _service
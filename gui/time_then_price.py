@@ -4,19 +4,74 @@ Time Then Price Tab - ICT Algorithmic Macro Times Analysis
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                             QScrollArea, QGroupBox, QFrame, QTableWidget,
-                            QTableWidgetItem, QHeaderView, QSplitter)
-from PyQt6.QtCore import Qt, QTimer, QTime, QDate, QDateTime
+                            QTableWidgetItem, QHeaderView, QSplitter, QComboBox)
+from PyQt6.QtCore import Qt, QTimer, QEvent
 from PyQt6.QtGui import QColor, QFont
 from database.db_manager import DatabaseManager
+from gui.query_runner import QueryRunner, LoadingLabel
+from gui import theme
+from gui.theme import style
+from analysis.macro_schedule import get_schedule, DAY_NAMES, TRADING_DAYS, HOURLY_MACRO
+from analysis.session_calendar import get_calendar, KILLZONE_BY_MINUTE
+from analysis.labeling import MACRO_WINDOW_BY_MINUTE
+from analysis.macro_stats import MacroStatsEngine, KIND_COLUMNS, lookup_window
 import datetime
 
+_colors = {}
+
+
+def get_color(name):
+    """Shared QColor instance for a color name"""
+    color = _colors.get(name)
+    if color is None:
+        color = _colors[name] = QColor(name)
+    return color
+
+
+def load_window_stats(db: DatabaseManager, engine: MacroStatsEngine, symbol: str, timeframe: str):
+    """Bring a series' window statistics up to date, on a query worker thread
+    
+    Labels new bars and folds new trading days into the occurrence table
+    (derived data only), then returns the aggregated stats for every kind.
+    """
+    engine.update(symbol, timeframe)
+    return {kind: engine.stats(symbol, timeframe, kind) for kind in KIND_COLUMNS}
+
+
 class TimeThenPriceTab(QWidget):
-    def __init__(self, db: DatabaseManager):
+    COUNTDOWN_ROWS = 5
+    ACTIVE_TICK_MS = 1000
+    IDLE_TICK_MS = 30000
+    
+    def __init__(self, db: DatabaseManager, queries: QueryRunner):
         super().__init__()
         self.db = db
+        self.queries = queries
+        self.schedule = get_schedule()
+        self.calendar = get_calendar()
+        self.macro_stats = MacroStatsEngine(db)
+        # Stats of the selected series by kind, once its background load finishes
+        self.window_stats = None
         self.init_ui()
+        self.apply_item_colors()
         self.setup_countdown_timer()
-        
+        theme.notifier.changed.connect(self.on_theme_changed)
+    
+    def on_theme_changed(self):
+        """Recolor the items the stylesheet doesn't reach"""
+        self.apply_item_colors()
+        for row in self.countdown_rows:
+            row['state'].pop('urgency', None)
+        self.update_countdown()
+    
+    def apply_item_colors(self):
+        """Palette colors for the reference table and the stats column"""
+        for item, tone in self.reference_items:
+            item.setBackground(theme.color(tone, 0x22))
+            item.setForeground(theme.color(tone + '_fg'))
+        for row in self.countdown_rows:
+            row['stats'].setForeground(theme.color('muted'))
+    
     def init_ui(self):
         """Initialize the Time Then Price interface"""
         layout = QVBoxLayout(self)
@@ -27,22 +82,14 @@ class TimeThenPriceTab(QWidget):
         header_layout = QHBoxLayout()
         
         title = QLabel("⏰ TIME THEN PRICE - Algorithmic Macro Times")
-        title.setStyleSheet("font-size: 28px; font-weight: bold; color: #fbbf24;")
+        style(title, role="title", accent="amber")
         header_layout.addWidget(title)
         
         header_layout.addStretch()
         
         # Current time display
         self.current_time_label = QLabel()
-        self.current_time_label.setStyleSheet("""
-            font-size: 18px;
-            font-weight: bold;
-            color: #10b981;
-            background-color: #1e293b;
-            padding: 10px 20px;
-            border-radius: 8px;
-            border: 2px solid #10b981;
-        """)
+        style(self.current_time_label, role="clock")
         header_layout.addWidget(self.current_time_label)
         
         layout.addLayout(header_layout)
@@ -64,27 +111,11 @@ class TimeThenPriceTab(QWidget):
         
         splitter.setSizes([800, 400])
         layout.addWidget(splitter)
-        
+    
     def create_key_principles(self):
         """Create key principles section"""
         group = QGroupBox("🎯 KEY PRINCIPLES - TIME THEN PRICE")
-        group.setStyleSheet("""
-            QGroupBox {
-                font-size: 16px;
-                font-weight: bold;
-                color: #fbbf24;
-                background-color: #422006;
-                border: 2px solid #fbbf24;
-                border-radius: 8px;
-                padding: 15px;
-                margin-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 5px;
-            }
-        """)
+        style(group, role="banner")
         
         layout = QVBoxLayout()
         
@@ -97,12 +128,7 @@ class TimeThenPriceTab(QWidget):
             "• The algorithm operates on schedule - learn it, respect it, profit from it"
         )
         principles_text.setWordWrap(True)
-        principles_text.setStyleSheet("""
-            color: #fbbf24;
-            font-size: 13px;
-            line-height: 1.8;
-            padding: 10px;
-        """)
+        style(principles_text, role="principles")
         layout.addWidget(principles_text)
         
         group.setLayout(layout)
@@ -115,8 +141,8 @@ class TimeThenPriceTab(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         
         # Title
-        title = QLabel("Weekly Macro Timeline (EST)")
-        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #3b82f6; margin-bottom: 10px;")
+        title = QLabel("Weekly Macro Timeline (New York Time)")
+        style(title, role="heading", accent="blue")
         layout.addWidget(title)
         
         # Scroll area for timelines
@@ -149,35 +175,9 @@ class TimeThenPriceTab(QWidget):
         is_trading_day = day_name not in ["Saturday", "Sunday"]
         
         if is_trading_day:
-            group.setStyleSheet("""
-                QGroupBox {
-                    font-size: 15px;
-                    font-weight: bold;
-                    border: 2px solid #3b82f6;
-                    border-radius: 8px;
-                    margin-top: 10px;
-                    padding-top: 15px;
-                    background-color: #1e293b;
-                }
-                QGroupBox::title {
-                    color: #60a5fa;
-                }
-            """)
+            style(group, role="card", accent="blue")
         else:
-            group.setStyleSheet("""
-                QGroupBox {
-                    font-size: 15px;
-                    font-weight: bold;
-                    border: 2px solid #64748b;
-                    border-radius: 8px;
-                    margin-top: 10px;
-                    padding-top: 15px;
-                    background-color: #1e293b;
-                }
-                QGroupBox::title {
-                    color: #94a3b8;
-                }
-            """)
+            style(group, role="card", accent="slate")
         
         layout = QHBoxLayout()
         
@@ -197,6 +197,7 @@ class TimeThenPriceTab(QWidget):
     def create_hour_block(self, hour, day_name):
         """Create a visual block for one hour with macro indication"""
         block = QFrame()
+        block.setObjectName("hourBlock")
         block.setFixedWidth(30)
         block.setFixedHeight(60)
         
@@ -204,23 +205,11 @@ class TimeThenPriceTab(QWidget):
         macro_info = self.get_macro_for_hour(hour, day_name)
         
         if macro_info:
-            color = macro_info['color']
+            style(block, fill=macro_info['color'])
             tooltip = f"{hour:02d}:00 - {macro_info['name']}\n{macro_info['type']}"
         else:
-            color = "#334155"
             tooltip = f"{hour:02d}:00"
         
-        block.setStyleSheet(f"""
-            QFrame {{
-                background-color: {color};
-                border: 1px solid #475569;
-                border-radius: 3px;
-            }}
-            QFrame:hover {{
-                border: 2px solid #fbbf24;
-            }}
-        """)
-        
         block.setToolTip(tooltip)
         
         # Add hour label
@@ -229,79 +218,33 @@ class TimeThenPriceTab(QWidget):
         
         hour_label = QLabel(f"{hour:02d}")
         hour_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        hour_label.setStyleSheet("color: #e2e8f0; font-size: 10px; font-weight: bold;")
+        style(hour_label, role="hour")
         block_layout.addWidget(hour_label)
         
         return block
     
     def get_macro_for_hour(self, hour, day_name):
         """Determine if a specific hour has a macro event"""
-        is_trading_day = day_name not in ["Saturday", "Sunday"]
+        day = DAY_NAMES.index(day_name)
         
-        # Sunday evening market open
-        if day_name == "Sunday" and hour == 18:
-            return {
-                'name': 'Market Open',
-                'type': 'Weekly Open',
-                'color': '#10b981'
-            }
-        
-        # Friday afternoon market close
-        if day_name == "Friday" and hour == 17:
-            return {
-                'name': 'Market Close',
-                'type': 'Weekly Close',
-                'color': '#6b7280'
-            }
-        
-        if not is_trading_day:
+        # Sunday evening market open / Friday afternoon market close
+        marker = self.schedule.marker_for_hour(day, hour)
+        if marker:
+            return marker
+        
+        if day not in TRADING_DAYS:
             return None
         
-        # London Killzone (2:00-5:00 AM)
-        if 2 <= hour < 5:
-            return {
-                'name': 'London Killzone',
-                'type': 'Major Killzone',
-                'color': '#dc2626'
-            }
-        
-        # NY AM Killzone (8:30-11:00 AM)
-        if 8 <= hour < 11:
-            return {
-                'name': 'NY AM Killzone',
-                'type': 'Major Killzone',
-                'color': '#dc2626'
-            }
-        
-        # NY Lunch (11:00 AM-2:00 PM)
-        if 11 <= hour < 14:
-            return {
-                'name': 'Lunch Macro',
-                'type': 'Consolidation Period',
-                'color': '#3b82f6'
-            }
-        
-        # NY PM Killzone (1:00-4:00 PM)
-        if 13 <= hour < 16:
-            return {
-                'name': 'NY PM Killzone',
-                'type': 'Major Killzone',
-                'color': '#dc2626'
-            }
-        
-        # Asian Session (midnight-5:00 AM)
-        if 0 <= hour < 5:
-            return {
-                'name': 'Asian Session',
-                'type': 'Range Formation',
-                'color': '#8b5cf6'
-            }
+        # Killzones and sessions take priority over the hourly macro
+        window = self.schedule.window_for_hour(day, hour)
+        if window:
+            return window
         
         # Regular trading hour
         return {
             'name': f'{hour:02d}:50-{(hour+1)%24:02d}:10',
-            'type': '20min Macro',
-            'color': '#fbbf24'
+            'type': HOURLY_MACRO['type'],
+            'color': HOURLY_MACRO['color']
         }
     
     def create_right_panel(self):
@@ -323,33 +266,61 @@ class TimeThenPriceTab(QWidget):
     def create_countdown_section(self):
         """Create countdown timer for next 5 macros"""
         group = QGroupBox("⏱️ Next 5 Macros")
-        group.setStyleSheet("""
-            QGroupBox {
-                font-size: 16px;
-                font-weight: bold;
-                color: #10b981;
-                border: 2px solid #10b981;
-                border-radius: 8px;
-                padding: 15px;
-                margin-top: 10px;
-                background-color: #1e293b;
-            }
-        """)
+        style(group, role="panel", accent="green")
         
         layout = QVBoxLayout()
         
+        # Bar series used for the historical window statistics column
+        series_layout = QHBoxLayout()
+        series_label = QLabel("Stats from:")
+        style(series_label, role="hint")
+        series_layout.addWidget(series_label)
+        self.stats_series_input = QComboBox()
+        series_layout.addWidget(self.stats_series_input, 1)
+        series_layout.addWidget(LoadingLabel(self.queries, "ttp"))
+        layout.addLayout(series_layout)
+        
         # Countdown table
         self.countdown_table = QTableWidget()
-        self.countdown_table.setColumnCount(3)
-        self.countdown_table.setHorizontalHeaderLabels(["Macro Name", "Time (EST)", "Countdown"])
-        self.countdown_table.setRowCount(5)
+        self.countdown_table.setColumnCount(4)
+        self.countdown_table.setHorizontalHeaderLabels(["Macro Name", "Time (ET)", "Countdown", "History"])
+        self.countdown_table.setRowCount(self.COUNTDOWN_ROWS)
         
         self.countdown_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.countdown_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         self.countdown_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        self.countdown_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
         
         self.countdown_table.setMaximumHeight(200)
         
+        # Items, font and alignment are created once; ticks only update what changed
+        countdown_font = QFont("Courier New", 11, QFont.Weight.Bold)
+        self.countdown_rows = []
+        for row in range(self.COUNTDOWN_ROWS):
+            name_item = QTableWidgetItem()
+            time_item = QTableWidgetItem()
+            time_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            countdown_item = QTableWidgetItem()
+            countdown_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            countdown_item.setFont(countdown_font)
+            stats_item = QTableWidgetItem()
+            
+            self.countdown_table.setItem(row, 0, name_item)
+            self.countdown_table.setItem(row, 1, time_item)
+            self.countdown_table.setItem(row, 2, countdown_item)
+            self.countdown_table.setItem(row, 3, stats_item)
+            
+            self.countdown_rows.append({
+                'name': name_item,
+                'time': time_item,
+                'countdown': countdown_item,
+                'stats': stats_item,
+                'state': {}
+            })
+        
+        self.load_stats_series()
+        self.stats_series_input.currentIndexChanged.connect(self.on_stats_series_changed)
+        
         layout.addWidget(self.countdown_table)
         
         group.setLayout(layout)
@@ -358,18 +329,7 @@ class TimeThenPriceTab(QWidget):
     def create_macro_reference(self):
         """Create detailed macro reference table"""
         group = QGroupBox("📋 Macro Reference Guide")
-        group.setStyleSheet("""
-            QGroupBox {
-                font-size: 16px;
-                font-weight: bold;
-                color: #a78bfa;
-                border: 2px solid #a78bfa;
-                border-radius: 8px;
-                padding: 15px;
-                margin-top: 10px;
-                background-color: #1e293b;
-            }
-        """)
+        style(group, role="panel", accent="purple")
         
         layout = QVBoxLayout()
         
@@ -381,7 +341,7 @@ class TimeThenPriceTab(QWidget):
         self.macro_table = QTableWidget()
         self.macro_table.setColumnCount(6)
         self.macro_table.setHorizontalHeaderLabels([
-            "Time (EST)", "Type", "Macro Name", "Expected Behavior", "Volatility (1-10)", "Notes"
+            "Time (ET)", "Type", "Macro Name", "Expected Behavior", "Volatility (1-10)", "Notes"
         ])
         
         # Macro data
@@ -431,6 +391,8 @@ class TimeThenPriceTab(QWidget):
         ]
         
         self.macro_table.setRowCount(len(macro_data))
+        # (item, palette tone) pairs, recolored when the theme changes
+        self.reference_items = []
         
         for row, data in enumerate(macro_data):
             for col, value in enumerate(data):
@@ -444,16 +406,11 @@ class TimeThenPriceTab(QWidget):
                 
                 # Color code by type
                 if "Killzone" in data[1]:
-                    item.setBackground(QColor("#dc262622"))
-                    item.setForeground(QColor("#fca5a5"))
+                    self.reference_items.append((item, 'red'))
                 elif "Macro" in data[1] or "Hourly" in data[1]:
-                    item.setBackground(QColor("#fbbf2422"))
-                    item.setForeground(QColor("#fbbf24"))
+                    self.reference_items.append((item, 'amber'))
                 elif "Setup" in data[1]:
-                    item.setBackground(QColor("#10b98122"))
-                    item.setForeground(QColor("#86efac"))
-                else:
-                    item.setForeground(QColor("#e2e8f0"))
+                    self.reference_items.append((item, 'green'))
                 
                 self.macro_table.setItem(row, col, item)
         
@@ -467,103 +424,187 @@ class TimeThenPriceTab(QWidget):
         return group
     
     def setup_countdown_timer(self):
-        """Setup timer to update countdown every second"""
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_countdown)
-        self.timer.start(1000)  # Update every second
+        """Setup a single-shot timer that ticks on whole-second boundaries"""
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.on_countdown_tick)
+        self.watched_window = None
         
         # Initial update
         self.update_countdown()
+        self.schedule_next_tick()
+    
+    def is_countdown_visible(self):
+        """True when the countdown can actually be seen"""
+        return self.isVisible() and not self.window().isMinimized()
+    
+    def schedule_next_tick(self):
+        """Arm the timer for the next second boundary, or slower while hidden"""
+        interval = self.ACTIVE_TICK_MS if self.is_countdown_visible() else self.IDLE_TICK_MS
+        elapsed_ms = self.calendar.now().microsecond // 1000
+        # Small slack so the tick lands just after the boundary, not before it
+        self.timer.start(interval - elapsed_ms + 5)
+    
+    def on_countdown_tick(self):
+        """Timer callback"""
+        self.update_countdown()
+        self.schedule_next_tick()
+    
+    def showEvent(self, event):
+        """Refresh immediately and return to the fast cadence when shown"""
+        super().showEvent(event)
+        window = self.window()
+        if window is not self.watched_window:
+            # Minimize/restore is only reported to the top-level window
+            window.installEventFilter(self)
+            self.watched_window = window
+        self.on_countdown_tick()
+    
+    def hideEvent(self, event):
+        """Drop to the idle cadence while hidden"""
+        super().hideEvent(event)
+        self.schedule_next_tick()
+    
+    def eventFilter(self, obj, event):
+        """Track minimize/restore of the top-level window"""
+        if obj is self.watched_window and event.type() == QEvent.Type.WindowStateChange:
+            if self.is_countdown_visible():
+                self.on_countdown_tick()
+            else:
+                self.schedule_next_tick()
+        return super().eventFilter(obj, event)
     
     def update_countdown(self):
         """Update countdown timer and current time"""
-        now = QDateTime.currentDateTime()
-        
-        # Update current time display
-        self.current_time_label.setText(
-            f"Current Time (EST): {now.toString('dddd, MMMM d, yyyy  hh:mm:ss AP')}"
-        )
-        
-        # Get next 5 macros
-        next_macros = self.get_next_macros(now, 5)
-        
-        # Update countdown table
-        for row, macro in enumerate(next_macros):
-            # Macro name
-            name_item = QTableWidgetItem(macro['name'])
-            name_item.setForeground(QColor(macro['color']))
-            self.countdown_table.setItem(row, 0, name_item)
+        now = self.calendar.now()
+        
+        # Update current time display (New York time, EST or EDT)
+        time_text = f"Current Time ({now:%Z}): {now:%A, %B} {now.day}, {now:%Y  %I:%M:%S %p}"
+        holiday = self.calendar.holiday_name(now.date())
+        if holiday:
+            time_text += f"  •  {holiday} (Market Closed)"
+        elif self.calendar.early_close_minute(now.date()):
+            time_text += "  •  Early Close 1:00 PM"
+        self.current_time_label.setText(time_text)
+        
+        # Get next macros
+        next_macros = self.get_next_macros(now, self.COUNTDOWN_ROWS)
+        
+        # Update countdown table, touching only cells whose content changed
+        for row, macro in zip(self.countdown_rows, next_macros):
+            state = row['state']
+            seconds_until = macro['seconds_until']
             
-            # Time
-            time_item = QTableWidgetItem(macro['time'].toString('hh:mm AP'))
-            time_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.countdown_table.setItem(row, 1, time_item)
+            if state.get('name') != macro['name']:
+                row['name'].setText(macro['name'])
+                state['name'] = macro['name']
+            
+            if state.get('color') != macro['color']:
+                row['name'].setForeground(get_color(macro['color']))
+                state['color'] = macro['color']
+            
+            if state.get('time') != macro['time']:
+                row['time'].setText(macro['time'].strftime('%I:%M %p'))
+                stats_text, stats_tip = self.format_window_stats(macro)
+                row['stats'].setText(stats_text)
+                row['stats'].setToolTip(stats_tip)
+                state['time'] = macro['time']
             
-            # Countdown
-            seconds_until = now.secsTo(macro['time'])
             countdown_text = self.format_countdown(seconds_until)
-            countdown_item = QTableWidgetItem(countdown_text)
-            countdown_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            countdown_item.setFont(QFont("Courier New", 11, QFont.Weight.Bold))
+            if state.get('countdown') != countdown_text:
+                row['countdown'].setText(countdown_text)
+                state['countdown'] = countdown_text
             
             # Color based on urgency
             if seconds_until < 300:  # Less than 5 minutes
-                countdown_item.setForeground(QColor("#dc2626"))
+                urgency = 'red'
             elif seconds_until < 900:  # Less than 15 minutes
-                countdown_item.setForeground(QColor("#fbbf24"))
+                urgency = 'amber'
             else:
-                countdown_item.setForeground(QColor("#10b981"))
+                urgency = 'green'
             
-            self.countdown_table.setItem(row, 2, countdown_item)
+            if state.get('urgency') != urgency:
+                row['countdown'].setForeground(theme.color(urgency))
+                state['urgency'] = urgency
+    
+    def load_stats_series(self):
+        """List the bar series available for window statistics in the background"""
+        self.queries.submit("ttp:series", DatabaseManager.get_bar_series,
+                            on_result=self.show_stats_series)
+    
+    def show_stats_series(self, series_rows):
+        """Fill the series selector, then load the selected series' statistics"""
+        self.stats_series_input.blockSignals(True)
+        self.stats_series_input.clear()
+        for symbol, timeframe, bar_count in series_rows:
+            self.stats_series_input.addItem(f"{symbol} {timeframe} ({bar_count:,} bars)",
+                                            (symbol, timeframe))
+        if self.stats_series_input.count() == 0:
+            self.stats_series_input.addItem("No bar data imported", None)
+        self.stats_series_input.blockSignals(False)
+        self.on_stats_series_changed()
+    
+    def on_stats_series_changed(self):
+        """Update the selected series' statistics in the background"""
+        self.window_stats = None
+        series = self.stats_series_input.currentData()
+        if series:
+            # Labeling and occurrence rebuilds can take seconds on a large
+            # bar store, so they go to the batch pool
+            self.queries.submit("ttp:stats", load_window_stats, self.macro_stats, *series,
+                                on_result=self.show_window_stats, batch=True)
+        else:
+            self.queries.cancel("ttp:stats")
+        self.refresh_stats_column()
+    
+    def show_window_stats(self, window_stats):
+        self.window_stats = window_stats
+        self.refresh_stats_column()
+    
+    def refresh_stats_column(self):
+        """Redraw the History column on the next countdown update"""
+        for row in self.countdown_rows:
+            row['state'].pop('time', None)
+        if hasattr(self, 'timer'):
+            self.update_countdown()
+    
+    def format_window_stats(self, macro):
+        """Short history summary (and tooltip) for a macro's window"""
+        series = self.stats_series_input.currentData()
+        if not series:
+            return "—", ""
+        if self.window_stats is None:
+            return "…", "Loading history..."
+        
+        time = macro['time']
+        trading_day = self.calendar.trading_day_of(time)
+        if not self.calendar.is_trading_day(trading_day):
+            return "—", "Market closed"
+        weekday = trading_day.weekday()
+        minute = time.hour * 60 + time.minute
+        if macro['type'] == 'hourly':
+            kind, window_id = 'macro', int(MACRO_WINDOW_BY_MINUTE[minute])
+        else:
+            kind, window_id = 'killzone', int(KILLZONE_BY_MINUTE[minute])
+        
+        stats = lookup_window(self.window_stats[kind], window_id, weekday) if window_id else None
+        if not stats:
+            return "—", "Not enough history for this window"
+        
+        text = (f"Rng {stats['median_range']:.2f} | "
+                f"H {stats['high_share']:.0%} L {stats['low_share']:.0%}")
+        tip = (f"{stats['count']} occurrences\n"
+               f"Range: median {stats['median_range']:.2f}, mean {stats['mean_range']:.2f}, "
+               f"90th pct {stats['p90_range']:.2f}\n"
+               f"Displacement: avg {stats['mean_abs_displacement']:.2f}, "
+               f"closed up {stats['up_share']:.0%}\n"
+               f"Day's high set here {stats['high_share']:.0%}, low {stats['low_share']:.0%}")
+        return text, tip
     
     def get_next_macros(self, current_time, count):
-        """Get the next N macro times"""
-        macros = []
-        
-        # Define all recurring macros (in minutes from midnight)
-        hourly_macros = []
-        for hour in range(24):
-            # Each hour has a :50 minute macro (lasts until :10 of next hour)
-            hourly_macros.append({
-                'hour': hour,
-                'minute': 50,
-                'name': f'{hour:02d}:50 Macro',
-                'type': 'hourly',
-                'color': '#fbbf24'
-            })
-        
-        # Specific important macros
-        special_macros = [
-            {'hour': 2, 'minute': 0, 'name': 'London Open', 'type': 'killzone', 'color': '#dc2626'},
-            {'hour': 2, 'minute': 33, 'name': 'London 2:33', 'type': 'specific', 'color': '#dc2626'},
-            {'hour': 3, 'minute': 0, 'name': 'London Hour 2', 'type': 'killzone', 'color': '#dc2626'},
-            {'hour': 8, 'minute': 30, 'name': 'NY Data', 'type': 'news', 'color': '#ef4444'},
-            {'hour': 8, 'minute': 50, 'name': 'NY Open Macro', 'type': 'killzone', 'color': '#dc2626'},
-            {'hour': 9, 'minute': 30, 'name': 'NYSE Open', 'type': 'open', 'color': '#dc2626'},
-            {'hour': 10, 'minute': 0, 'name': 'Silver Bullet Start', 'type': 'setup', 'color': '#10b981'},
-            {'hour': 14, 'minute': 0, 'name': 'PM Power Hour', 'type': 'killzone', 'color': '#dc2626'},
-            {'hour': 16, 'minute': 0, 'name': '4H Close', 'type': 'close', 'color': '#3b82f6'},
-        ]
-        
-        all_macros = hourly_macros + special_macros
-        
-        # Get current day and calculate next occurrences
-        for macro in all_macros:
-            macro_time = QDateTime(current_time.date(), QTime(macro['hour'], macro['minute']))
-            
-            # If this time has passed today, move to tomorrow
-            if macro_time <= current_time:
-                macro_time = macro_time.addDays(1)
-            
-            macros.append({
-                'name': macro['name'],
-                'time': macro_time,
-                'color': macro['color']
-            })
-        
-        # Sort by time and return the next N
-        macros.sort(key=lambda x: x['time'])
-        return macros[:count]
+        """Get the next N macro times from the precompiled schedule"""
+        return self.schedule.next_macros(current_time, count)
     
     def format_countdown(self, seconds):
         """Format seconds into countdown string"""
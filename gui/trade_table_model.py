@@ -0,0 +1,222 @@
+"""
+Trade Table Model - Lazily fetched, lazily formatted journal trade list
+"""
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from database.db_manager import DatabaseManager
+from gui.query_runner import QueryRunner
+from gui import theme
+
+# Palette entries of the active theme
+OUTCOME_COLORS = {
+    'win': 'green',
+    'loss': 'red',
+    'pending': 'orange'
+}
+
+
+class TradeTableModel(QAbstractTableModel):
+    """Journal trades fetched page by page, in the background, as the view scrolls
+
+    Rows hold the raw database values; text and colors are produced in
+    data() only for the cells the view actually paints.
+    """
+    
+    PAGE_KEY = "journal:page"
+    HEADERS = ["Date", "Pair", "Direction", "Entry", "Exit", "P&L", "P&L %",
+               "Outcome", "Setup", "Concepts"]
+    PAGE_SIZE = 200
+    
+    def __init__(self, db: DatabaseManager, queries: QueryRunner, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.queries = queries
+        self.outcome = None
+        self.trades = []
+        self.dates = {}
+        self.exhausted = False
+        theme.notifier.changed.connect(self.on_theme_changed)
+    
+    def on_theme_changed(self):
+        """Repaint the colored cells in the new palette"""
+        if self.trades:
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(len(self.trades) - 1, len(self.HEADERS) - 1),
+                                  [Qt.ItemDataRole.ForegroundRole])
+    
+    def set_outcome_filter(self, outcome):
+        """Filter by outcome (None for all) and start again from the first page"""
+        self.outcome = outcome
+        self.reload()
+    
+    def reload(self):
+        """Drop fetched rows; the view pulls the first page back in on demand"""
+        self.queries.cancel(self.PAGE_KEY)
+        self.beginResetModel()
+        self.trades = []
+        self.dates = {}
+        self.exhausted = False
+        self.endResetModel()
+    
+    def trade_id(self, row):
+        """Trade ID for a row"""
+        return self.trades[row]['id']
+    
+    def row_of(self, trade_id):
+        """Row currently holding a trade, or -1 if it is not loaded"""
+        date = self.dates.get(trade_id)
+        if date is None:
+            return -1
+        row = self.insertion_row(date, trade_id)
+        if row < len(self.trades) and self.trades[row]['id'] == trade_id:
+            return row
+        return -1
+    
+    def insertion_row(self, date, trade_id):
+        """First row whose (date, id) sorts after the given key (newest first)"""
+        key = (date, trade_id)
+        low, high = 0, len(self.trades)
+        while low < high:
+            middle = (low + high) // 2
+            trade = self.trades[middle]
+            if (trade['date'], trade['id']) > key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    # ==================== INCREMENTAL UPDATES ====================
+    
+    def upsert_trade(self, trade):
+        """Insert or refresh one trade in place; returns its row or -1
+
+        Trades that sort below the last fetched row are left for fetchMore
+        to pick up, and trades outside the outcome filter are dropped.
+        """
+        old_row = self.row_of(trade['id'])
+        visible = not self.outcome or trade['outcome'] == self.outcome
+        
+        if old_row >= 0:
+            current = self.trades[old_row]
+            if visible and current['date'] == trade['date']:
+                self.trades[old_row] = trade
+                self.dataChanged.emit(self.index(old_row, 0),
+                                      self.index(old_row, len(self.HEADERS) - 1))
+                return old_row
+            self.remove_row(old_row)
+        
+        if not visible:
+            return -1
+        
+        row = self.insertion_row(trade['date'], trade['id'])
+        if row == len(self.trades) and not self.exhausted:
+            return -1
+        
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.trades.insert(row, trade)
+        self.dates[trade['id']] = trade['date']
+        self.endInsertRows()
+        return row
+    
+    def remove_trade(self, trade_id):
+        """Remove one trade if it is loaded"""
+        row = self.row_of(trade_id)
+        if row >= 0:
+            self.remove_row(row)
+    
+    def remove_row(self, row):
+        """Remove a row from the model"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        trade = self.trades.pop(row)
+        del self.dates[trade['id']]
+        self.endRemoveRows()
+    
+    # ==================== QAbstractTableModel ====================
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.trades)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted or self.queries.is_loading(self.PAGE_KEY):
+            return
+        
+        last = self.trades[-1] if self.trades else None
+        after = (last['date'], last['id']) if last else None
+        self.queries.submit(self.PAGE_KEY, DatabaseManager.get_trades_page,
+                            self.PAGE_SIZE, self.outcome, after,
+                            on_result=self.append_page)
+    
+    def append_page(self, page):
+        """Append a page delivered by the query runner"""
+        if len(page) < self.PAGE_SIZE:
+            self.exhausted = True
+        # Rows saved while the page was in flight may already be here
+        page = [trade for trade in page if trade['id'] not in self.dates]
+        if not page:
+            return
+        
+        first = len(self.trades)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self.trades.extend(page)
+        self.dates.update((trade['id'], trade['date']) for trade in page)
+        self.endInsertRows()
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        trade = self.trades[index.row()]
+        column = index.column()
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.format_cell(trade, column)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self.cell_color(trade, column)
+        if role == Qt.ItemDataRole.UserRole:
+            return trade['id']
+        return None
+    
+    # ==================== FORMATTING ====================
+    
+    def format_cell(self, trade, column):
+        """Display text for one cell"""
+        if column == 0:
+            return trade['date']
+        if column == 1:
+            return trade['pair']
+        if column == 2:
+            return trade['direction'].upper()
+        if column == 3:
+            return f"{trade['entry_price']:.5f}" if trade['entry_price'] else "-"
+        if column == 4:
+            return f"{trade['exit_price']:.5f}" if trade['exit_price'] else "-"
+        if column == 5:
+            return f"${trade['pnl']:.2f}" if trade['pnl'] else "-"
+        if column == 6:
+            return f"{trade['pnl_percent']:.2f}%" if trade['pnl_percent'] else "-"
+        if column == 7:
+            return trade['outcome'].title()
+        if column == 8:
+            return trade['setup_type'] or ''
+        return trade['concepts'] or ''
+    
+    def cell_color(self, trade, column):
+        """Foreground color for P&L and outcome cells"""
+        if column == 5 and trade['pnl']:
+            return theme.color('green' if trade['pnl'] > 0 else 'red')
+        if column == 6 and trade['pnl_percent']:
+            return theme.color('green' if trade['pnl_percent'] > 0 else 'red')
+        if column == 7 and trade['outcome'] in OUTCOME_COLORS:
+            return theme.color(OUTCOME_COLORS[trade['outcome']])
+        return None
@@ -4,19 +4,34 @@ Main Application Entry Point
 """
 
 import sys
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QIcon
-from gui.main_window import MainWindow
-from database.db_manager import DatabaseManager
+import startup_profile
 
 def main():
+    # Profiling (--profile-startup) must start before the heavy imports it times
+    profiler = startup_profile.install(sys.argv)
+    
+    with profiler.phase("import PyQt6"):
+        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtCore import QTimer
+    with profiler.phase("import main window"):
+        from gui.main_window import MainWindow
+        from database.db_manager import DatabaseManager
+        from analysis.labeling import label_trades
+    
     # Initialize database
-    db = DatabaseManager()
-    db.initialize_database()
+    with profiler.phase("initialize_database"):
+        db = DatabaseManager()
+        db.initialize_database()
+    
+    # Label trades that predate labeling (or whose labels were reset), so
+    # the analytics that group by label never have to write
+    with profiler.phase("label_trades"):
+        label_trades(db)
     
     # Create application
-    app = QApplication(sys.argv)
-    app.setStyle('Fusion')  # Modern look
+    with profiler.phase("QApplication"):
+        app = QApplication(sys.argv)
+        app.setStyle('Fusion')  # Modern look
     
     # Set application metadata
     app.setApplicationName("ICT Trading Platform")
@@ -24,10 +39,15 @@ def main():
     app.setApplicationVersion("1.0.0")
     
     # Create and show main window
-    window = MainWindow()
-    window.show()
+    with profiler.phase("MainWindow"):
+        window = MainWindow()
+    with profiler.phase("show"):
+        window.show()
+    
+    # The first idle turn of the event loop is when the window is usable
+    QTimer.singleShot(0, profiler.finish)
     
     sys.exit(app.exec())
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
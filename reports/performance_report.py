@@ -0,0 +1,380 @@
+"""
+Performance Report - Self-contained HTML or PDF report, built without a window
+
+The report is made from the same engines the Analytics tab uses. Each section
+is keyed by a hash of the data it shows: unchanged sections are read back from
+REPORT_CACHE_DIR, and only the charts of changed sections are painted, in
+parallel, onto off-screen images.
+"""
+
+import argparse
+import base64
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Dict, List
+
+import numpy as np
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, QMarginsF, QUrl
+from PyQt6.QtGui import (QGuiApplication, QImage, QPageLayout, QPageSize, QPainter,
+                         QPdfWriter, QTextDocument)
+
+from analysis.breakdowns import BreakdownEngine, DIMENSIONS, DIMENSION_TITLES
+from analysis.concept_stats import concept_performance
+from analysis.equity import EquityEngine
+from database.db_manager import DatabaseManager
+from gui.calendar_tab import layout_cells, heatmap_size, paint_heatmap
+from gui.equity_chart import build_polygons, paint_equity
+from gui.r_histogram import paint_r_histogram
+from gui.theme import color
+
+REPORT_CACHE_DIR = "report_cache"
+# Bump when a section template changes so cached sections are rebuilt
+TEMPLATE_VERSION = 2
+CHART_WIDTH = 900
+CHART_HEIGHT = 300
+R_BUCKET = 0.5
+CALENDAR_YEARS = 3
+TOP_CONCEPTS = 15
+CHART_SRC = re.compile(r'src="chart:([\w-]+)"')
+# Charts are painted in a fixed palette, whatever theme the app is in
+REPORT_PALETTE = 'dark'
+
+_report_app = None
+
+
+def ensure_gui_application():
+    """Painting text needs a QGuiApplication; start an offscreen one for CLI runs"""
+    global _report_app
+    if QGuiApplication.instance() is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        _report_app = QGuiApplication([])
+
+
+def render_chart(width: int, height: int, paint, *args) -> bytes:
+    """Run a paint_* function on an off-screen image and return it as PNG"""
+    image = QImage(width, height, QImage.Format.Format_ARGB32)
+    painter = QPainter(image)
+    paint(painter, *args)
+    painter.end()
+    
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(data)
+
+
+def fingerprint(name: str, payload) -> str:
+    """Hash of a section's input data (arrays hashed by their bytes)"""
+    digest = hashlib.sha256(f"{TEMPLATE_VERSION}:{name}".encode())
+    
+    def feed(value):
+        if isinstance(value, np.ndarray):
+            digest.update(value.tobytes())
+        elif isinstance(value, dict):
+            for key in sorted(value, key=str):
+                digest.update(str(key).encode())
+                feed(value[key])
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                feed(item)
+        else:
+            digest.update(json.dumps(value, default=str).encode())
+    
+    feed(payload)
+    return digest.hexdigest()[:32]
+
+
+def money(value) -> str:
+    return "-" if value is None else f"${value:,.2f}"
+
+
+def percent(value) -> str:
+    return "-" if value is None else f"{value:.1f}%"
+
+
+def stat_table(items) -> str:
+    cells = "".join(f"<td><b>{html.escape(str(value))}</b><br>"
+                    f"<span style='color:#64748b'>{html.escape(label)}</span></td>"
+                    for label, value in items)
+    return f"<table class='stats' cellpadding='8'><tr>{cells}</tr></table>"
+
+
+def rows_table(headers, rows) -> str:
+    head = "".join(f"<th>{html.escape(header)}</th>" for header in headers)
+    body = "".join("<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in row) + "</tr>"
+                   for row in rows)
+    return f"<table class='rows' cellpadding='4'><tr>{head}</tr>{body}</table>"
+
+
+# ==================== SECTIONS ====================
+# Each builder returns (html, {chart id: (width, height, paint, *args)})
+
+def overview_section(data):
+    stats, r_stats = data['stats'], data['r_stats']
+    body = stat_table([
+        ("Total Trades", stats['total_trades']),
+        ("Wins", stats['wins']),
+        ("Losses", stats['losses']),
+        ("Pending", stats['pending']),
+        ("Win Rate", percent(stats['win_rate'])),
+    ]) + stat_table([
+        ("Total P&L", money(stats['total_pnl'])),
+        ("Avg P&L", money(stats['avg_pnl'])),
+        ("Best Trade", money(stats['best_trade'])),
+        ("Worst Trade", money(stats['worst_trade'])),
+    ])
+    if r_stats['trades']:
+        planned = r_stats['avg_planned_rr']
+        body += stat_table([
+            ("Trades with Stop", r_stats['trades']),
+            ("Average R", f"{r_stats['avg_r']:+.2f}R"),
+            ("Expectancy", f"{r_stats['expectancy_r']:+.2f}R"),
+            ("Total R", f"{r_stats['total_r']:+.2f}R"),
+            ("Avg Planned R:R", "-" if planned is None else f"1:{planned:.2f}"),
+        ])
+    return body, {}
+
+
+def equity_section(data):
+    curve = data['equity']['curve']
+    summary = data['equity']['summary']
+    polygons = build_polygons(curve['equity'], curve['drawdown'], CHART_WIDTH, CHART_HEIGHT) \
+        if len(curve['equity']) else None
+    body = "<img src=\"chart:equity\"><br>" + stat_table([
+        ("Closed Trades", summary['trades']),
+        ("Max Drawdown", money(summary['max_drawdown'])),
+        ("Longest Drawdown (trades)", summary['max_drawdown_trades']),
+        ("Rolling Win Rate", percent(summary['rolling_win_rate'])),
+        ("Rolling Expectancy", money(summary['rolling_expectancy'])),
+    ])
+    charts = {'equity': (CHART_WIDTH, CHART_HEIGHT, paint_equity, CHART_WIDTH, CHART_HEIGHT,
+                         curve['equity'], polygons, REPORT_PALETTE)}
+    return body, charts
+
+
+def r_distribution_section(data):
+    body = "<img src=\"chart:r-histogram\">"
+    charts = {'r-histogram': (CHART_WIDTH, 200, paint_r_histogram, CHART_WIDTH, 200,
+                              data['r_distribution'], R_BUCKET, REPORT_PALETTE)}
+    return body, charts
+
+
+def concepts_section(data):
+    headers = ["Concept", "Trades", "Win Rate", "Expectancy", "Total P&L"]
+    body = ""
+    for key, title in (('concepts', "Concepts"), ('pairs', "Concept Pairs")):
+        rows = [(row['concept'], row['trades'], percent(row['win_rate']),
+                 money(row['expectancy']), money(row['total_pnl']))
+                for row in data['concepts'][key][:TOP_CONCEPTS]]
+        body += f"<h3>{title}</h3>" + (rows_table(headers, rows) if rows else "<p>No trades tagged yet.</p>")
+    return body, {}
+
+
+def breakdowns_section(data):
+    headers = ["Bucket", "Trades", "Win Rate", "Avg P&L", "Total P&L", "Avg R"]
+    body = ""
+    for dimension in DIMENSIONS:
+        rows = [(row['name'], row['trades'], percent(row['win_rate']), money(row['avg_pnl']),
+                 money(row['total_pnl']), "-" if row['avg_r'] is None else f"{row['avg_r']:+.2f}R")
+                for row in data['breakdowns'][dimension]]
+        if rows:
+            body += f"<h3>{DIMENSION_TITLES[dimension]}</h3>" + rows_table(headers, rows)
+    return body or "<p>No trades with an entry time yet.</p>", {}
+
+
+def calendar_section(data):
+    days = {row['date']: row for row in data['days']}
+    last_year = max([date.today().year] + [int(key[:4]) for key in days])
+    years = list(range(last_year, last_year - CALENDAR_YEARS, -1))
+    cells, _ = layout_cells(days, years, REPORT_PALETTE)
+    size = heatmap_size(years)
+    
+    def paint(painter):
+        painter.fillRect(0, 0, size.width(), size.height(), color('surface', palette=REPORT_PALETTE))
+        paint_heatmap(painter, years, cells, REPORT_PALETTE)
+    
+    return "<img src=\"chart:calendar\">", {'calendar': (size.width(), size.height(), paint)}
+
+
+SECTIONS = [
+    ('overview', "Overview", overview_section, ('stats', 'r_stats')),
+    ('equity', "Equity Curve", equity_section, ('equity',)),
+    ('r_distribution', "R-Multiple Distribution", r_distribution_section, ('r_distribution',)),
+    ('concepts', "Concept Performance", concepts_section, ('concepts',)),
+    ('breakdowns', "Time & Session Performance", breakdowns_section, ('breakdowns',)),
+    ('calendar', "Trade Calendar", calendar_section, ('days',)),
+]
+
+
+def collect_data(db: DatabaseManager) -> Dict:
+    """Everything the sections show, read from the analytics engines"""
+    first_year = date.today().year - CALENDAR_YEARS + 1
+    return {
+        'stats': db.get_trade_statistics(),
+        'r_stats': db.get_r_statistics(),
+        'r_distribution': db.get_r_distribution(R_BUCKET),
+        'equity': EquityEngine(db).update(),
+        'concepts': concept_performance(db),
+        'breakdowns': BreakdownEngine(db).get_all(),
+        'days': db.get_daily_summary(f"{first_year}-01-01")
+    }
+
+
+class ReportBuilder:
+    """Builds report sections, reusing cached ones whose data is unchanged"""
+    
+    def __init__(self, cache_dir: str = REPORT_CACHE_DIR, workers: int = 4):
+        self.cache_dir = cache_dir
+        self.workers = workers
+    
+    def cache_path(self, key: str, name: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{name}")
+    
+    def load_cached(self, key: str):
+        """(html, {chart id: png}) for a cached section, or None"""
+        try:
+            with open(self.cache_path(key, "html"), encoding="utf-8") as f:
+                body = f.read()
+            charts = {}
+            for chart_id in CHART_SRC.findall(body):
+                with open(self.cache_path(key, f"{chart_id}.png"), 'rb') as f:
+                    charts[chart_id] = f.read()
+            return body, charts
+        except OSError:
+            return None
+    
+    def store(self, key: str, body: str, charts: Dict[str, bytes]):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for chart_id, png in charts.items():
+            with open(self.cache_path(key, f"{chart_id}.png"), 'wb') as f:
+                f.write(png)
+        # The HTML goes last: its presence marks the section as complete
+        with open(self.cache_path(key, "html"), 'w', encoding="utf-8") as f:
+            f.write(body)
+    
+    def prune(self, keys):
+        """Drop cached files of sections that no longer match the data"""
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.split(".", 1)[0] not in keys:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+    
+    def build(self, data: Dict) -> Dict:
+        """{'sections': [(title, html)], 'charts': {id: png}, 'cached': n}"""
+        ensure_gui_application()
+        sections = []
+        charts = {}
+        pending = {}
+        cached = 0
+        keys = set()
+        
+        for name, title, builder, inputs in SECTIONS:
+            key = fingerprint(name, [data[field] for field in inputs])
+            keys.add(key)
+            hit = self.load_cached(key)
+            if hit:
+                body, section_charts = hit
+                charts.update(section_charts)
+                cached += 1
+            else:
+                body, jobs = builder(data)
+                pending[key] = (body, jobs)
+            sections.append((title, body))
+        
+        # QPainter on separate QImages is thread-safe, so charts paint in parallel
+        jobs = [(key, chart_id, job) for key, (_, section_jobs) in pending.items()
+                for chart_id, job in section_jobs.items()]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            images = list(pool.map(lambda item: render_chart(*item[2]), jobs))
+        rendered = {}
+        for (key, chart_id, _), png in zip(jobs, images):
+            rendered.setdefault(key, {})[chart_id] = png
+            charts[chart_id] = png
+        for key, (body, _) in pending.items():
+            self.store(key, body, rendered.get(key, {}))
+        self.prune(keys)
+        
+        return {'sections': sections, 'charts': charts, 'cached': cached}
+
+
+def report_html(sections, image_src) -> str:
+    """Full document; image_src maps a chart id to its <img> source"""
+    generated = datetime.now().strftime("%Y-%m-%d %H:%M")
+    body = "".join(f"<h2>{html.escape(title)}</h2>{content}" for title, content in sections)
+    body = CHART_SRC.sub(lambda match: f'src="{image_src(match.group(1))}"', body)
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Trading Performance Report</title>
+<style>
+body {{ font-family: sans-serif; color: #0f172a; margin: 24px; }}
+h1 {{ color: #3b82f6; }}
+h2 {{ color: #1e293b; border-bottom: 1px solid #cbd5e1; margin-top: 28px; }}
+table.stats td {{ text-align: center; }}
+table.rows {{ border-collapse: collapse; }}
+table.rows th {{ background: #e2e8f0; text-align: left; }}
+table.rows td, table.rows th {{ border: 1px solid #cbd5e1; }}
+</style></head>
+<body><h1>Trading Performance Report</h1><p>Generated {generated}</p>{body}</body></html>"""
+
+
+def write_html(path: str, sections, charts: Dict[str, bytes]):
+    def data_uri(chart_id):
+        return "data:image/png;base64," + base64.b64encode(charts[chart_id]).decode()
+    with open(path, 'w', encoding="utf-8") as f:
+        f.write(report_html(sections, data_uri))
+
+
+def write_pdf(path: str, sections, charts: Dict[str, bytes]):
+    document = QTextDocument()
+    for chart_id, png in charts.items():
+        document.addResource(QTextDocument.ResourceType.ImageResource.value,
+                             QUrl(f"chart:{chart_id}"), QImage.fromData(png))
+    document.setHtml(report_html(sections, lambda chart_id: f"chart:{chart_id}"))
+    
+    writer = QPdfWriter(path)
+    writer.setPageLayout(QPageLayout(QPageSize(QPageSize.PageSizeId.A4),
+                                     QPageLayout.Orientation.Portrait, QMarginsF(12, 12, 12, 12)))
+    writer.setTitle("Trading Performance Report")
+    document.print(writer)
+
+
+def generate_report(db: DatabaseManager, path: str, cache_dir: str = REPORT_CACHE_DIR) -> Dict:
+    """Write a report to path (.pdf for PDF, anything else HTML)
+    
+    Safe to run on a query worker thread; returns the path plus how many
+    sections came from the cache.
+    """
+    built = ReportBuilder(cache_dir).build(collect_data(db))
+    if path.lower().endswith(".pdf"):
+        write_pdf(path, built['sections'], built['charts'])
+    else:
+        write_html(path, built['sections'], built['charts'])
+    return {'path': path, 'sections': len(built['sections']), 'cached': built['cached']}
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Build a trading performance report")
+    parser.add_argument("output", help="report file (.html or .pdf)")
+    parser.add_argument("--db", default="trading_data.db", help="journal database")
+    args = parser.parse_args(argv)
+    
+    db = DatabaseManager(args.db)
+    db.initialize_database()
+    try:
+        result = generate_report(db, args.output)
+    finally:
+        db.close()
+    print(f"Report written to {result['path']} "
+          f"({result['cached']}/{result['sections']} sections from cache)")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,194 @@
+"""
+Startup Profile - Per-phase timing of application launch
+
+Enabled with `python main.py --profile-startup[=report.json]` or the
+ICT_PROFILE_STARTUP environment variable (1 for a printed summary, or a path
+ending in .json to also write the report). `--profile-cprofile` /
+ICT_PROFILE_CPROFILE=1 adds the top cProfile entries to the report.
+Module import times are always recorded while profiling is on.
+
+This module imports nothing from Qt so it can time the Qt import itself.
+When profiling is off every call is a cheap no-op.
+"""
+
+import builtins
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+ENV_VAR = 'ICT_PROFILE_STARTUP'
+CPROFILE_ENV_VAR = 'ICT_PROFILE_CPROFILE'
+FLAG = '--profile-startup'
+CPROFILE_FLAG = '--profile-cprofile'
+TOP_IMPORTS = 15
+TOP_FUNCTIONS = 25
+
+
+class ImportTimer:
+    """Inclusive time of each module's first import, via a builtins.__import__ wrapper"""
+    
+    def __init__(self):
+        self.times: Dict[str, float] = {}
+        self.original = None
+    
+    def install(self):
+        if self.original is not None:
+            return
+        self.original = builtins.__import__
+        
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            # Relative and already-loaded imports are not worth timing
+            if level or name in sys.modules:
+                return self.original(name, globals, locals, fromlist, level)
+            start = time.perf_counter()
+            try:
+                return self.original(name, globals, locals, fromlist, level)
+            finally:
+                self.times.setdefault(name, time.perf_counter() - start)
+        
+        builtins.__import__ = timed_import
+    
+    def uninstall(self):
+        if self.original is not None:
+            builtins.__import__ = self.original
+            self.original = None
+    
+    def top(self, count: int = TOP_IMPORTS) -> List[Dict]:
+        slowest = sorted(self.times.items(), key=lambda item: item[1], reverse=True)[:count]
+        return [{'module': name, 'ms': round(seconds * 1000, 2)} for name, seconds in slowest]
+
+
+class StartupProfiler:
+    """Monotonic phase timings from process start to the first idle event loop turn"""
+    
+    def __init__(self, enabled: bool = False, output: Optional[str] = None,
+                 use_cprofile: bool = False):
+        self.enabled = enabled
+        self.output = output
+        self.start = time.perf_counter()
+        self.phases: List[Dict] = []
+        self.marks: List[Dict] = []
+        self.depth = 0
+        self.finished = False
+        self.imports = ImportTimer()
+        self.profile = cProfile.Profile() if enabled and use_cprofile else None
+        
+        if enabled:
+            self.imports.install()
+            if self.profile:
+                self.profile.enable()
+    
+    def elapsed_ms(self, moment: Optional[float] = None) -> float:
+        return round(((moment or time.perf_counter()) - self.start) * 1000, 2)
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block; nested phases are indented in the summary"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            record = {'name': name, 'start_ms': self.elapsed_ms(started),
+                      'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+                      'depth': self.depth}
+            self.phases.append(record)
+            # Phases after the summary (idle tab prebuilds, late loads) are reported as they end
+            if self.finished:
+                print(f"[startup] +{record['start_ms']:.0f} ms {name}: {record['duration_ms']:.1f} ms", flush=True)
+    
+    def mark(self, name: str):
+        """Record a point in time, e.g. when an asynchronous load completes"""
+        if not self.enabled:
+            return
+        self.marks.append({'name': name, 'at_ms': self.elapsed_ms()})
+        if self.finished:
+            print(f"[startup] +{self.marks[-1]['at_ms']:.0f} ms {name}", flush=True)
+    
+    def report(self) -> Dict:
+        phases = sorted(self.phases, key=lambda record: record['start_ms'])
+        report = {
+            'total_ms': self.marks[-1]['at_ms'] if self.finished and self.marks else self.elapsed_ms(),
+            'phases': phases,
+            'marks': self.marks,
+            'imports': self.imports.top()
+        }
+        if self.profile:
+            stream = io.StringIO()
+            pstats.Stats(self.profile, stream=stream).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+            report['cprofile'] = stream.getvalue()
+        return report
+    
+    def format_summary(self, report: Dict) -> str:
+        lines = [f"Startup profile: {report['total_ms']:.0f} ms to first idle event loop"]
+        for record in report['phases']:
+            indent = '  ' * (record['depth'] + 1)
+            lines.append(f"{indent}{record['name']:<{40 - len(indent)}} "
+                         f"+{record['start_ms']:>7.0f} ms  {record['duration_ms']:>8.1f} ms")
+        for record in report['marks']:
+            lines.append(f"  @ {record['name']:<36} +{record['at_ms']:>7.0f} ms")
+        if report['imports']:
+            lines.append("Slowest imports (inclusive):")
+            for record in report['imports']:
+                lines.append(f"  {record['module']:<38} {record['ms']:>8.1f} ms")
+        if 'cprofile' in report:
+            lines.append(report['cprofile'])
+        return '\n'.join(lines)
+    
+    def finish(self, name: str = 'first idle event loop'):
+        """Stop the import timer and cProfile, then print and/or write the report"""
+        if not self.enabled or self.finished:
+            return
+        self.mark(name)
+        self.finished = True
+        self.imports.uninstall()
+        if self.profile:
+            self.profile.disable()
+        
+        report = self.report()
+        print(self.format_summary(report), flush=True)
+        if self.output:
+            with open(self.output, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"[startup] profile written to {self.output}", flush=True)
+
+
+def from_environment(argv: List[str]) -> StartupProfiler:
+    """Build the profiler from --profile-startup[=path] / env vars; strips the flags from argv"""
+    setting = os.environ.get(ENV_VAR, '')
+    use_cprofile = os.environ.get(CPROFILE_ENV_VAR, '') not in ('', '0')
+    for arg in list(argv[1:]):
+        if arg == FLAG or arg.startswith(FLAG + '='):
+            setting = arg.partition('=')[2] or '1'
+            argv.remove(arg)
+        elif arg == CPROFILE_FLAG:
+            use_cprofile = True
+            argv.remove(arg)
+    
+    enabled = setting not in ('', '0') or use_cprofile
+    output = setting if setting.endswith('.json') else None
+    return StartupProfiler(enabled, output, use_cprofile)
+
+
+# Process-wide profiler; main() replaces it before the heavy imports
+profiler = StartupProfiler()
+
+
+def get_profiler() -> StartupProfiler:
+    return profiler
+
+
+def install(argv: List[str]) -> StartupProfiler:
+    global profiler
+    profiler = from_environment(argv)
+    return profiler